@@ -8,9 +8,13 @@ import time
 import subprocess
 import logging
 import sys
-from typing import List, Dict, Any
+import os
+import gevent
+from gevent.lock import Semaphore
+from typing import List, Dict, Any, Optional
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
+from volttron.platform import jsonrpc
 
 from metadata.metadata_mixin import MetadataMixin
 
@@ -20,6 +24,14 @@ __version__ = "0.1"
 
 DEFAULT_DEPENDENCY_MAP = {}
 RPC_TIMEOUT = 3
+# seconds between background refreshes of the agent status cache
+DEFAULT_STATUS_REFRESH_INTERVAL = 10
+# agent_statuses refreshes the cache itself if it is older than this, e.g. when the background refresh fails
+DEFAULT_STATUS_MAX_AGE = 30
+CONTROL_IDENTITY = "control"
+CONFIG_STORE_IDENTITY = "config.store"
+# json-rpc error codes of a refused call, only these fall back to vctl
+REFUSED_RPC_ERROR_CODES = (jsonrpc.UNAUTHORIZED, jsonrpc.METHOD_NOT_FOUND)
 
 def agentmanager(config_path, **kwargs):
     """
@@ -48,6 +60,13 @@ class Agentmanager(Agent, MetadataMixin):
         self._config = config
         self._dependency_map = config.get("dependencies", DEFAULT_DEPENDENCY_MAP)
         self._agent_status_map = {}  # identity -> {"uuid": "2e31b", "status": "running", "last_checked": timestamp}
+        self._statuses_refreshed_at = 0.0
+        # only one refresh talks to the platform at a time, readers waiting for it reuse its result
+        self._status_refresh_lock = Semaphore()
+        self._status_refresh_interval = config.get("status_refresh_interval", DEFAULT_STATUS_REFRESH_INTERVAL)
+        self._status_max_age = config.get("status_max_age", DEFAULT_STATUS_MAX_AGE)
+        self._status_refresh_greenlet = None
+        self._status_refresh_pending = False
 
         self.vip.config.set_default("config", config)
         self.vip.config.subscribe(self._configure, actions=["NEW", "UPDATE"], pattern="config")
@@ -56,27 +75,119 @@ class Agentmanager(Agent, MetadataMixin):
     def _configure(self, config_name, action, contents):
         self._config = contents
         self._dependency_map = contents.get("dependencies", self._dependency_map)
+        self._status_max_age = contents.get("status_max_age", self._status_max_age)
+
+        refresh_interval = contents.get("status_refresh_interval", self._status_refresh_interval)
+        if refresh_interval != self._status_refresh_interval:
+            self._status_refresh_interval = refresh_interval
+            if self._status_refresh_greenlet is not None:
+                self._start_status_refresh()
 
     def _get_uuid_from_identity(self, agent_identity) -> str:
-        self.agent_statuses()
         uuid = self._agent_status_map.get(agent_identity, {}).get("uuid")
+        if not uuid:
+            # the agent may have been installed after the last refresh
+            self._refresh_agent_statuses()
+            uuid = self._agent_status_map.get(agent_identity, {}).get("uuid")
         if not uuid:
             _log.error(f"UUID not found in the map for identity: {agent_identity}")
-            ValueError(f"UUID not found in the map for identity: {agent_identity}")
+            raise ValueError(f"UUID not found in the map for identity: {agent_identity}")
         return uuid
 
+    def _start_status_refresh(self):
+        """
+        (Re)start the background refresh of the agent status cache
+        """
+        if self._status_refresh_greenlet is not None:
+            self._status_refresh_greenlet.kill()
+        self._status_refresh_greenlet = self.core.periodic(self._status_refresh_interval, self._periodic_status_refresh)
+
+    def _periodic_status_refresh(self):
+        try:
+            self._refresh_agent_statuses()
+        except Exception as e:
+            _log.warning(f"Background refresh of agent statuses failed, cache is {time.time() - self._statuses_refreshed_at:.0f}s old: {e}")
+
+    def _refresh_agent_statuses(self, max_age: float = 0) -> Dict[str, Dict]:
+        """
+        Fetch the installed agents and their statuses from the platform and replace the status cache.
+        list_agents and status_agents are called concurrently and joined by identity.
+
+        Params:
+            max_age: Skip the refresh if the cache is at most this many seconds old,
+                     e.g. because it was refreshed while waiting for the lock
+        Returns:
+            The refreshed status map
+        Raises:
+            Exception if the platform could not be queried
+        """
+        with self._status_refresh_lock:
+            if self._statuses_refreshed_at and time.time() - self._statuses_refreshed_at <= max_age:
+                return self._agent_status_map
+
+            installed_greenlet = self.core.spawn(self.list_agents)
+            status_greenlet = self.core.spawn(lambda: self.vip.rpc.call("control", "status_agents").get(timeout=RPC_TIMEOUT))
+            list_of_installed_agents = installed_greenlet.get(timeout=RPC_TIMEOUT)
+            list_of_agents_status = status_greenlet.get(timeout=RPC_TIMEOUT)
+            if not list_of_installed_agents:
+                raise ValueError("List of Agents is empty")
+
+            # status entries are [uuid, name, [pid, exitcode], identity]
+            status_by_identity = {entry[3]: entry[2] for entry in list_of_agents_status if len(entry) == 4}
+
+            refreshed_at = time.time()
+            new_map = {}
+            for list_entry in list_of_installed_agents:
+                identity = list_entry["identity"]
+                # default if not found:
+                status = "never started"
+
+                pid_exitcode = status_by_identity.get(identity)
+                if pid_exitcode is not None:
+                    pid, exitcode = pid_exitcode[0], pid_exitcode[1]
+                    if pid is None:
+                        status = "never started"
+                    elif exitcode is None:
+                        status = "running"
+                    elif exitcode == 0:
+                        status = "stopped"
+                    else:
+                        status = "unknown"
+
+                new_map[identity] = {
+                    "uuid": list_entry["uuid"],
+                    "status": status,
+                    "last_checked": refreshed_at
+                }
+
+            self._agent_status_map = new_map
+            self._statuses_refreshed_at = refreshed_at
+            return new_map
+
+    def _refresh_agent_statuses_later(self):
+        """
+        Refresh the cache in the background after an agent was started, stopped or removed.
+        Calls made while a refresh is pending share it, e.g. when the scheduler starts many agents at once.
+        """
+        if self._status_refresh_pending:
+            return
+        self._status_refresh_pending = True
+
+        def refresh():
+            self._status_refresh_pending = False
+            self._periodic_status_refresh()
+        self.core.spawn(refresh)
+
     @Core.receiver("onstart")
     def _enable_own_autostart(self, sender, **kwargs):
         """
         Create an AUTOSTART file,
         so that on next Volttron reboot this agent will be started.
-        Hence AUTOSTART file does not exist at the first start up can not use 
-            self.vip.rpc.call("control", "prioritize_agent", my_uuid, priority)
-        There is no implementef rpc method that fully realises the autostart,
-        only wayaround with vctl
+        Uses the prioritize_agent rpc of control, falls back to vctl enable if the rpc is refused
         """
         priority = "40"                    # 0–100, lower means start earlier
         self.enable_agent_autostart(self.core.identity, priority)
+        self._start_status_refresh()
         
     @RPC.export
     def start_agent(self, agent_identity: str) -> None:
@@ -93,6 +204,7 @@ class Agentmanager(Agent, MetadataMixin):
             uuid = self._get_uuid_from_identity(agent_identity)
             self.vip.rpc.call("control", "start_agent", uuid).get(timeout=RPC_TIMEOUT)
             _log.debug(f"RPC start_agent called for {agent_identity}.")
+            self._refresh_agent_statuses_later()
         except Exception as e:
             _log.error(f"Failed to start agent {agent_identity}: {e}")
             raise RuntimeError(f"Failed to start agent {agent_identity}: {e}")
@@ -112,6 +224,7 @@ class Agentmanager(Agent, MetadataMixin):
             uuid = self._get_uuid_from_identity(agent_identity)
             self.vip.rpc.call("control", "stop_agent", uuid).get(timeout=RPC_TIMEOUT)
             _log.debug(f"RPC stop_agent called for {agent_identity}.")
+            self._refresh_agent_statuses_later()
         except Exception as e:
             _log.error(f"Failed to stop agent {agent_identity}: {e}")
             raise RuntimeError(f"Failed to stop agent {agent_identity}: {e}")
@@ -131,6 +244,7 @@ class Agentmanager(Agent, MetadataMixin):
             uuid = self._get_uuid_from_identity(agent_identity)
             self.vip.rpc.call("control", "restart_agent", uuid).get(timeout=RPC_TIMEOUT)
             _log.debug(f"RPC restart_agent called for {agent_identity}.")
+            self._refresh_agent_statuses_later()
         except Exception as e:
             _log.error(f"Failed to restart agent {agent_identity}: {e}")
             raise RuntimeError(f"Failed to restart agent {agent_identity}: {e}")
@@ -150,6 +264,7 @@ class Agentmanager(Agent, MetadataMixin):
             uuid = self._get_uuid_from_identity(agent_identity)
             self.vip.rpc.call("control", "remove_agent", uuid).get(timeout=RPC_TIMEOUT)
             _log.debug(f"RPC remove_agent called for {agent_identity}.")
+            self._refresh_agent_statuses_later()
         except Exception as e:
             _log.error(f"Failed to remove agent {agent_identity}: {e}")
             raise RuntimeError(f"Failed to remove agent {agent_identity}: {e}")
@@ -236,11 +351,13 @@ class Agentmanager(Agent, MetadataMixin):
 
 
     @RPC.export
-    def agent_statuses(self) -> Dict[str, Dict]:
+    def agent_statuses(self, max_age: Optional[float] = None) -> Dict[str, Dict]:
         """
-        Calls RPC, parses vctl status lines,
-        and updates self._agent_status_map when done.
+        Returns the cached agent statuses, which are refreshed in the background every status_refresh_interval seconds.
+        Only if the cache is older than max_age it is refreshed before returning.
         
+        Params:
+            max_age: Maximal age of the cache in seconds, defaults to the configured status_max_age
         Returns: 
             A Dict of agent identities. with uuid, status and last checked timestamp mapped to each agent identity
             Output format:
@@ -249,62 +366,30 @@ class Agentmanager(Agent, MetadataMixin):
                 { 
                     "uuid": uuid,
                     "status": status[never started | running | stopped | unknown],
-                    "last_checked": timestamp
+                    "last_checked": timestamp of the refresh, shows how stale the status is
                 }
             }
         Raises:
-            RuntimeError on fail
+            RuntimeError if the cache is empty and could not be refreshed
         """  
 
+        if max_age is None:
+            max_age = self._status_max_age
         try:
-            list_of_installed_agents = self.list_agents()
-            if not list_of_installed_agents:
-                raise ValueError("List of Agents is empty")
-
-            list_of_agents_status = self.vip.rpc.call("control", "status_agents").get(timeout=RPC_TIMEOUT)
-            #_log.debug(f"List of agents statuses: {list_of_agents_status}")
-
-            new_map = {}
-            for list_entry in list_of_installed_agents:
-                identity = list_entry["identity"]
-                uuid = list_entry["uuid"]
-                # default if not found:
-                status = "never started"
-
-                # scan the raw list for our identity:
-                for status_entry in list_of_agents_status:
-                    if len(status_entry) == 4 and status_entry[3] == identity:
-                        pid = status_entry[2][0]  # rec[2] is [pid, exitcode]
-                        exitcode = status_entry[2][1]
-                        if pid is None:
-                            status = "never started"
-                        elif exitcode is None:
-                            status = "running"
-                        elif exitcode == 0:
-                            status = "stopped"
-                        else:
-                            status = "unknown"
-                        break
-
-                new_map[identity] = {
-                    "uuid": uuid,
-                    "status": status,
-                    "last_checked": time.time()
-                }
-
-            self._agent_status_map = new_map
-            #_log.debug(f"Refreshed agents statuses: {new_map}")
-            return new_map
-
+            return self._refresh_agent_statuses(max_age=max_age).copy()
         except Exception as e:
             _log.error(f"Failed to fetch agents statuses: {e}")
+            if not self._agent_status_map:
+                raise RuntimeError(f"Failed to fetch agents statuses: {e}")
+            # serve the stale cache, its timestamps show since when
+            return self._agent_status_map.copy()
 
     @RPC.export
-    def get_agent_status_map(self):
+    def get_agent_status_map(self) -> Dict[str, Dict]:
         """
-        Same as agent_statuses() but simply returnes the stored map
+        Same as agent_statuses() but simply returnes the stored map, never queries the platform
         """
-        return self._agent_status_map.copy
+        return self._agent_status_map.copy()
     
     @RPC.export
     def enable_agent_autostart(self, agent_identity: str, priority: str) -> bool:
@@ -320,18 +405,15 @@ class Agentmanager(Agent, MetadataMixin):
             RuntimeError on exception
         """
 
-        self.agent_statuses()
         try:
             agent_uuid = self._get_uuid_from_identity(agent_identity)
-            # For some reason there is no full rpc implementation for autostart only from within vctl
-            # if AUTOSTART file for an agent exists you can use self.vip.rpc.call("control", "prioritize_agent", agent_uuid, priority) 
-            result = subprocess.run(["vctl", "enable", agent_uuid, priority], capture_output=True, text=True)
-            if result.returncode == 0:
-                _log.info(f"Enabled autostart for agent {agent_identity} at priority {priority}")
-                return True
-            else:
-                _log.error(f"Failed to enable autostart for {agent_identity}, {result.stderr.strip()}")
-                return False
+            # vctl enable calls the same rpc, it writes the priority to the AUTOSTART file of the agent
+            self._call_platform(CONTROL_IDENTITY, "prioritize_agent", [agent_uuid, priority], ["enable", agent_uuid, priority])
+            _log.info(f"Enabled autostart for agent {agent_identity} at priority {priority}")
+            return True
+        except RuntimeError as e:
+            _log.error(f"Failed to enable autostart for {agent_identity}, {e}")
+            return False
         except Exception as e:
             _log.error(f"Error while enabling autostart for {agent_identity}: {e}")
             raise RuntimeError(f"Error while enabling autostart for {agent_identity}: {e}")
@@ -349,23 +431,20 @@ class Agentmanager(Agent, MetadataMixin):
             RuntimeError on exception 
         """
 
-        self.agent_statuses()
         try:
             agent_uuid = self._get_uuid_from_identity(agent_identity)
-            # if AUTOSTART file for an agent exists you can use self.vip.rpc.call("control", "prioritize_agent", agent_uuid, "0")
-            result = subprocess.run(["vctl", "disable", agent_uuid], capture_output=True, text=True)
-            if result.returncode == 0:
-                _log.info(f"Disabled autostart for agent {agent_identity}")
-                return True
-            else:
-                _log.error(f"Failed to disable autostart for {agent_identity}, {result.stderr.strip()}")
-                return False
+            # vctl disable calls the same rpc without priority, which removes the AUTOSTART file of the agent
+            self._call_platform(CONTROL_IDENTITY, "prioritize_agent", [agent_uuid, None], ["disable", agent_uuid])
+            _log.info(f"Disabled autostart for agent {agent_identity}")
+            return True
+        except RuntimeError as e:
+            _log.error(f"Failed to disable autostart for {agent_identity}, {e}")
+            return False
         except Exception as e:
             _log.error(f"Error while disabling autostart for {agent_identity}: {e}")
             raise RuntimeError(f"Error while disabling autostart for {agent_identity}: {e}")
 
     #---------- Config Store ---------- 
-    # TODO: Replace vctl with rpc to store agent
     @RPC.export
     def list_agent_configs(self, agent_identity: str):
         """
@@ -379,7 +458,9 @@ class Agentmanager(Agent, MetadataMixin):
             RuntimeError on exception 
         """
         try:
-            rc = self._run_vctl(["config", "list", agent_identity]).splitlines()
+            via_rpc, rc = self._call_platform(CONFIG_STORE_IDENTITY, "manage_list_configs", [agent_identity], ["config", "list", agent_identity])
+            if not via_rpc:
+                rc = rc.splitlines()
             _log.debug(f"Config list called for agent {agent_identity}, output: {rc}")
             return rc
         except Exception as e:
@@ -401,7 +482,9 @@ class Agentmanager(Agent, MetadataMixin):
         """
 
         try:
-            rc = self._run_vctl(["config", "get", agent_identity, config_name]).strip()
+            # raw returns the stored string like vctl config get does
+            _, rc = self._call_platform(CONFIG_STORE_IDENTITY, "manage_get", [agent_identity, config_name, True], ["config", "get", agent_identity, config_name])
+            rc = rc.strip()
             _log.debug(f"Get config with name {config_name} called for agent {agent_identity}, output: {rc}")
             return rc
         except Exception as e:
@@ -424,7 +507,8 @@ class Agentmanager(Agent, MetadataMixin):
         """
 
         try:
-            rc = self._run_vctl(["config", "store", agent_identity, config_name, "-"], input=content)
+            _, rc = self._call_platform(CONFIG_STORE_IDENTITY, "manage_store", [agent_identity, config_name, content, "json"],
+                                              ["config", "store", agent_identity, config_name, "-"], input=content)
             _log.debug(f"Store config with name {config_name} called for agent {agent_identity} content: {content}, output: {rc}")
             return rc
         except Exception as e:
@@ -446,7 +530,7 @@ class Agentmanager(Agent, MetadataMixin):
         """
 
         try:
-            self._run_vctl(["config", "delete", agent_identity, config_name])
+            self._call_platform(CONFIG_STORE_IDENTITY, "manage_delete_config", [agent_identity, config_name], ["config", "delete", agent_identity, config_name])
             return True
         except Exception as e:
             _log.error(f"Error deleting config {config_name} for agent {agent_identity}: {e}")
@@ -468,18 +552,50 @@ class Agentmanager(Agent, MetadataMixin):
         """
 
         try:
-            rc = self._run_vctl(["config", "store", agent_identity, config_name, config_path])
+            # the file is read here, so it has to be on the host of this agent, like for vctl
+            with open(config_path, "r") as file:
+                content = file.read()
+            config_type = "csv" if os.path.splitext(config_path)[1].lower() == ".csv" else "json"
+            _, rc = self._call_platform(CONFIG_STORE_IDENTITY, "manage_store", [agent_identity, config_name, content, config_type],
+                                              ["config", "store", agent_identity, config_name, config_path] + (["--csv"] if config_type == "csv" else []))
             _log.debug(f"Store config with name {config_name} called for agent {agent_identity}, output: {rc}")
             return rc
         except Exception as e:
             _log.error(f"Error storing config file {config_name} for agent {agent_identity}: {e}")
             raise RuntimeError(f"Error storing config file: {e}")
 
+    def _call_platform(self, peer: str, method: str, args: List[Any], vctl_args: List[str], input: Optional[str] = None):
+        """
+        Call a platform service over RPC, if the call is refused (the agent lacks the capability
+        or the platform does not know the method) fall back to the equivalent vctl command.
+        Any other error, e.g. a timeout or an error raised by the service, is raised as is.
+
+        Params:
+            peer: Identity of the platform service, "control" or "config.store"
+            method: RPC method name
+            args: RPC arguments
+            vctl_args: Arguments of the equivalent vctl command
+            input: Stdin for the vctl command
+        Returns:
+            Tuple of (True, rpc result) or (False, vctl stdout)
+        Raises:
+            RuntimeError if the vctl fallback fails too
+            Exception of the rpc call if it failed for another reason than being refused
+        """
+        try:
+            return True, self.vip.rpc.call(peer, method, *args).get(timeout=RPC_TIMEOUT)
+        except jsonrpc.Error as e:
+            if e.code not in REFUSED_RPC_ERROR_CODES:
+                raise
+            _log.warning(f"RPC {peer}.{method} refused, falling back to vctl: {e}")
+            return False, self._run_vctl(vctl_args, input=input)
+
     def _run_vctl(self, args, input=None):
         """
         Runs a command in volttrons CLI 
+        The process runs in a thread of the gevent threadpool, so it does not block the hub while vctl starts up
         """
-        result = subprocess.run(["vctl"] + args, input=input, text=True, capture_output=True)
+        result = gevent.get_hub().threadpool.apply(subprocess.run, (["vctl"] + args,), {"input": input, "text": True, "capture_output": True})
         if result.returncode != 0:
             raise RuntimeError(result.stderr.strip())
         return result.stdout
@@ -491,7 +607,7 @@ class Agentmanager(Agent, MetadataMixin):
         Every 60s, spawn a worker greenlet to fetch & parse agent statuses.
         Returns immediately, so this greenlet never blocks.
         """
-        self.agent_statuses()
+        self._refresh_agent_statuses()
 
 def main():
     """Main method called to start the agent."""
@@ -0,0 +1,69 @@
+import pytest
+from agentmanager.agent import Agentmanager
+from unittest.mock import MagicMock
+
+
+INSTALLED_AGENTS = [
+    {"name": "scheduleragent-0.1", "uuid": "uuid-scheduler", "tag": None, "priority": None, "identity": "scheduler"},
+    {"name": "controlbhkwagent-0.1", "uuid": "uuid-bhkw", "tag": None, "priority": "50", "identity": "controlbhkw"}
+]
+# status entries are [uuid, name, [pid, exitcode], identity]
+AGENT_STATUSES = [
+    ["uuid-scheduler", "scheduleragent-0.1", [1234, None], "scheduler"],
+    ["uuid-bhkw", "controlbhkwagent-0.1", [1235, 0], "controlbhkw"]
+]
+
+
+def rpc_result(value=None, error=None):
+    """Fake of the async result returned by vip.rpc.call"""
+    result = MagicMock()
+    if error is not None:
+        result.get.side_effect = error
+    else:
+        result.get.return_value = value
+    return result
+
+
+@pytest.fixture
+def platform_responses():
+    """Responses of the control agent keyed by method, an Exception instance is raised instead"""
+    return {
+        "list_agents": INSTALLED_AGENTS,
+        "status_agents": AGENT_STATUSES
+    }
+
+
+@pytest.fixture
+def agent_manager(platform_responses):
+    """Agentmanager whose rpc calls are answered from platform_responses"""
+    agent = Agentmanager({})
+    agent.vip = MagicMock()
+
+    def call(peer, method, *args):
+        response = platform_responses.get(method)
+        if isinstance(response, Exception):
+            return rpc_result(error=response)
+        return rpc_result(response)
+
+    agent.vip.rpc.call.side_effect = call
+    return agent
+
+
+@pytest.fixture(autouse=True)
+def patch_core_spawn(monkeypatch):
+    """
+    Replace agent.core.spawn with a synchronous implementation during tests.
+    This makes .get() work immediately and avoids greenlet assertion errors.
+    """
+
+    def immediate_spawn(self, func, *args, **kwargs):
+        class DummyResult:
+            def get(self, timeout=None):
+                return func(*args, **kwargs)
+        return DummyResult()
+
+    monkeypatch.setattr(
+        "volttron.platform.vip.agent.core.ZMQCore.spawn",
+        immediate_spawn,
+        raising=True
+    )
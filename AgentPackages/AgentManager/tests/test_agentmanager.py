@@ -0,0 +1,236 @@
+import pytest
+import threading
+import gevent
+from agentmanager.agent import Agentmanager
+from volttron.platform import jsonrpc
+from unittest.mock import MagicMock, patch
+from tests.conftest import rpc_result
+
+
+def _platform_calls(agent: Agentmanager, method: str) -> int:
+    return sum(1 for call in agent.vip.rpc.call.call_args_list if call.args[1] == method)
+
+#------------------- Status cache --------------------
+class TestStatusCache:
+    def test_refresh_joins_list_and_status(self, agent_manager: Agentmanager):
+        statuses = agent_manager.agent_statuses()
+
+        assert statuses["scheduler"]["uuid"] == "uuid-scheduler"
+        assert statuses["scheduler"]["status"] == "running"
+        assert statuses["controlbhkw"]["status"] == "stopped"
+        assert statuses["scheduler"]["last_checked"] == agent_manager._statuses_refreshed_at
+
+    def test_fresh_cache_is_served_without_platform_calls(self, agent_manager: Agentmanager):
+        agent_manager.agent_statuses()
+        agent_manager.agent_statuses()
+        agent_manager.agent_statuses(max_age=5)
+        assert _platform_calls(agent_manager, "status_agents") == 1
+
+        # a cache older than max_age is refreshed
+        agent_manager._statuses_refreshed_at -= 10
+        agent_manager.agent_statuses(max_age=5)
+        assert _platform_calls(agent_manager, "status_agents") == 2
+        agent_manager.agent_statuses(max_age=0)
+        assert _platform_calls(agent_manager, "status_agents") == 3
+
+    def test_configured_max_age(self, platform_responses):
+        agent = Agentmanager({"status_max_age": 0})
+        agent.vip = MagicMock()
+        agent.vip.rpc.call.side_effect = lambda peer, method, *args: rpc_result(platform_responses[method])
+
+        agent.agent_statuses()
+        agent.agent_statuses()
+        assert _platform_calls(agent, "status_agents") == 2
+
+    def test_concurrent_readers_share_one_refresh(self, agent_manager: Agentmanager, platform_responses):
+        # real greenlets, the platform answers slowly so the second reader waits for the lock
+        agent_manager.core.spawn = gevent.spawn
+
+        def slow_call(peer, method, *args):
+            result = MagicMock()
+            result.get.side_effect = lambda timeout=None: gevent.sleep(0.05) or platform_responses[method]
+            return result
+        agent_manager.vip.rpc.call.side_effect = slow_call
+
+        readers = [gevent.spawn(agent_manager.agent_statuses) for _ in range(3)]
+        gevent.joinall(readers, timeout=2, raise_error=True)
+
+        assert all(reader.value["scheduler"]["status"] == "running" for reader in readers)
+        assert _platform_calls(agent_manager, "list_agents") == 1
+        assert _platform_calls(agent_manager, "status_agents") == 1
+
+    def test_stale_cache_is_served_on_failure(self, agent_manager: Agentmanager, platform_responses):
+        agent_manager.agent_statuses()
+        refreshed_at = agent_manager._statuses_refreshed_at
+        agent_manager._statuses_refreshed_at -= 60
+
+        platform_responses["status_agents"] = RuntimeError("control unreachable")
+        statuses = agent_manager.agent_statuses()
+        assert statuses["scheduler"]["status"] == "running"
+        assert statuses["scheduler"]["last_checked"] == refreshed_at
+
+    def test_empty_cache_failure_raises(self, agent_manager: Agentmanager, platform_responses):
+        platform_responses["list_agents"] = RuntimeError("control unreachable")
+        with pytest.raises(RuntimeError, match="Failed to fetch agents statuses"):
+            agent_manager.agent_statuses()
+
+        platform_responses["list_agents"] = []
+        with pytest.raises(RuntimeError):
+            agent_manager.agent_statuses()
+
+    def test_status_map_is_a_copy(self, agent_manager: Agentmanager):
+        agent_manager.agent_statuses()
+
+        status_map = agent_manager.get_agent_status_map()
+        status_map.pop("scheduler")
+        assert "scheduler" in agent_manager._agent_status_map
+
+        statuses = agent_manager.agent_statuses()
+        statuses.pop("scheduler")
+        assert "scheduler" in agent_manager._agent_status_map
+
+    def test_periodic_refresh_failure_keeps_cache(self, agent_manager: Agentmanager, platform_responses):
+        agent_manager.agent_statuses()
+        platform_responses["status_agents"] = RuntimeError("control unreachable")
+
+        agent_manager._periodic_status_refresh()
+        assert agent_manager._agent_status_map["scheduler"]["status"] == "running"
+
+#------------------- UUID lookup --------------------
+class TestUuidLookup:
+    def test_unknown_identity_refreshes_cache(self, agent_manager: Agentmanager):
+        assert agent_manager._get_uuid_from_identity("controlbhkw") == "uuid-bhkw"
+        assert _platform_calls(agent_manager, "list_agents") == 1
+
+        # known identities are served from the cache
+        assert agent_manager._get_uuid_from_identity("scheduler") == "uuid-scheduler"
+        assert _platform_calls(agent_manager, "list_agents") == 1
+
+    def test_unknown_identity_raises_value_error(self, agent_manager: Agentmanager):
+        with pytest.raises(ValueError, match="UUID not found"):
+            agent_manager._get_uuid_from_identity("not_installed")
+        assert _platform_calls(agent_manager, "list_agents") == 1
+
+#------------------- Background refresh --------------------
+class TestRefreshLater:
+    def test_refresh_requests_are_coalesced(self, agent_manager: Agentmanager):
+        spawned = []
+        agent_manager.core.spawn = lambda func, *args: spawned.append(func)
+
+        for _ in range(5):
+            agent_manager._refresh_agent_statuses_later()
+        assert len(spawned) == 1
+
+        # run the pending refresh with the regular spawn
+        del agent_manager.core.spawn
+        spawned[0]()
+        agent_manager.core.spawn = lambda func, *args: spawned.append(func)
+        assert _platform_calls(agent_manager, "status_agents") == 1
+        assert not agent_manager._status_refresh_pending
+
+        # once the pending refresh ran, the next request schedules a new one
+        agent_manager._refresh_agent_statuses_later()
+        assert len(spawned) == 2
+
+    def test_start_agent_schedules_refresh(self, agent_manager: Agentmanager):
+        with patch.object(agent_manager, "_refresh_agent_statuses_later") as refresh_later:
+            agent_manager.start_agent("scheduler")
+        refresh_later.assert_called_once()
+        agent_manager.vip.rpc.call.assert_any_call("control", "start_agent", "uuid-scheduler")
+
+    def test_refresh_interval_update_restarts_periodic(self, agent_manager: Agentmanager):
+        agent_manager.core.periodic = MagicMock()
+        agent_manager._start_status_refresh()
+        greenlet = agent_manager._status_refresh_greenlet
+
+        agent_manager._configure("config", "UPDATE", {"status_refresh_interval": 5})
+        greenlet.kill.assert_called_once()
+        agent_manager.core.periodic.assert_called_with(5, agent_manager._periodic_status_refresh)
+
+#------------------- Platform calls --------------------
+def _refused(method: str) -> jsonrpc.Error:
+    return jsonrpc.Error(jsonrpc.UNAUTHORIZED, f"User can call method {method} only with capabilities", None)
+
+def _vctl_result(stdout: str = "", returncode: int = 0, stderr: str = "") -> MagicMock:
+    return MagicMock(returncode=returncode, stdout=stdout, stderr=stderr)
+
+class TestPlatformCalls:
+    def test_autostart_maps_to_prioritize_agent(self, agent_manager: Agentmanager):
+        assert agent_manager.enable_agent_autostart("scheduler", "40")
+        agent_manager.vip.rpc.call.assert_called_with("control", "prioritize_agent", "uuid-scheduler", "40")
+
+        assert agent_manager.disable_agent_autostart("scheduler")
+        agent_manager.vip.rpc.call.assert_called_with("control", "prioritize_agent", "uuid-scheduler", None)
+
+    def test_config_store_rpcs(self, agent_manager: Agentmanager, platform_responses):
+        platform_responses["manage_list_configs"] = ["config", "registry.csv"]
+        platform_responses["manage_get"] = '{"a": 1}\n'
+
+        assert agent_manager.list_agent_configs("scheduler") == ["config", "registry.csv"]
+        agent_manager.vip.rpc.call.assert_called_with("config.store", "manage_list_configs", "scheduler")
+
+        assert agent_manager.get_config("scheduler", "config") == '{"a": 1}'
+        agent_manager.vip.rpc.call.assert_called_with("config.store", "manage_get", "scheduler", "config", True)
+
+        agent_manager.store_config_content("scheduler", "config", '{"a": 2}')
+        agent_manager.vip.rpc.call.assert_called_with("config.store", "manage_store", "scheduler", "config", '{"a": 2}', "json")
+
+        assert agent_manager.delete_config("scheduler", "config")
+        agent_manager.vip.rpc.call.assert_called_with("config.store", "manage_delete_config", "scheduler", "config")
+
+    @pytest.mark.parametrize("file_name, config_type", [("registry.csv", "csv"), ("REGISTRY.CSV", "csv"), ("config.json", "json"), ("config", "json")])
+    def test_store_config_file_detects_type(self, agent_manager: Agentmanager, tmp_path, file_name, config_type):
+        config_path = tmp_path / file_name
+        config_path.write_text("content")
+
+        agent_manager.store_config_file("scheduler", "stored", str(config_path))
+        agent_manager.vip.rpc.call.assert_called_with("config.store", "manage_store", "scheduler", "stored", "content", config_type)
+
+    def test_store_config_file_missing_file(self, agent_manager: Agentmanager, tmp_path):
+        with pytest.raises(RuntimeError, match="Error storing config file"):
+            agent_manager.store_config_file("scheduler", "stored", str(tmp_path / "missing.json"))
+
+    def test_refused_rpc_falls_back_to_vctl_in_threadpool(self, agent_manager: Agentmanager, platform_responses, tmp_path):
+        platform_responses["manage_list_configs"] = _refused("manage_list_configs")
+        platform_responses["manage_store"] = jsonrpc.Error(jsonrpc.METHOD_NOT_FOUND, "Method not found", None)
+        config_path = tmp_path / "registry.csv"
+        config_path.write_text("Point Name,Unit\n")
+        threads = set()
+
+        def run_vctl(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return _vctl_result("config\nregistry.csv\n")
+
+        with patch("agentmanager.agent.subprocess.run", side_effect=run_vctl) as run:
+            assert agent_manager.list_agent_configs("scheduler") == ["config", "registry.csv"]
+            run.assert_called_with(["vctl", "config", "list", "scheduler"], input=None, text=True, capture_output=True)
+
+            agent_manager.store_config_file("scheduler", "registry.csv", str(config_path))
+            run.assert_called_with(["vctl", "config", "store", "scheduler", "registry.csv", str(config_path), "--csv"],
+                                   input=None, text=True, capture_output=True)
+
+            agent_manager.store_config_content("scheduler", "config", '{"a": 1}')
+            run.assert_called_with(["vctl", "config", "store", "scheduler", "config", "-"], input='{"a": 1}', text=True, capture_output=True)
+        # vctl runs in the threadpool, not in the thread of the hub
+        assert run.call_count == 3
+        assert threads and threading.get_ident() not in threads
+
+    def test_failed_vctl_fallback_raises(self, agent_manager: Agentmanager, platform_responses):
+        platform_responses["prioritize_agent"] = _refused("prioritize_agent")
+        platform_responses["manage_get"] = _refused("manage_get")
+
+        with patch("agentmanager.agent.subprocess.run", return_value=_vctl_result(returncode=1, stderr="No such agent")):
+            assert agent_manager.enable_agent_autostart("scheduler", "40") is False
+            with pytest.raises(RuntimeError, match="No such agent"):
+                agent_manager.get_config("scheduler", "config")
+
+    def test_other_rpc_errors_do_not_fall_back(self, agent_manager: Agentmanager, platform_responses):
+        platform_responses["manage_get"] = jsonrpc.RemoteError("KeyError: 'No configuration file \"config\" for VIP IDENTIY scheduler'")
+        platform_responses["manage_delete_config"] = jsonrpc.Error(jsonrpc.UNAVAILABLE_PEER, "Peer config.store unavailable", None)
+
+        with patch("agentmanager.agent.subprocess.run") as run:
+            with pytest.raises(RuntimeError, match="No configuration file"):
+                agent_manager.get_config("scheduler", "config")
+            with pytest.raises(RuntimeError, match="Error deleting config"):
+                agent_manager.delete_config("scheduler", "config")
+        run.assert_not_called()
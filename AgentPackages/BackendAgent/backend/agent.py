@@ -7,12 +7,15 @@ from volttron.platform.vip.agent import Agent, Core, RPC
 
 import gevent
 import os
+import json
 import subprocess
+from collections import deque
+from gevent.event import Event
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from gevent.pywsgi import WSGIServer
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
 
 
@@ -24,6 +27,10 @@ __version__ = "0.1"
 
 LOG_PATH = "/home/user/volttron/volttron.log"
 TIMEOUT_TIME = 3
+DEFAULT_LIFECYCLE_TOPIC_PREFIX = "experiments/lifecycle"
+DEFAULT_EVENT_BUFFER_SIZE = 1000
+# seconds between keep alive comments on idle event streams
+EVENT_STREAM_HEARTBEAT = 15
 
 class InstallAgentRequest(BaseModel):
             base_dir: str
@@ -65,6 +72,12 @@ class Backend(Agent, MetadataMixin):
 
         self._server = None
 
+        # Experiment lifecycle events relayed to the event stream clients
+        self._lifecycle_topic_prefix: str = DEFAULT_LIFECYCLE_TOPIC_PREFIX
+        self._events: deque = deque(maxlen=DEFAULT_EVENT_BUFFER_SIZE) # ring buffer of (counter, event id, json data)
+        self._event_counter: int = 0 # local arrival order of the buffered events
+        self._event_signal: Event = Event() # set and replaced on every new event to wake up the streams
+
         self.vip.config.set_default("config", self.config)
         self.vip.config.subscribe(self.configure, actions=["NEW", "UPDATE"], pattern="config")
 
@@ -75,6 +88,12 @@ class Backend(Agent, MetadataMixin):
         self.topic_registry = self.config.get("topic_registry_identity", "topicregistryagent-0.1_1")
         self._http_host = self.config.get("host", "0.0.0.0")
         self._http_port = int(self.config.get("port", 8000))
+        self._lifecycle_topic_prefix = self.config.get("lifecycle_topic_prefix", DEFAULT_LIFECYCLE_TOPIC_PREFIX)
+        event_buffer_size = int(self.config.get("event_buffer_size", DEFAULT_EVENT_BUFFER_SIZE))
+        if event_buffer_size != self._events.maxlen:
+            self._events = deque(self._events, maxlen=event_buffer_size)
+
+        self._subscribe_lifecycle_events()
 
         try:
             self._register_routes()
@@ -322,6 +341,17 @@ class Backend(Agent, MetadataMixin):
                 return jsonify({"error": str(e)}), 500
 
 
+        @self.app.route("/experiments/events", methods=["GET"])
+        def stream_experiment_events():
+            """
+            Server-Sent Events stream of the experiment lifecycle events.
+            Reconnecting clients send the Last-Event-ID header and receive the buffered events they missed.
+            """
+            last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+            return Response(self._event_stream(last_event_id), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
         @self.app.route("/experiments/<experiment_id>/data", methods=["GET"])
         def get_experiment_data(experiment_id: str):
             try:
@@ -344,6 +374,47 @@ class Backend(Agent, MetadataMixin):
                 return jsonify({"error": str(e)}), 500
         
 
+        @self.app.route("/experiments", methods=["GET"])
+        def query_experiments():
+            """
+            One page of experiments, filtered and sorted by ExperimentManager.
+            Query args: state and plant (repeatable), experimenter, time_from, time_to, sort_by, order (asc/desc), limit, cursor
+            """
+            try:
+                query = {
+                    "states": request.args.getlist("state") or None,
+                    "plants": request.args.getlist("plant") or None,
+                    "experimenter": request.args.get("experimenter"),
+                    "time_from": request.args.get("time_from"),
+                    "time_to": request.args.get("time_to"),
+                    "sort_by": request.args.get("sort_by", "start_time"),
+                    "descending": request.args.get("order", "asc") == "desc",
+                    "limit": request.args.get("limit", 50, type=int),
+                    "cursor": request.args.get("cursor")
+                }
+                result = self.vip.rpc.call(self.expmanager_id, "query_experiments", **query).get(timeout=TIMEOUT_TIME)
+                _log.debug(f"Fetched {len(result.get('experiments', []))} of {result.get('total')} experiments")
+                return jsonify(result)
+            except Exception as e:
+                _log.error(f"Error querying experiments: {e}")
+                return jsonify({"error": str(e)}), 500
+
+
+        @self.app.route("/experiments/free_slot", methods=["GET"])
+        def find_next_free_slot():
+            request_data = request.get_json(force=True)
+            plants: List[str] = request_data.get("plants", [])
+            duration_seconds = request_data.get("duration_seconds")
+            not_before = request_data.get("not_before")
+            try:
+                result = self.vip.rpc.call(self.expmanager_id, "find_next_free_slot", plants, duration_seconds, not_before).get(timeout=TIMEOUT_TIME)
+                _log.debug(f"Found free slot for plants {plants}: {result}")
+                return jsonify({"slot": result})
+            except Exception as e:
+                _log.error(f"Error searching a free slot: {e}")
+                return jsonify({"error": str(e)}), 500
+
+
     # --------------------- Topic Management ---------------------
         @self.app.route("/topics/all/data", methods=["GET"])
         def get_topics_data():
@@ -374,6 +445,75 @@ class Backend(Agent, MetadataMixin):
         # TODO get plant status
 
 
+# --------------------- Experiment lifecycle events ---------------------
+
+    def _subscribe_lifecycle_events(self):
+        """
+        (Re)subscribe to the lifecycle events published by the experiment manager
+        """
+        try:
+            self.vip.pubsub.unsubscribe(peer="pubsub", prefix=None, callback=self._on_lifecycle_event)
+        except Exception as e:
+            _log.debug(f"No lifecycle subscription to remove: {e}")
+        self.vip.pubsub.subscribe(peer="pubsub", prefix=self._lifecycle_topic_prefix, callback=self._on_lifecycle_event)
+
+
+    def _on_lifecycle_event(self, peer, sender, bus, topic, headers, message):
+        """
+        Buffer a lifecycle event and wake up the event streams.
+        Events are identified by "<epoch>:<seq>" of the experiment manager.
+        """
+        if not isinstance(message, dict):
+            _log.warning(f"Ignoring lifecycle event with unexpected format on {topic}: {message!r}")
+            return
+
+        self._event_counter += 1
+        event_id = f"{message.get('epoch')}:{message.get('seq')}"
+        self._events.append((self._event_counter, event_id, json.dumps(message)))
+
+        signal, self._event_signal = self._event_signal, Event()
+        signal.set()
+
+
+    def _buffered_events_after(self, counter: int) -> List[Tuple[int, str, str]]:
+        """
+        Buffered events that arrived after the given local counter, oldest first
+        """
+        events = []
+        for event in reversed(self._events):
+            if event[0] <= counter:
+                break
+            events.append(event)
+        events.reverse()
+        return events
+
+
+    def _event_stream(self, last_event_id: Optional[str] = None):
+        """
+        Generator of the Server-Sent Events for one client.
+        Replays the buffered events after last_event_id, or the whole buffer if the id is unknown or too old.
+        """
+        counter = 0
+        if last_event_id:
+            for event in reversed(self._events):
+                if event[1] == last_event_id:
+                    counter = event[0]
+                    break
+        else:
+            # new clients only get new events
+            counter = self._event_counter
+
+        yield "retry: 3000\n\n"
+        while True:
+            signal = self._event_signal
+            events = self._buffered_events_after(counter)
+            for event_counter, event_id, data in events:
+                counter = event_counter
+                yield f"id: {event_id}\nevent: lifecycle\ndata: {data}\n\n"
+            if not events and not signal.wait(timeout=EVENT_STREAM_HEARTBEAT):
+                yield ": keep-alive\n\n"
+
+
 # --------------------- Server functions ---------------------
     
     def _start_http_server(self):
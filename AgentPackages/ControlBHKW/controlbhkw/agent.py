@@ -1,19 +1,27 @@
 """
-Agent documentation goes here.
+Plant Control Agent
+
+Generic control agent for one or more plants. The topics of every configured plant are loaded from
+the TopicRegistry with a single query. Commands are rate limited, validated and republished for the MQTT interface,
+status, sensor and error topics are collected into a plant state.
 """
 
 __docformat__ = 'reStructuredText'
 
+import json
 import logging
 import sys
+import time
 import gevent
+from bisect import bisect_left
+from uuid import uuid4
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
 
 from metadata.metadata_mixin import MetadataMixin
-from validators.validators import validate_command
+from validators.validators import compile_rules
 
 _log = logging.getLogger(__name__)
 utils.setup_logging()
@@ -23,6 +31,108 @@ DEFAULT_AGENT_MANAGER_IDENTITY = "agentmanageragent-0.1_1"
 DEFAULT_TOPIC_REGISTRY_IDENTITY = "topicregistryagent-0.1_1"
 DEFAULT_MQTT_INTERFACE_IDENTITY = "mqttinterfaceagent-0.2_1"
 
+class CommandThrottle:
+    """
+    Token bucket rate limit for one command topic.
+    One token is refilled every interval seconds up to burst tokens, every forwarded command consumes one token.
+    With coalescing, commands exceeding the limit are held back and only the latest one is forwarded once a token is available.
+    """
+    __slots__ = ("interval", "burst", "coalesce", "tokens", "last_refill", "pending", "flush_scheduled")
+
+    def __init__(self, interval: float, burst: int = 1, coalesce: bool = True):
+        self.interval = interval
+        self.burst = burst
+        self.coalesce = coalesce
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.pending: Optional[tuple] = None    # latest held back command as (message, correlation id)
+        self.flush_scheduled = False
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) / self.interval)
+        self.last_refill = now
+
+    def try_acquire(self, now: float) -> bool:
+        """
+        Consume a token if available.
+
+        Params:
+            now: current time.monotonic() value
+        Returns:
+            True if the command may be forwarded, False if the limit is exceeded
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self, now: float) -> float:
+        """
+        Returns the seconds until the next token is available.
+        """
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) * self.interval)
+
+def _error_is_active(value: Any) -> bool:
+    """
+    Interpret the payload of an error topic. Falsy values and strings like "0", "false", "off" mean no error.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "off", "none", "ok")
+    return bool(value)
+
+# upper bounds in seconds of the command latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class LatencyHistogram:
+    """
+    Fixed bucket histogram of latencies in seconds.
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(bound): count for bound, count in zip(LATENCY_BUCKETS + ("inf",), self.counts)}
+        }
+
+class CommandPlan:
+    """
+    Everything needed to handle a command on one topic, resolved once when the topic mappings load.
+    """
+    __slots__ = ("topic", "plant_name", "validator", "validated_topic", "feedback_topic", "echo_topic", "throttle", "source", "validated_target", "feedback_target")
+
+    def __init__(self, topic: str, validator: Optional[Callable[[Any], Any]], validated_topic: Optional[str], feedback_topic: Optional[str], throttle: Optional[CommandThrottle], source: str, validated_target: str, feedback_target: str = "volttron_bus", plant_name: Optional[str] = None, echo_topic: Optional[str] = None):
+        self.topic = topic
+        self.echo_topic = echo_topic
+        self.plant_name = plant_name
+        self.validator = validator
+        self.validated_topic = validated_topic
+        self.feedback_topic = feedback_topic
+        self.throttle = throttle
+        # static header parts
+        self.source = source
+        self.validated_target = validated_target
+        self.feedback_target = feedback_target
+
 def controlbhkw(config_path, **kwargs):
     """
     Parses the Agent configuration and returns an instance of
@@ -42,7 +152,8 @@ def controlbhkw(config_path, **kwargs):
 
 class Controlbhkw(Agent, MetadataMixin):
     """
-    Document agent constructor here.
+    Control agent hosting all plants listed in the config under "plants".
+    For backwards compatibility a single "plant_name" is used if no plants are listed.
     """
 
     def __init__(self, config, **kwargs):
@@ -53,12 +164,27 @@ class Controlbhkw(Agent, MetadataMixin):
         self._unvalidated_to_validated_topic_map: Dict[str, str] = {}           # {"unvalidated_topic": "validated_topic", ...}
         self._unvalidated_to_feedback_topic_map: Dict[str, str] = {}            # {"unvalidated_topic": "feedback_topic", ...} 
         self._unvalidated_topic_to_validation_rule_map: Dict[str, List[Any]] = {}     # {"unvalidated_topic": [{"validation_type": "type", ...params...}, ...], ...}
-        # TODO: Sensor topics
+        self._unvalidated_topic_to_validator_map: Dict[str, Callable[[Any], Any]] = {}  # {"unvalidated_topic": compiled validator, ...}
         self._status_topic_list: List[str] = []              
+        self._sensor_topic_list: List[str] = []
         self._error_topic_list: List[str] = []
-        self._command_messages_last_seen: Dict[str, datetime] = {}
-
-        self._plant_name = self._config.get("plant_name")
+        self._topic_to_plant_map: Dict[str, str] = {}                            # {"internal_topic": "plant_name", ...}
+        self._unvalidated_to_echo_topic_map: Dict[str, str] = {}                 # {"unvalidated_topic": "status topic reporting the applied command", ...}
+        self._unvalidated_topic_to_rate_limit_map: Dict[str, Dict[str, Any]] = {}     # {"unvalidated_topic": {"interval": seconds, "burst": tokens, "coalesce": bool}, ...}
+        self._command_throttles: Dict[str, CommandThrottle] = {}
+        self._command_plans: Dict[str, CommandPlan] = {}
+
+        # latest known plant state, every update replaces the topic entry and increases the version
+        self._plant_state: Dict[str, Dict[str, Any]] = {}       # {"topic": {"plant_name": plant, "type": topic type, "value": latest value, "timestamp": iso timestamp}, ...}
+        self._plant_state_version: int = 0
+        self._active_errors: Dict[str, set] = {}                # {"plant_name": {error topics reporting an error}, ...}
+
+        # command to actuation latency, measured from publishing the validated command until the plant echoes it
+        self._awaiting_echo: Dict[str, tuple] = {}              # {"echo_topic": (command topic, correlation id, value, monotonic send time), ...}
+        self._command_latency: Dict[str, LatencyHistogram] = {} # {"unvalidated_topic": histogram, ...}
+        self._reject_commands_on_error: bool = self._config.get("reject_commands_on_error", True)
+
+        self._plant_names: List[str] = self._get_configured_plants(self._config)
         self._topic_registry = config.get("topic_registry_identity", DEFAULT_TOPIC_REGISTRY_IDENTITY)
         self._agent_manager = config.get("agent_manager_identity", DEFAULT_AGENT_MANAGER_IDENTITY)
         self._mqtt_interface = config.get("mqtt_interface_identity", DEFAULT_MQTT_INTERFACE_IDENTITY)
@@ -69,40 +195,144 @@ class Controlbhkw(Agent, MetadataMixin):
 
     def configure(self, config_name, action, contents):
         self._config = contents
-        self._plant_name = self._config.get("plant_name")
+        self._plant_names = self._get_configured_plants(self._config)
         self._topic_registry = self._config.get("topic_registry_identity", self._topic_registry)
         self._agent_manager = self._config.get("agent_manager_identity", self._agent_manager)
         self._mqtt_interface = self._config.get("mqtt_interface_identity", self._mqtt_interface)
+        self._reject_commands_on_error = self._config.get("reject_commands_on_error", True)
         self._load_topic_mappings()
+        self._build_command_plans()
         self._subscribe_topics()
 
 
-    def _load_topic_mappings(self):
+    @staticmethod
+    def _get_configured_plants(config: Dict[str, Any]) -> List[str]:
         """
-        Retrieve topic lists, mappings and validation rules from TopicRegistry.
+        Returns the list of plants to control from the config.
         """
-        try:
-            self._unvalidated_to_validated_topic_map: Dict[str, str] = self._get_command_mapping()
-            
-            self._unvalidated_to_feedback_topic_map: Dict[str, str] = self._get_command_feedback()
+        plants = config.get("plants")
+        if plants:
+            return list(plants)
+        plant_name = config.get("plant_name")
+        return [plant_name] if plant_name else []
 
-            self._unvalidated_topic_to_validation_rule_map: Dict[str, List[Any]] = self._get_validation_rules()
 
-            self._status_topic_list: List[str] = self._get_status_topics()
-
-            self._error_topic_list: List[str] = self._get_error_topics()
-
-            _log.debug(f"Loaded topic mappings.")
+    def _load_topic_mappings(self):
+        """
+        Retrieve the topics of all plants with one TopicRegistry query and derive topic lists, mappings and validation rules from it.
+        """
+        try:
+            topics: Dict[str, Dict[str, Any]] = {}
+            if self._plant_names:
+                topics = self._get_plants_topics()
+            else:
+                _log.warning("No plants configured, no topics to control.")
+
+            self._unvalidated_to_validated_topic_map = {}
+            self._unvalidated_to_feedback_topic_map = {}
+            self._unvalidated_topic_to_validation_rule_map = {}
+            self._unvalidated_topic_to_rate_limit_map = {}
+            self._status_topic_list = []
+            self._sensor_topic_list = []
+            self._error_topic_list = []
+            self._topic_to_plant_map = {}
+            self._unvalidated_to_echo_topic_map = {}
+
+            for internal, details in topics.items():
+                topic_type = details.get("type")
+                self._topic_to_plant_map[internal] = details.get("plant_name")
+                if topic_type == "command":
+                    if details.get("validated_topic"):
+                        self._unvalidated_to_validated_topic_map[internal] = details.get("validated_topic")
+                    if details.get("feedback_topic"):
+                        self._unvalidated_to_feedback_topic_map[internal] = details.get("feedback_topic")
+                    if details.get("validation"):
+                        self._unvalidated_topic_to_validation_rule_map[internal] = details.get("validation")
+                    if details.get("rate_limit"):
+                        self._unvalidated_topic_to_rate_limit_map[internal] = details.get("rate_limit")
+                    if details.get("echo_topic"):
+                        self._unvalidated_to_echo_topic_map[internal] = details.get("echo_topic")
+                elif topic_type == "status":
+                    self._status_topic_list.append(internal)
+                elif topic_type == "sensor":
+                    self._sensor_topic_list.append(internal)
+                elif topic_type == "error":
+                    self._error_topic_list.append(internal)
+
+            self._compile_validators()
+
+            self._build_throttles()
+
+            _log.debug(f"Loaded topic mappings for plants {self._plant_names}.")
         except Exception as e:
             _log.error(f"Failed loading topic mappings: {e}")
             raise
 
 
+    def _compile_validators(self):
+        """
+        Compile the validation rules of every command topic once into a validator.
+        Topics with invalid rules get no validator, their commands fail validation.
+        """
+        self._unvalidated_topic_to_validator_map = {}
+        # topics with identical rules, like topic families or similar plants, share one validator
+        compiled: Dict[str, Callable[[Any], Any]] = {}
+        for topic, rules in self._unvalidated_topic_to_validation_rule_map.items():
+            try:
+                rules_key = json.dumps(rules, sort_keys=True)
+                if rules_key not in compiled:
+                    compiled[rules_key] = compile_rules(rules)
+                self._unvalidated_topic_to_validator_map[topic] = compiled[rules_key]
+            except Exception as e:
+                _log.error(f"Invalid validation rules for {topic}, commands on this topic will be rejected: {e}")
+
+
+    def _build_throttles(self):
+        """
+        Create a rate limit stage for every command topic with a configured rate limit.
+        """
+        self._command_throttles = {}
+        for topic, rate_limit in self._unvalidated_topic_to_rate_limit_map.items():
+            try:
+                self._command_throttles[topic] = CommandThrottle(
+                    interval=float(rate_limit["interval"]),
+                    burst=int(rate_limit.get("burst", 1)),
+                    coalesce=bool(rate_limit.get("coalesce", True))
+                )
+            except Exception as e:
+                _log.error(f"Invalid rate limit for {topic}, commands on this topic are not rate limited: {e}")
+
+
+    def _build_command_plans(self):
+        """
+        Bundle validator, topics, rate limit and static header parts of every command topic into one plan,
+        so handling a command needs a single lookup.
+        """
+        self._command_plans = {}
+        # every subscribed command topic gets a plan, the feedback topic is optional
+        for topic, validated_topic in self._unvalidated_to_validated_topic_map.items():
+            self._command_plans[topic] = CommandPlan(
+                topic=topic,
+                validator=self._unvalidated_topic_to_validator_map.get(topic),
+                validated_topic=validated_topic,
+                feedback_topic=self._unvalidated_to_feedback_topic_map.get(topic),
+                throttle=self._command_throttles.get(topic),
+                source=self.core.identity,
+                validated_target=self._mqtt_interface,
+                plant_name=self._topic_to_plant_map.get(topic),
+                echo_topic=self._unvalidated_to_echo_topic_map.get(topic)
+            )
+        self._awaiting_echo = {}
+
+
     def _subscribe_topics(self):
         """
         Subscribes to unvalidated topics for command interception.
-        Subscribes to status topics to monitor the plant.
+        Subscribes to status, sensor and error topics to monitor the plants.
+        Subscriptions of a previous configuration are removed first.
         """
+        self.vip.pubsub.unsubscribe(peer="pubsub", prefix=None, callback=None)
+
         for unvalidated_topic in self._unvalidated_to_validated_topic_map.keys():
             self.vip.pubsub.subscribe(
                 peer="pubsub", # TODO maybe its own peer group for more security
@@ -119,6 +349,14 @@ class Controlbhkw(Agent, MetadataMixin):
             )
             _log.debug(f"Subscribed to {status_topic} status topic")
         
+        for sensor_topic in self._sensor_topic_list:
+            self.vip.pubsub.subscribe(
+                peer="pubsub",
+                prefix=sensor_topic,
+                callback=self._on_sensor_message
+            )
+            _log.debug(f"Subscribed to {sensor_topic} sensor topic")
+        
         for error_topic in self._error_topic_list:
             self.vip.pubsub.subscribe(
                 peer="pubsub",
@@ -130,118 +368,240 @@ class Controlbhkw(Agent, MetadataMixin):
 
     def _on_command_message(self, peer, sender, bus, topic, headers, message):
         """
-        Callback function to on receiving unvalidated plant command message then apply validation and republish if valid.
+        Callback function to on receiving unvalidated plant command message then apply rate limit, validation and republish if valid.
+        """
+        plan = self._command_plans.get(topic)
+        if plan is None:
+            _log.warning(f"Received command on unknown topic {topic}")
+            return
+
+        # correlation id of the command is carried into the validated command and all feedback
+        correlation_id = (headers or {}).get("correlation_id") or uuid4().hex
+
+        throttle = plan.throttle
+        if throttle is not None and throttle.pending is not None:
+            # latest wins, the held back command is replaced and sent by the scheduled flush,
+            # a token that refilled meanwhile must not let the newer command overtake the flush
+            self._publish_feedback(plan, f"Command superseded for {topic}: newer command received", throttle.pending[1])
+            throttle.pending = (message, correlation_id)
+            return
+
+        if throttle is not None and not throttle.try_acquire(time.monotonic()):
+            if not throttle.coalesce:
+                _log.debug(f"Rate limit exceeded for {topic}, command dropped")
+                self._publish_feedback(plan, f"Command dropped for {topic}: rate limit exceeded", correlation_id)
+                return
+
+            # hold the command back until a token is available
+            throttle.pending = (message, correlation_id)
+            if not throttle.flush_scheduled:
+                throttle.flush_scheduled = True
+                self.core.spawn_later(throttle.time_until_token(time.monotonic()), self._flush_pending_command, plan)
+            return
+
+        self._process_command(plan, message, correlation_id)
+
+
+    def _flush_pending_command(self, plan: CommandPlan):
         """
+        Forward the latest held back command of a rate limited topic.
+        """
+        throttle = plan.throttle
+        if throttle is None or throttle.pending is None:
+            return
+
+        now = time.monotonic()
+        if not throttle.try_acquire(now):
+            self.core.spawn_later(throttle.time_until_token(now), self._flush_pending_command, plan)
+            return
+
+        message, correlation_id = throttle.pending
+        throttle.pending = None
+        throttle.flush_scheduled = False
+        self._process_command(plan, message, correlation_id)
 
-        # get the list of validation rules 
-        rules = self._unvalidated_topic_to_validation_rule_map.get(topic)
-        validation_message: str = None 
-        time_now = datetime.now(timezone.utc)
+
+    def _process_command(self, plan: CommandPlan, message: Any, correlation_id: str):
+        """
+        Validate the command and republish it on the validated topic if valid. Publishes feedback in any case.
+        """
+        timestamp = datetime.now(timezone.utc).isoformat()
         
-        # TODO: multiple messages in short time are discarded?
-        #if not self._topic_is_timed_out(topic, time_now): 
         try:
+            # no commands to the plant while it reports errors
+            active_errors = self._active_errors.get(plan.plant_name)
+            if self._reject_commands_on_error and active_errors:
+                raise ValueError(f"Plant {plan.plant_name} reports active errors on {sorted(active_errors)}")
+
             # validate the payload
-            validated_value = validate_command(message, rules)
+            if plan.validator is None or plan.validated_topic is None:
+                raise ValueError(f"No validation rules for {plan.topic}")
+            validated_value = plan.validator(message)
             validation_message = "Validation successfull"
         
             # publish validated command
-            validated_topic = self._unvalidated_to_validated_topic_map[topic]
-            header = {"source": self.core.identity, "target": self._mqtt_interface, "timestamp": time_now.isoformat()}
-            self.vip.pubsub.publish(peer="pubsub", topic=validated_topic, headers=header, message=validated_value)
-            #_log.debug(f"Validated {topic} -> {validated_topic}: {validated_value}")
-
-        # TODO: match msg id?
+            header = {"source": plan.source, "target": plan.validated_target, "timestamp": timestamp, "correlation_id": correlation_id}
+            self.vip.pubsub.publish(peer="pubsub", topic=plan.validated_topic, headers=header, message=validated_value)
+            if plan.echo_topic:
+                self._awaiting_echo[plan.echo_topic] = (plan.topic, correlation_id, validated_value, time.monotonic())
 
         except ValueError as e:
-            # TODO: need more data like timestamp and etc. or outload the publishing and message matching to a client
-            _log.warning(f"Validation failed for {topic}: {e}")
-            validation_message = f"Validation failed for {topic}: {e}"
-        
-        #else: validation_message = "Message timedout, wait."
+            _log.warning(f"Validation failed for {plan.topic}: {e}")
+            validation_message = f"Validation failed for {plan.topic}: {e}"
+
+        self._publish_feedback(plan, validation_message, correlation_id, timestamp)
+
 
-        # publish validation feedback
-        validated_topic = self._unvalidated_to_feedback_topic_map[topic]
-        header = {"source": self.core.identity, "target": "volttron_bus", "timestamp": time_now.isoformat()}
-        self.vip.pubsub.publish(peer="pubsub", topic=validated_topic, headers=header, message=validation_message)
+    def _publish_feedback(self, plan: CommandPlan, feedback_message: str, correlation_id: str, timestamp: Optional[str] = None):
+        """
+        Publish feedback on a command to the feedback topic of the command topic, if it has one.
+        """
+        if plan.feedback_topic is None:
+            _log.debug(f"No feedback topic for {plan.topic}: {feedback_message}")
+            return
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).isoformat()
+        header = {"source": plan.source, "target": plan.feedback_target, "timestamp": timestamp, "correlation_id": correlation_id}
+        self.vip.pubsub.publish(peer="pubsub", topic=plan.feedback_topic, headers=header, message=feedback_message)
         
 
     def _on_status_message(self, peer, sender, bus, topic, headers, message):
         """
-        Callback function on receiving plant status from MQTT interface and update PlantRegistry.
+        Callback function on receiving plant status from MQTT interface and update the plant state.
         """
         try:
-            # TODO
-            #status = message.get("status")
-            #self.vip.rpc.call(self.plant_registry, "update_status", plant_name = self.plant_name, status = status)
-            #_log.debug(f"Received status message.{topic}: {message}")
-            pass
+            _log.debug(f"Received status message {topic}: {message}")
+            self._update_plant_state(topic, "status", headers, message)
         except Exception as e:
             _log.error(f"Failed to update status: {e}")
 
 
+    def _on_sensor_message(self, peer, sender, bus, topic, headers, message):
+        """
+        Callback function on receiving plant sensor values from MQTT interface and update the plant state.
+        """
+        try:
+            _log.debug(f"Received sensor message {topic}: {message}")
+            self._update_plant_state(topic, "sensor", headers, message)
+        except Exception as e:
+            _log.error(f"Failed to update sensor value: {e}")
+
+
     def _on_error_message(self, peer, sender, bus, topic, headers, message):
         """
-        Callback function on receiving plant error messages from MQTT interface and update PlantRegistry.
+        Callback function on receiving plant error messages from MQTT interface and update the plant state.
+        While an error is active commands are rejected, if configured.
         """
         try:
-            # TODO
-            #status = message.get("status")
-            #self.vip.rpc.call(self.plant_registry, "update_status", plant_name = self.plant_name, status = status)
-            #_log.debug(f"Received error message.{topic}: {message}")
-            pass
+            _log.debug(f"Received error message {topic}: {message}")
+            self._update_plant_state(topic, "error", headers, message)
+            plant_name = self._topic_to_plant_map.get(topic)
+            active_errors = self._active_errors.setdefault(plant_name, set())
+            if _error_is_active(message):
+                if topic not in active_errors:
+                    _log.warning(f"Plant {plant_name} reports error on {topic}: {message}")
+                active_errors.add(topic)
+            else:
+                active_errors.discard(topic)
         except Exception as e:
-            _log.error(f"Failed to update status: {e}")
+            _log.error(f"Failed to update error state: {e}")
 
 
-    def _topic_is_timed_out(self, topic: str, now: datetime) -> bool:
+    def _update_plant_state(self, topic: str, topic_type: str, headers: Optional[Dict[str, Any]], message: Any):
+        """
+        Replace the state entry of the topic and increase the state version.
+        The timestamp of the message header is used if present, the time of arrival otherwise.
         """
-        Check whether the topic is timed out and should be ignored.
+        timestamp = (headers or {}).get("timestamp") or datetime.now(timezone.utc).isoformat()
+        self._plant_state[topic] = {"plant_name": self._topic_to_plant_map.get(topic), "type": topic_type, "value": message, "timestamp": timestamp}
+        self._plant_state_version += 1
+        if topic in self._awaiting_echo:
+            self._check_command_echo(topic, headers, message)
 
-        Params:
-            topic: topic as string
-            now: datetime object of current time to check against
 
+    def _check_command_echo(self, topic: str, headers: Optional[Dict[str, Any]], message: Any):
+        """
+        Record the command to actuation latency if the message echoes the last validated command.
+        The echo is matched by correlation id if the plant reports one, by value otherwise.
+        """
+        command_topic, correlation_id, value, sent = self._awaiting_echo[topic]
+        echoed_id = (headers or {}).get("correlation_id")
+        if echoed_id != correlation_id and (echoed_id is not None or message != value):
+            return
+
+        del self._awaiting_echo[topic]
+        latency = time.monotonic() - sent
+        self._command_latency.setdefault(command_topic, LatencyHistogram()).record(latency)
+        _log.debug(f"Command {correlation_id} on {command_topic} applied after {latency:.3f}s")
+
+
+    @RPC.export
+    def get_command_latency_stats(self, topic_list_match: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the command to actuation latency statistics per command topic.
+        Only command topics with an echo topic defined in the TopicRegistry are measured.
+
+        Params:
+            topic_list_match: list of command topics to filter for, all measured topics if not provided
         Returns:
-            bool: True if message should be ignored, False otherwise 
+            Dict with latency statistics in seconds. Output format:
+            {
+                command topic: {
+                    "count": number of measured commands,
+                    "mean": mean latency, "min": min latency, "max": max latency,
+                    "buckets": {bucket upper bound: count, ..., "inf": count}
+                },
+                ...
+            }
         """
-        timeout = self._unvalidated_topic_to_validation_rule_map.get(topic).get("timeout")
-        last_time = self._command_messages_last_seen.get(topic)
+        return {
+            topic: histogram.to_dict() for topic, histogram in self._command_latency.items()
+            if not topic_list_match or topic in topic_list_match
+        }
 
-        # If no timeout is defined, validate
-        if not timeout:
-            return False
 
-        # If this is the first message, validate
-        if not last_time:
-            self._command_messages_last_seen[topic] = now
-            return False
+    @RPC.export
+    def get_plant_state(self, plant_name_list_match: Optional[List[str]] = None, topic_type_list_match: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns the latest known state of the plants.
 
-        # Check if timeout window has passed
-        if now - last_time >= timeout:
-            self._command_messages_last_seen[topic] = now
-            return False
+        Params:
+            plant_name_list_match: list of plants to filter for, all hosted plants if not provided
+            topic_type_list_match: list of topic types to filter for, all types if not provided
+        Returns:
+            Dict with the plant state. Output format:
+            {
+                "plant_names": list of included plants,
+                "version": state version, increases with every update,
+                "active_errors": list of error topics reporting an error,
+                "topics": {
+                    internal topic: {"plant_name": plant, "type": topic type, "value": latest value, "timestamp": iso timestamp},
+                    ...
+                }
+            }
+        """
+        plant_names = [plant for plant in self._plant_names if plant in plant_name_list_match] if plant_name_list_match else list(self._plant_names)
+        topics = {
+            topic: entry for topic, entry in self._plant_state.items()
+            if (not plant_name_list_match or entry["plant_name"] in plant_name_list_match)
+            and (not topic_type_list_match or entry["type"] in topic_type_list_match)
+        }
+        active_errors = []
+        for plant_name, error_topics in self._active_errors.items():
+            if not plant_name_list_match or plant_name in plant_name_list_match:
+                active_errors.extend(error_topics)
+        return {
+            "plant_names": plant_names,
+            "version": self._plant_state_version,
+            "active_errors": sorted(active_errors),
+            "topics": topics
+        }
 
-        # Too soon — ignore message
-        return True 
 
-    
     # -----------------------
     # for easier unit testing
-    def _get_command_mapping(self):
-        return self.vip.rpc.call(self._topic_registry, "get_unvalidated_to_validated_commands_map", plant_name_list_match=[self._plant_name]).get(timeout=2)
-    
-    def _get_command_feedback(self):
-        return self.vip.rpc.call(self._topic_registry, "get_unvalidated_to_feedback_map", plant_name_list_match=[self._plant_name]).get(timeout=2)
-    
-    def _get_validation_rules(self):
-        return self.vip.rpc.call(self._topic_registry, "get_unvalidated_to_validation_rule_map", plant_name_list_match=[self._plant_name]).get(timeout=2)
-    
-    def _get_status_topics(self):
-        return self.vip.rpc.call(self._topic_registry, "get_list_of_internal_topics", topic_type_list_match=["status"], plant_name_list_match=[self._plant_name]).get(timeout=2)
-    
-    def _get_error_topics(self):
-        return self.vip.rpc.call(self._topic_registry, "get_list_of_internal_topics", topic_type_list_match=["error"], plant_name_list_match=[self._plant_name]).get(timeout=2)
+    def _get_plants_topics(self):
+        return self.vip.rpc.call(self._topic_registry, "search_topics", plant_name_list_match=self._plant_names).get(timeout=2)
     # -----------------------
 
     @Core.receiver("onstart")
@@ -36,9 +36,19 @@ def mock_agent():
 def mock_rpc_responses():
     """Default fake RPC responses for topicregistry methods."""
     return {
-        "get_unvalidated_to_validated_commands_map": {"unvalidated/topic": "validated/topic"},
-        "get_unvalidated_to_feedback_map": {"unvalidated/topic": "feedback/topic"},
-        "get_unvalidated_to_validation_rule_map": {"unvalidated/topic": [{"rule": "number"}]},
-        "get_list_of_internal_topics_status": ["status/topic"],
-        "get_list_of_internal_topics_error": ["error/topic"]
-    }
\ No newline at end of file
+        "search_topics": {
+            "unvalidated/topic": {
+                "plant_name": "PlantA",
+                "type": "command",
+                "external_topic": "external/command",
+                "meta": {},
+                "validated_topic": "validated/topic",
+                "feedback_topic": "feedback/topic",
+                "validation": [{"rule": "number"}],
+                "rate_limit": {"interval": 1.0, "burst": 1, "coalesce": True}
+            },
+            "status/topic": {"plant_name": "PlantA", "type": "status", "external_topic": "external/status", "meta": {}},
+            "sensor/topic": {"plant_name": "PlantB", "type": "sensor", "external_topic": "external/sensor", "meta": {}},
+            "error/topic": {"plant_name": "PlantB", "type": "error", "external_topic": "external/error", "meta": {}}
+        }
+    }
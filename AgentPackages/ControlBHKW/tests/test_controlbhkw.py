@@ -2,7 +2,7 @@ import pytest
 import json
 from typing import List, Dict
 from datetime import datetime
-from controlbhkw.agent import Controlbhkw
+from controlbhkw.agent import Controlbhkw, CommandThrottle, LatencyHistogram
 from unittest.mock import MagicMock, patch
 from typing import Optional
 
@@ -12,37 +12,106 @@ def test_agent(control_agent):
 def test_configure_calls_load_and_subscribe(mock_agent):
     """Ensure configure() loads mappings and subscribes to topics."""
     with patch.object(mock_agent, "_load_topic_mappings") as load_mock, \
+         patch.object(mock_agent, "_build_command_plans") as plans_mock, \
          patch.object(mock_agent, "_subscribe_topics") as subscribe_mock:
         
         mock_agent.configure("config", "NEW", {})
 
         load_mock.assert_called_once()
+        plans_mock.assert_called_once()
         subscribe_mock.assert_called_once()
 
 
+def test_build_command_plans(mock_agent):
+    """Ensure a plan is built per command topic with all lookups resolved."""
+    validator = MagicMock()
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": validator}
+
+    mock_agent._build_command_plans()
+
+    plan = mock_agent._command_plans["topic1"]
+    assert plan.validator is validator
+    assert plan.validated_topic == "validated/topic1"
+    assert plan.feedback_topic == "feedback/topic1"
+    assert plan.throttle is None
+    assert plan.validated_target == mock_agent._mqtt_interface
+
+
+def test_command_without_feedback_topic_is_forwarded(mock_agent):
+    """A command topic without feedback topic still gets a plan, its commands are forwarded without feedback."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._build_command_plans()
+
+    assert mock_agent._command_plans["topic1"].feedback_topic is None
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 5)
+
+    topics = [call_kwargs["topic"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list]
+    assert topics == ["validated/topic1"]
+
+
 def test_load_topic_mappings_sets_correct_data(mock_agent, mock_rpc_responses):
-    """Test that _load_topic_mappings retrieves and stores data correctly."""
-
-    def side_effect(peer, method, plant_name_list_match: Optional[list]=None, topic_type_list_match: Optional[list]=None):
-        #assert plant_name_list_match == ["Test"] or topic_type_list_match == ["status"] or topic_type_list_match == ["error"]
-        #assert peer == "topicregistry"  # optional sanity check
-        if topic_type_list_match == ["status"]:
-            method = method + "_status"
-        elif topic_type_list_match == ["error"]:
-            method = method + "_error"
-        else:
-            method = method
+    """Test that _load_topic_mappings retrieves all plants topics with one query and derives the mappings."""
+
+    def side_effect(peer, method, plant_name_list_match: Optional[list]=None):
+        assert plant_name_list_match == ["PlantA", "PlantB"]
         return MagicMock(get=lambda timeout: mock_rpc_responses[method])
 
     mock_agent.vip.rpc.call.side_effect = side_effect
+    mock_agent._plant_names = ["PlantA", "PlantB"]
 
     mock_agent._load_topic_mappings()
 
-    assert mock_agent._unvalidated_to_validated_topic_map == mock_rpc_responses["get_unvalidated_to_validated_commands_map"]
-    assert mock_agent._unvalidated_to_feedback_topic_map == mock_rpc_responses["get_unvalidated_to_feedback_map"]
-    assert mock_agent._unvalidated_topic_to_validation_rule_map == mock_rpc_responses["get_unvalidated_to_validation_rule_map"]
-    assert mock_agent._status_topic_list == mock_rpc_responses["get_list_of_internal_topics_status"]
-    assert mock_agent._error_topic_list == mock_rpc_responses["get_list_of_internal_topics_error"]
+    assert mock_agent.vip.rpc.call.call_count == 1
+    assert mock_agent._unvalidated_to_validated_topic_map == {"unvalidated/topic": "validated/topic"}
+    assert mock_agent._unvalidated_to_feedback_topic_map == {"unvalidated/topic": "feedback/topic"}
+    assert mock_agent._unvalidated_topic_to_validation_rule_map == {"unvalidated/topic": [{"rule": "number"}]}
+    assert mock_agent._status_topic_list == ["status/topic"]
+    assert mock_agent._sensor_topic_list == ["sensor/topic"]
+    assert mock_agent._error_topic_list == ["error/topic"]
+    assert mock_agent._topic_to_plant_map["error/topic"] == "PlantB"
+    # the fake rule is invalid, so no validator is compiled for the topic
+    assert mock_agent._unvalidated_topic_to_validator_map == {}
+    assert mock_agent._unvalidated_topic_to_rate_limit_map == {"unvalidated/topic": {"interval": 1.0, "burst": 1, "coalesce": True}}
+    assert set(mock_agent._command_throttles.keys()) == {"unvalidated/topic"}
+
+
+def test_configured_plants():
+    """Plants are read from the plants list, with plant_name as fallback."""
+    assert Controlbhkw._get_configured_plants({"plants": ["BHKW", "Speicher"]}) == ["BHKW", "Speicher"]
+    assert Controlbhkw._get_configured_plants({"plant_name": "BHKW"}) == ["BHKW"]
+    assert Controlbhkw._get_configured_plants({}) == []
+
+
+def test_compile_validators(mock_agent):
+    """Ensure validation rules are compiled once per topic."""
+    mock_agent._unvalidated_topic_to_validation_rule_map = {
+        "topic1": [{"validation_type": "range", "min_value": 30, "max_value": 80}],
+        "topic2": [{"validation_type": "unknown"}]
+    }
+
+    mock_agent._compile_validators()
+
+    assert set(mock_agent._unvalidated_topic_to_validator_map.keys()) == {"topic1"}
+    assert mock_agent._unvalidated_topic_to_validator_map["topic1"](50) == 50
+    with pytest.raises(ValueError):
+        mock_agent._unvalidated_topic_to_validator_map["topic1"](90)
+
+
+def test_on_command_message_without_validator_fails(mock_agent):
+    """Commands on topics without valid rules are rejected."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._build_command_plans()
+
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 100)
+
+    assert mock_agent.vip.pubsub.publish.call_count == 1
+    call_args, call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[0]
+    assert call_kwargs["topic"] == "feedback/topic1"
 
 
 def test_subscribe_topics_registers_all(mock_agent):
@@ -61,34 +130,32 @@ def test_on_command_message_validates_and_publishes(mock_agent):
     """Ensure _on_command_message validates payload and republishes."""
     mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
     mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
-    mock_agent._unvalidated_topic_to_validation_rule_map = {"topic1": {"rule_type": "range"}}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": MagicMock(return_value=42)}
+    mock_agent._build_command_plans()
 
-    # Patch validate_command
-    with patch("controlbhkw.agent.validate_command", return_value=42):
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 100)
 
-        mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 100)
+    assert mock_agent.vip.pubsub.publish.call_count == 2
+    
+    first_call_args, first_call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[0]
+    second_call_args, second_call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[1]
 
-        assert mock_agent.vip.pubsub.publish.call_count == 2
-        
-        first_call_args, first_call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[0]
-        second_call_args, second_call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[1]
+    # Now check them individually
+    assert first_call_kwargs["topic"] == "validated/topic1"
+    assert first_call_kwargs["message"] == 42
 
-        # Now check them individually
-        assert first_call_kwargs["topic"] == "validated/topic1"
-        assert first_call_kwargs["message"] == 42
-
-        assert second_call_kwargs["topic"] == "feedback/topic1"
-        assert second_call_kwargs["message"] == "Validation successfull"
+    assert second_call_kwargs["topic"] == "feedback/topic1"
+    assert second_call_kwargs["message"] == "Validation successfull"
 
 
 def test_on_command_message_validation_fails(mock_agent, caplog):
     """If validation fails, ensure warning is logged."""
     mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
     mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
-    mock_agent._unvalidated_topic_to_validation_rule_map = {"topic1": {"rule_type": "range"}}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": MagicMock(side_effect=ValueError("Invalid"))}
+    mock_agent._build_command_plans()
 
-    with patch("controlbhkw.agent.validate_command", side_effect=ValueError("Invalid")):
-        mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 100)
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 100)
 
     assert "Validation failed for topic1" in caplog.text
 
@@ -107,4 +174,194 @@ def test_on_status_message_logs_info(mock_agent, caplog):
 def test_on_error_message_logs_info(mock_agent, caplog):
     """Ensure error messages are handled gracefully."""
     mock_agent._on_error_message("peer", "sender", "bus", "error/topic", {}, {"error": "fail"})
-    assert "Received error message" in caplog.text
\ No newline at end of file
+    assert "Received error message" in caplog.text
+
+
+def test_command_throttle_token_bucket():
+    """Tokens refill over time up to the burst size."""
+    throttle = CommandThrottle(interval=1.0, burst=2)
+    now = throttle.last_refill
+    assert throttle.try_acquire(now)
+    assert throttle.try_acquire(now)
+    assert not throttle.try_acquire(now + 0.5)
+    assert throttle.time_until_token(now + 0.5) == pytest.approx(0.5)
+    assert throttle.try_acquire(now + 1.0)
+    assert not throttle.try_acquire(now + 1.0)
+
+
+def test_on_command_message_coalesces_burst(mock_agent):
+    """Bursts exceeding the rate limit collapse into the latest command."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._command_throttles = {"topic1": CommandThrottle(interval=60.0, burst=1, coalesce=True)}
+    mock_agent._build_command_plans()
+
+    with patch.object(mock_agent.core, "spawn_later") as spawn_later_mock:
+        for value in (1, 2, 3):
+            mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, value)
+
+        # first command passes, the next one is held back and superseded by the last
+        spawn_later_mock.assert_called_once()
+        published = [call_kwargs["message"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list]
+        assert published == [1, "Validation successfull", "Command superseded for topic1: newer command received"]
+        assert mock_agent._command_throttles["topic1"].pending[0] == 3
+
+    # once a token is available the latest command is forwarded
+    mock_agent._command_throttles["topic1"].tokens = 1
+    mock_agent._flush_pending_command(mock_agent._command_plans["topic1"])
+    validated = [call_kwargs["message"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list if call_kwargs["topic"] == "validated/topic1"]
+    assert validated == [1, 3]
+    assert mock_agent._command_throttles["topic1"].pending is None
+
+
+def test_on_command_message_keeps_order_when_token_refills_before_flush(mock_agent):
+    """A command arriving after a token refilled but before the flush must not overtake the pending one."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._command_throttles = {"topic1": CommandThrottle(interval=60.0, burst=1, coalesce=True)}
+    mock_agent._build_command_plans()
+    throttle = mock_agent._command_throttles["topic1"]
+
+    with patch.object(mock_agent.core, "spawn_later"):
+        mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 1)
+        mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 2)
+        # the token refills before the scheduled flush runs
+        throttle.tokens = 1
+        mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 3)
+
+    validated = [call_kwargs["message"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list if call_kwargs["topic"] == "validated/topic1"]
+    assert validated == [1]
+    assert throttle.pending[0] == 3
+
+    mock_agent._flush_pending_command(mock_agent._command_plans["topic1"])
+    validated = [call_kwargs["message"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list if call_kwargs["topic"] == "validated/topic1"]
+    # the plant ends with the newest setpoint
+    assert validated == [1, 3]
+    assert throttle.pending is None
+
+
+def test_on_command_message_drops_without_coalescing(mock_agent):
+    """Without coalescing, commands exceeding the rate limit are dropped with feedback."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._command_throttles = {"topic1": CommandThrottle(interval=60.0, burst=1, coalesce=False)}
+    mock_agent._build_command_plans()
+
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 1)
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 2)
+
+    assert mock_agent.vip.pubsub.publish.call_count == 3
+    call_args, call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[2]
+    assert call_kwargs["topic"] == "feedback/topic1"
+    assert "rate limit exceeded" in call_kwargs["message"]
+
+
+def test_plant_state_tracks_latest_values(mock_agent):
+    """Status, sensor and error messages update the versioned plant state."""
+    mock_agent._on_status_message("peer", "sender", "bus", "status/topic", {"timestamp": "2025-01-01T00:00:00+00:00"}, "on")
+    mock_agent._on_sensor_message("peer", "sender", "bus", "sensor/topic", {}, 20.5)
+    mock_agent._on_sensor_message("peer", "sender", "bus", "sensor/topic", {}, 21.0)
+
+    state = mock_agent.get_plant_state()
+    assert state["version"] == 3
+    assert state["topics"]["status/topic"] == {"plant_name": None, "type": "status", "value": "on", "timestamp": "2025-01-01T00:00:00+00:00"}
+    assert state["topics"]["sensor/topic"]["value"] == 21.0
+    assert state["active_errors"] == []
+
+    state = mock_agent.get_plant_state(topic_type_list_match=["sensor"])
+    assert set(state["topics"].keys()) == {"sensor/topic"}
+
+
+def test_commands_rejected_while_error_active(mock_agent):
+    """Commands fail validation while an error topic reports an error."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._build_command_plans()
+
+    mock_agent._on_error_message("peer", "sender", "bus", "error/topic", {}, True)
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 50)
+
+    assert mock_agent.get_plant_state()["active_errors"] == ["error/topic"]
+    assert mock_agent.vip.pubsub.publish.call_count == 1
+    call_args, call_kwargs = mock_agent.vip.pubsub.publish.call_args_list[0]
+    assert call_kwargs["topic"] == "feedback/topic1"
+    assert "active errors" in call_kwargs["message"]
+
+    # error cleared, commands pass again
+    mock_agent._on_error_message("peer", "sender", "bus", "error/topic", {}, "false")
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 50)
+    assert mock_agent.vip.pubsub.publish.call_count == 3
+
+
+def test_errors_only_block_commands_of_their_plant(mock_agent):
+    """An error of one plant does not block commands to another plant."""
+    mock_agent._unvalidated_to_validated_topic_map = {"a/command": "a/validated", "b/command": "b/validated"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"a/command": "a/feedback", "b/command": "b/feedback"}
+    mock_agent._unvalidated_topic_to_validator_map = {"a/command": lambda value: value, "b/command": lambda value: value}
+    mock_agent._topic_to_plant_map = {"a/command": "PlantA", "b/command": "PlantB", "a/error": "PlantA"}
+    mock_agent._plant_names = ["PlantA", "PlantB"]
+    mock_agent._build_command_plans()
+
+    mock_agent._on_error_message("peer", "sender", "bus", "a/error", {}, 1)
+    mock_agent._on_command_message("peer", "sender", "bus", "a/command", {}, 50)
+    mock_agent._on_command_message("peer", "sender", "bus", "b/command", {}, 50)
+
+    published_topics = [call_kwargs["topic"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list]
+    assert published_topics == ["a/feedback", "b/validated", "b/feedback"]
+    assert mock_agent.get_plant_state(plant_name_list_match=["PlantB"])["active_errors"] == []
+    assert mock_agent.get_plant_state(plant_name_list_match=["PlantA"])["active_errors"] == ["a/error"]
+
+
+def test_correlation_id_carried_to_validated_and_feedback(mock_agent):
+    """The correlation id of the command header is set on the validated command and the feedback."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._build_command_plans()
+
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {"correlation_id": "abc"}, 50)
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 60)
+
+    headers = [call_kwargs["headers"] for _, call_kwargs in mock_agent.vip.pubsub.publish.call_args_list]
+    assert headers[0]["correlation_id"] == "abc"
+    assert headers[1]["correlation_id"] == "abc"
+    # a correlation id is generated if the command has none
+    assert headers[2]["correlation_id"]
+    assert headers[2]["correlation_id"] == headers[3]["correlation_id"] != "abc"
+
+
+def test_command_echo_records_latency(mock_agent):
+    """The echo of a validated command on the echo topic records the command latency."""
+    mock_agent._unvalidated_to_validated_topic_map = {"topic1": "validated/topic1"}
+    mock_agent._unvalidated_to_feedback_topic_map = {"topic1": "feedback/topic1"}
+    mock_agent._unvalidated_to_echo_topic_map = {"topic1": "status/topic1"}
+    mock_agent._unvalidated_topic_to_validator_map = {"topic1": lambda value: value}
+    mock_agent._build_command_plans()
+
+    mock_agent._on_command_message("peer", "sender", "bus", "topic1", {}, 50)
+    # unrelated value is no echo
+    mock_agent._on_status_message("peer", "sender", "bus", "status/topic1", {}, 40)
+    assert mock_agent.get_command_latency_stats() == {}
+
+    mock_agent._on_status_message("peer", "sender", "bus", "status/topic1", {}, 50)
+    stats = mock_agent.get_command_latency_stats()
+    assert stats["topic1"]["count"] == 1
+    assert sum(stats["topic1"]["buckets"].values()) == 1
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram()
+    for seconds in (0.01, 0.3, 0.3, 120.0):
+        histogram.record(seconds)
+    result = histogram.to_dict()
+    assert result["count"] == 4
+    assert result["min"] == 0.01
+    assert result["max"] == 120.0
+    assert result["buckets"]["0.05"] == 1
+    assert result["buckets"]["0.5"] == 2
+    assert result["buckets"]["inf"] == 1
+
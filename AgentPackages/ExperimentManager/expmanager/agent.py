@@ -7,17 +7,21 @@ __docformat__ = 'reStructuredText'
 import logging
 import sys
 import gevent
-from datetime import datetime, timezone
+import heapq
+import time
+import json
+import base64
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta, timezone
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
 from metadata.metadata_mixin import MetadataMixin
-from persistence import pydantic_io
+from persistence.journal_io import ModelJournal
 
 from pydantic import BaseModel, Field, model_validator, ValidationError, field_validator
-from typing import List, Dict, Optional
-from copy import deepcopy
+from typing import List, Dict, Optional, Tuple, Set, Any, Callable
 
-from transitions import Machine, MachineError
+from transitions import MachineError
 
 class ExperimentDataModel(BaseModel):
     experiment_id: str
@@ -37,6 +41,11 @@ class ExperimentDataModel(BaseModel):
     agents: Optional[List[str]] = None
     topics: Optional[List[str]] = None
 
+    # per agent results reported by the scheduler, keyed by phase ("start", "stop") and agent identity
+    agent_results: Optional[Dict[str, Dict[str, Dict]]] = None
+    # planned versus actual start and stop timing reported by the scheduler, keyed by phase
+    timing: Optional[Dict[str, Dict]] = None
+
     # TODO: other validation like not empty plant string for non simulative runs, etc
     
     # Validate individual fields: ensure timezone-aware allowed datetime.fromisoformat('2011-11-04 00:05:23.283+00:00')
@@ -68,7 +77,13 @@ class ExperimentDataModel(BaseModel):
 
 class ExperimentState(object):
     # statemachine for each experiment: look up exp lifecycle state diagramm
+    # The transitions are compiled once into a table shared by all experiments, see _compile_experiment_state.
+    # Every experiment only holds its ID and the current state, triggers and "is_<state>" checks are class methods.
+    __slots__ = ("experiment_id", "state", "kitten_rescued")
+
     states = ['submited', 'authorised', 'finalized', 'running', 'finished', 'canceled', 'failed']
+    # states without outgoing transitions
+    final_states = ['finished', 'canceled', 'failed']
 
     transitions = [
         # transitions from submited state
@@ -89,18 +104,226 @@ class ExperimentState(object):
         { 'trigger': 'fail', 'source': 'running', 'dest': 'failed'},
     ]
 
+    # trigger -> {source state: destination state}, filled by _compile_experiment_state
+    transition_table: Dict[str, Dict[str, str]] = {}
+
     def __init__(self, experiment_id: str, initial_state: str="submited"):
         # Check for non existing states
         if initial_state not in ExperimentState.states:
             raise MachineError(f"Invalid initial state: {initial_state}")
-        # Initialize the state machine
+        # Initialize the state machine with the canonical state name
         self.experiment_id = experiment_id
-        self.machine = Machine(model=self, states=ExperimentState.states, transitions=ExperimentState.transitions, initial=initial_state)
+        self.state = ExperimentState.states[ExperimentState.states.index(initial_state)]
+
+    def trigger(self, trigger_name: str) -> bool:
+        """
+        Apply a transition to the current state.
+
+        Params:
+            trigger_name: name of the transition e.g. "authorise"
+        Returns:
+            True on success
+        Raises:
+            AttributeError: If the trigger does not exist
+            MachineError: If the trigger is not allowed from the current state
+        """
+        destinations = ExperimentState.transition_table.get(trigger_name)
+        if destinations is None:
+            raise AttributeError(f"Unknown trigger: {trigger_name}")
+        destination = destinations.get(self.state)
+        if destination is None:
+            raise MachineError(f"Can't trigger event {trigger_name} from state {self.state}!")
+        self.state = destination
+        return True
 
     # easter egg
     def update_journal(self):
         """ Dear Diary, today I saved Mr. Whiskers. Again. """
         self.kitten_rescued = True
+
+
+def _compile_experiment_state():
+    """
+    Compile ExperimentState.transitions into the shared transition table and
+    add a method per trigger and an "is_<state>" check per state to the class
+    """
+    def make_trigger(trigger_name):
+        def trigger(self):
+            return self.trigger(trigger_name)
+        trigger.__name__ = trigger_name
+        return trigger
+
+    def make_check(state_name):
+        def check(self):
+            return self.state == state_name
+        check.__name__ = f"is_{state_name}"
+        return check
+
+    for transition in ExperimentState.transitions:
+        ExperimentState.transition_table.setdefault(transition['trigger'], {})[transition['source']] = transition['dest']
+    for trigger_name in ExperimentState.transition_table:
+        setattr(ExperimentState, trigger_name, make_trigger(trigger_name))
+    for state_name in ExperimentState.states:
+        setattr(ExperimentState, f"is_{state_name}", make_check(state_name))
+
+_compile_experiment_state()
+
+
+class PlantReservationIndex(object):
+    """
+    Per plant index of the time windows reserved by active experiments.
+
+    Reservations of every plant are kept sorted by start time together with the running maximum
+    of their stop times. Both are monotonic, so an overlap check is two binary searches
+    instead of a scan over all experiments. Windows are closed intervals: experiments that
+    touch at the same instant overlap.
+    """
+    # experiments in these states do not reserve their plants anymore
+    inactive_states = ['finished', 'canceled', 'failed']
+
+    def __init__(self):
+        # plant -> sorted list of (start, stop, experiment_id)
+        self._reservations: Dict[str, List[Tuple[datetime, datetime, str]]] = {}
+        # plant -> list of (max stop, experiment_id) over the reservations up to the same position
+        self._max_stops: Dict[str, List[Tuple[datetime, str]]] = {}
+        # experiment_id -> (start, stop, plants) to remove reservations without parsing again
+        self._experiments: Dict[str, Tuple[datetime, datetime, List[str]]] = {}
+
+    def __len__(self):
+        return len(self._experiments)
+
+    def __contains__(self, experiment_id: str):
+        return experiment_id in self._experiments
+
+    def clear(self):
+        self._reservations = {}
+        self._max_stops = {}
+        self._experiments = {}
+
+    def update(self, experiment: ExperimentDataModel):
+        """
+        Add, refresh or drop the reservation of an experiment depending on its state.
+
+        Params:
+            experiment: experiment data model with current state
+        """
+        self.remove(experiment.experiment_id)
+        if experiment.state in PlantReservationIndex.inactive_states:
+            return
+
+        start = datetime.fromisoformat(experiment.start_time)
+        stop = datetime.fromisoformat(experiment.stop_time)
+        plants = list(dict.fromkeys(experiment.plants))
+        self._experiments[experiment.experiment_id] = (start, stop, plants)
+        for plant in plants:
+            reservation = (start, stop, experiment.experiment_id)
+            reservations = self._reservations.setdefault(plant, [])
+            index = bisect_left(reservations, reservation)
+            reservations.insert(index, reservation)
+            # placeholder, recomputed by _update_max_stops
+            self._max_stops.setdefault(plant, []).insert(index, None)
+            self._update_max_stops(plant, index)
+
+    def remove(self, experiment_id: str):
+        """
+        Drop the reservation of an experiment if it has one.
+
+        Params:
+            experiment_id: ID of the experiment
+        """
+        entry = self._experiments.pop(experiment_id, None)
+        if entry is None:
+            return
+
+        start, stop, plants = entry
+        for plant in plants:
+            reservations = self._reservations[plant]
+            index = bisect_left(reservations, (start, stop, experiment_id))
+            reservations.pop(index)
+            self._max_stops[plant].pop(index)
+            if reservations:
+                self._update_max_stops(plant, index)
+            else:
+                del self._reservations[plant]
+                del self._max_stops[plant]
+
+    def find_overlap(self, plants: List[str], start: datetime, stop: datetime, exclude_id: Optional[str] = None) -> Optional[str]:
+        """
+        Find an active experiment reserving any of the plants within the time window.
+
+        Params:
+            plants: list of plant names
+            start: timezone aware start of the window
+            stop: timezone aware stop of the window
+            exclude_id: experiment ID to ignore, e.g. the experiment itself
+        Returns:
+            ID of an overlapping experiment or None if the plants are free
+        """
+        for plant in plants:
+            reservations = self._reservations.get(plant)
+            if not reservations:
+                continue
+
+            # reservations starting no later than the window stops
+            end = bisect_right(reservations, (stop, datetime.max.replace(tzinfo=timezone.utc), chr(0x10FFFF)))
+            if end == 0 or self._max_stops[plant][end - 1][0] < start:
+                continue
+
+            # walk back over the candidates, usually the first one overlaps
+            for index in range(end - 1, -1, -1):
+                res_start, res_stop, res_id = reservations[index]
+                if res_stop >= start and res_id != exclude_id:
+                    return res_id
+                if self._max_stops[plant][index][0] < start:
+                    break
+        return None
+
+    def find_next_free_slot(self, plants: List[str], duration: timedelta, not_before: datetime) -> Tuple[datetime, datetime]:
+        """
+        Find the earliest window of the given length that is free for all plants.
+
+        Params:
+            plants: list of plant names
+            duration: length of the window
+            not_before: timezone aware earliest start of the window
+        Returns:
+            Tuple of start and stop of the free window
+        """
+        streams = []
+        for plant in plants:
+            reservations = self._reservations.get(plant)
+            if not reservations:
+                continue
+            # skip reservations that end before the window may start, the running maximum is sorted
+            first = bisect_left(self._max_stops[plant], (not_before,))
+            streams.append(reservations[first:])
+
+        candidate = not_before
+        for res_start, res_stop, _ in heapq.merge(*streams):
+            if candidate + duration < res_start:
+                break
+            if res_stop >= candidate:
+                # touching windows overlap, start one second after the reservation ends
+                candidate = res_stop + timedelta(seconds=1)
+
+        return candidate, candidate + duration
+
+    def _update_max_stops(self, plant: str, index: int):
+        """
+        Recompute the running maximum of the stop times from the position of an inserted or removed reservation on.
+        Every entry only depends on the one before, so the walk stops at the first entry that is unchanged,
+        usually right after the position.
+        """
+        reservations = self._reservations[plant]
+        max_stops = self._max_stops[plant]
+        current = max_stops[index - 1] if index > 0 else None
+        for position in range(index, len(reservations)):
+            res_start, res_stop, res_id = reservations[position]
+            if current is None or res_stop > current[0]:
+                current = (res_stop, res_id)
+            if max_stops[position] == current:
+                return
+            max_stops[position] = current
     
 _log = logging.getLogger(__name__)
 utils.setup_logging()
@@ -111,6 +334,31 @@ DEFAULT_AGENT_MANAGER_IDENTITY = "agentmanageragent-0.1_1"
 DEFAULT_SCHEDULER_IDENTITY = "scheduleragent-0.1_1"
 DEFAULT_LOGGER_IDENTITY = "loggeragent-0.1_1"
 DEFAULT_TOPIC_REGISTRY_IDENTITY = "topicregistryagent-0.1_1" 
+DEFAULT_JOURNAL_COMPACT_THRESHOLD = 200
+DEFAULT_LIFECYCLE_TOPIC_PREFIX = "experiments/lifecycle"
+# RPC helpers time out after 2 seconds each, concurrent calls are joined with a small margin on top
+RPC_JOIN_TIMEOUT = 2.5
+QUERY_SORT_FIELDS = ["start_time", "stop_time", "experiment_id", "experimenter", "state"]
+QUERY_TIME_SORT_FIELDS = ["start_time", "stop_time"]
+QUERY_INDEX_FIELDS = ["state", "plants", "experimenter"]
+QUERY_DEFAULT_LIMIT = 50
+QUERY_MAX_LIMIT = 500
+
+
+def _parse_aware_datetime(value: str) -> datetime:
+    """
+    Parse a timezone aware ISO 8601 string.
+
+    Raises:
+        ValueError: If the string is not ISO 8601 or has no timezone information
+    """
+    try:
+        dt = datetime.fromisoformat(value)
+    except Exception as e:
+        raise ValueError(f"Invalid datetime format. Use ISO 8601: {e}")
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        raise ValueError("Datetime must include timezone information.")
+    return dt
 
 def expmanager(config_path, **kwargs):
     """
@@ -146,9 +394,28 @@ class Expmanager(Agent, MetadataMixin):
         self._scheduler = config.get("scheduler_identity", DEFAULT_SCHEDULER_IDENTITY) 
         self._logger = config.get("logger_identity", DEFAULT_LOGGER_IDENTITY) 
         self._topic_registry = config.get("topic_registry_identity", DEFAULT_TOPIC_REGISTRY_IDENTITY) 
+        self._journal_compact_threshold = config.get("journal_compact_threshold", DEFAULT_JOURNAL_COMPACT_THRESHOLD)
+        self._lifecycle_topic_prefix = config.get("lifecycle_topic_prefix", DEFAULT_LIFECYCLE_TOPIC_PREFIX)
+
+        # Lifecycle events are numbered in order of publishing. The sequence restarts with the agent,
+        # the epoch (start time of this instance) tells consumers the numbering has been restarted
+        self._event_epoch: str = datetime.now(timezone.utc).isoformat()
+        self._event_seq: int = 0
 
-        self._experiments_data_list: List[ExperimentDataModel] = [] # list of the experiment
+        self._experiments_data_dict: Dict[str, ExperimentDataModel] = {} # dict of the experiments data keyed by experiment id
+        self._experiments_journal = ModelJournal(self._experiments_data_filepath, ExperimentDataModel, "experiment_id", self._journal_compact_threshold)
         self._experiments_sm_dict: Dict[str, ExperimentState] = {} # dict of state machines for experiment keyed by experiment id
+        self._reservation_index = PlantReservationIndex() # time windows of the plants reserved by active experiments
+
+        # Serialized experiments served by the read RPCs, invalidated on every change.
+        # The experiment models are never modified in place, changes replace them in the dict
+        self._experiment_dumps: Dict[str, Dict] = {} # cached model dumps keyed by experiment id
+        self._experiment_dumps_list: Optional[List[Dict]] = None # cached dumps of all experiments in insertion order
+        self._experiment_windows: Dict[str, Tuple[datetime, datetime]] = {} # cached parsed start and stop keyed by experiment id
+        # Query indexes, built on the first query and then updated per changed experiment
+        self._query_entries: Optional[Dict[str, Tuple[Dict[str, Tuple], Dict[str, List[str]]]]] = None # indexed sort keys and filter values keyed by experiment id
+        self._sorted_keys: Dict[str, List[Tuple]] = {} # sorted (sort value, experiment id) keyed by sort field
+        self._filter_index: Dict[str, Dict[str, Set[str]]] = {} # experiment ids keyed by filter field and value
         
         self.vip.config.set_default("config", config)
         self.vip.config.subscribe(self._configure, actions=["NEW", "UPDATE"], pattern="config")
@@ -163,9 +430,12 @@ class Expmanager(Agent, MetadataMixin):
         self._scheduler = contents.get("scheduler_identity", self._scheduler) 
         self._logger = contents.get("logger_identity", self._logger) 
         self._topic_registry = contents.get("topic_registry_identity", self._topic_registry) 
+        self._journal_compact_threshold = contents.get("journal_compact_threshold", self._journal_compact_threshold)
+        self._lifecycle_topic_prefix = contents.get("lifecycle_topic_prefix", self._lifecycle_topic_prefix)
 
         self._load_experiments_data()
         self._reinitialise_state_machines()
+        self._build_reservation_index()
 
 # ------------------ RPC exposed Functions ------------------
 
@@ -190,7 +460,7 @@ class Expmanager(Agent, MetadataMixin):
             raise ValueError(f"Could not submit the experiment. Experiment data validation failed: {e}")
 
         # check for duplicates
-        if self._find_experiment_index_by_id(experiment.experiment_id) is not None:
+        if experiment.experiment_id in self._experiments_data_dict:
             _log.warning(f"Could not submit the experiment. An experiment with ID: {experiment.experiment_id} already exists.")
             raise ValueError(f"Experiment with this ID already exists: {experiment.experiment_id}")
 
@@ -268,43 +538,53 @@ class Expmanager(Agent, MetadataMixin):
             # Do not raise exception hence you dont always want to log, probably
             _log.warning(f"No topics to log are provided for experiment \"{experiment_id}\". Topics should be in a list.")
  
-        experiment_index = self._find_experiment_index_by_id(experiment_id)
-        if experiment_index is None:
+        experiment: ExperimentDataModel = self._experiments_data_dict.get(experiment_id)
+        if experiment is None:
             _log.warning(f"Could not finalize the experiment \"{experiment_id}\". Experiment ID not found.")
             raise ValueError("Experiment ID not found.")
-    
-        # find the experiment
-        experiment: ExperimentDataModel = self._experiments_data_list[experiment_index]
         
         # append the plant specific topics to log (right now not needed hence you can simply write what topics you want to log)
         #plant_topics = self._get_plant_topics(experiment.plants)
         #extended_topics_to_log = topics_to_log + plant_topics
 
-        # check whether logged topics contain command messages and append the feedback topics to the list of topics to log
-        feedback_topics = self._get_feedback_topics(topics_to_log)
-        # Add only missing topics
-        extended_topics_to_log = topics_to_log + [t for t in feedback_topics if t not in topics_to_log]
-
-        # verify all needed agents are isntalled on the platform 
-        if not self._agents_are_installed(agents_for_experiment):
+        # Independent lookups run concurrently:
+        # check whether logged topics contain command messages to log their feedback topics as well
+        # and verify all needed agents are isntalled on the platform
+        results = self._call_concurrently({
+            "feedback_topics": lambda: self._get_feedback_topics(topics_to_log),
+            "agents_installed": lambda: self._agents_are_installed(agents_for_experiment)
+        })
+
+        succeeded, agents_installed = results["agents_installed"]
+        if not succeeded:
+            raise agents_installed
+        if not agents_installed:
             _log.warning(f"Could not finalize the experiment \"{experiment_id}\". Not all agents are installed.")
             raise RuntimeError("Not all agents are installed.")
 
-        # Notify external systems
-        try:
-            # try logging topics, if it fails: the experiment will be discarded immediately
-            self._start_logging_topics(experiment_id, extended_topics_to_log)
-            # try sending data to scheduler, if it fails: stop logging topics and the discard the experiment
-            try:
-                self._submit_experiment_to_scheduler(experiment_id, agents_for_experiment, experiment.start_time, experiment.stop_time)
-            except Exception as e:
-                self._stop_logging_topics(experiment_id)
-                raise
-        except Exception as e:
-            _log.warning(f"Could not finalize the experiment \"{experiment_id}\". RPC Call failed with: {e}")
+        # Add only missing topics, on failure the feedback topics are not logged
+        succeeded, feedback_topics = results["feedback_topics"]
+        feedback_topics = feedback_topics if succeeded else []
+        extended_topics_to_log = topics_to_log + [t for t in feedback_topics if t not in topics_to_log]
+
+        # Notify external systems concurrently, if any of them fails the other one is rolled back and the experiment is discarded
+        results = self._call_concurrently({
+            "logging": lambda: self._start_logging_topics(experiment_id, extended_topics_to_log),
+            "scheduler": lambda: self._submit_experiment_to_scheduler(experiment_id, agents_for_experiment, experiment.start_time, experiment.stop_time)
+        })
+        failures = [result for succeeded, result in results.values() if not succeeded]
+        if failures:
+            _log.warning(f"Could not finalize the experiment \"{experiment_id}\". RPC Call failed with: {failures}")
+            # a timed out call may have reached the other agent before it was killed, so it is rolled back as well
+            may_have_succeeded = {name: succeeded or isinstance(result, TimeoutError) for name, (succeeded, result) in results.items()}
+            self._compensate_finalize(experiment_id, agents_for_experiment, logging_started=may_have_succeeded["logging"], scheduled=may_have_succeeded["scheduler"])
             raise RuntimeError("RPC Call failed")
-        
-        self._update_experiment(experiment_id, "finalize", topics=extended_topics_to_log, agents=agents_for_experiment)
+
+        try:
+            self._update_experiment(experiment_id, "finalize", topics=extended_topics_to_log, agents=agents_for_experiment)
+        except Exception:
+            self._compensate_finalize(experiment_id, agents_for_experiment, logging_started=True, scheduled=True)
+            raise
 
         _log.info(f"An Experiment \"{experiment_id}\" was finalized and is ready to start.")
         return True
@@ -327,13 +607,11 @@ class Expmanager(Agent, MetadataMixin):
             _log.warning(f"Could not cancel the experiment, ID not provided.")
             raise ValueError("ID not provided.")
         
-        experiment_index = self._find_experiment_index_by_id(experiment_id)
-        if experiment_index is None:
+        # get experiment data
+        experiment: ExperimentDataModel = self._experiments_data_dict.get(experiment_id)
+        if experiment is None:
             _log.warning(f"Could not cancel the experiment with ID: {experiment_id}. Experiment ID not found.")
             raise ValueError("Experiment ID not found.")
-        
-        # get experiment data
-        experiment: ExperimentDataModel = self._experiments_data_list[experiment_index]
 
         # TODO: if state finalized or running it needs custom cancelation
         # stop logging topics
@@ -363,11 +641,10 @@ class Expmanager(Agent, MetadataMixin):
             raise ValueError("ID not provided.")
         
         # get state
-        experiment_index = self._find_experiment_index_by_id(experiment_id)
-        if experiment_index is None:
+        experiment: ExperimentDataModel = self._experiments_data_dict.get(experiment_id)
+        if experiment is None:
             _log.warning(f"Experiment ID \"{experiment_id}\" not found.")
             raise ValueError("Experiment ID not found.")
-        experiment: ExperimentDataModel = self._experiments_data_list[experiment_index]
         state = experiment.state
 
         if state not in ["canceled", "finished", "failed"]:
@@ -389,8 +666,7 @@ class Expmanager(Agent, MetadataMixin):
             List of experiment IDs as strings
         """
 
-        exp_dict = deepcopy(self._experiments_data_list)
-        return [exp.experiment_id for exp in exp_dict]
+        return list(self._experiments_data_dict)
     
 
     @RPC.export
@@ -399,10 +675,11 @@ class Expmanager(Agent, MetadataMixin):
         Retrieve metadata and state for all experiments.
 
         Returns:
-            List of dictionaries containing experiment data
+            List of dictionaries containing experiment data, shared with the cache and not to be modified
         """
-        exp_dict = deepcopy(self._experiments_data_list)
-        return [exp.model_dump() for exp in exp_dict]
+        if self._experiment_dumps_list is None:
+            self._experiment_dumps_list = [self._get_experiment_dump(experiment_id) for experiment_id in self._experiments_data_dict]
+        return self._experiment_dumps_list
     
 
     @RPC.export
@@ -413,17 +690,181 @@ class Expmanager(Agent, MetadataMixin):
         Params:
             experiment_id: String ID of the experiment
         Returns:
-            Dictionary containing experiment data or empty dict if experiment does not exist
+            Dictionary containing experiment data or empty dict if experiment does not exist,
+            shared with the cache and not to be modified
+        """
+
+        if experiment_id not in self._experiments_data_dict:
+            return {}
+
+        return self._get_experiment_dump(experiment_id)
+
+
+    @RPC.export
+    def query_experiments(self, states: Optional[List[str]] = None, plants: Optional[List[str]] = None, experimenter: Optional[str] = None,
+                          time_from: Optional[str] = None, time_to: Optional[str] = None, sort_by: str = "start_time", descending: bool = False,
+                          limit: int = QUERY_DEFAULT_LIMIT, cursor: Optional[str] = None, include_total: bool = True) -> Dict:
+        """
+        Retrieve one page of experiments matching the filters.
+        Pages are addressed by a cursor on the sort order, so following pages stay stable while experiments are added or removed.
+        States, plants and experimenter are served from indexes. A time window has to be checked per experiment,
+        so its total costs a pass over the experiments left by the other filters, or over all experiments without them.
+
+        Params:
+            states: Only experiments in one of these states
+            plants: Only experiments using at least one of these plants
+            experimenter: Only experiments of this experimenter
+            time_from: ISO 8601 timezone aware, only experiments stopping at or after this time
+            time_to: ISO 8601 timezone aware, only experiments starting at or before this time
+            sort_by: Field to sort by, one of QUERY_SORT_FIELDS. Ties are sorted by experiment ID
+            descending: Sort in descending order
+            limit: Maximum number of experiments on the page, 1 to QUERY_MAX_LIMIT
+            cursor: "next_cursor" of the previous page, None for the first page
+            include_total: Count the matching experiments, False skips the count and returns None as "total"
+        Returns:
+            Dictionary with "experiments" (list of experiment data), "total" (number of matching experiments)
+            and "next_cursor" (None on the last page)
+        Raises:
+            ValueError: If the parameters are invalid
+        """
+
+        if sort_by not in QUERY_SORT_FIELDS:
+            raise ValueError(f"Can not sort by \"{sort_by}\". Sortable fields: {QUERY_SORT_FIELDS}.")
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= QUERY_MAX_LIMIT:
+            raise ValueError(f"Limit has to be an integer from 1 to {QUERY_MAX_LIMIT}.")
+        for name, values in (("States", states), ("Plants", plants)):
+            if values is not None and (not isinstance(values, list) or not all(isinstance(v, str) for v in values)):
+                raise ValueError(f"{name} have to be a list of strings.")
+
+        window_from = _parse_aware_datetime(time_from) if time_from is not None else None
+        window_to = _parse_aware_datetime(time_to) if time_to is not None else None
+        cursor_key = self._decode_cursor(cursor, sort_by, descending) if cursor is not None else None
+
+        self._build_query_index()
+        # experiments passing the indexed filters, None if there are none
+        candidates: Optional[Set[str]] = None
+        for field, values in (("state", states), ("plants", plants), ("experimenter", [experimenter] if experimenter is not None else None)):
+            if values:
+                index = self._filter_index[field]
+                matching = set().union(*(index.get(value, ()) for value in values))
+                candidates = matching if candidates is None else candidates & matching
+
+        def in_window(experiment_id: str) -> bool:
+            if window_from is None and window_to is None:
+                return True
+            start, stop = self._get_experiment_window(experiment_id)
+            if window_from is not None and stop < window_from:
+                return False
+            if window_to is not None and start > window_to:
+                return False
+            return True
+
+        keys = self._sorted_keys[sort_by]
+        if candidates is not None and len(candidates) ** 2 < limit * len(keys):
+            # few candidates, sorting them is cheaper than walking the whole sort order past the others
+            keys = sorted(self._query_entries[experiment_id][0][sort_by] for experiment_id in candidates)
+            candidates = None
+        if cursor_key is None:
+            position = len(keys) if descending else 0
+        else:
+            position = bisect_left(keys, cursor_key) if descending else bisect_right(keys, cursor_key)
+
+        # walk the sort order from the cursor until the page is full
+        page_keys = []
+        has_more = False
+        indexes = range(position - 1, -1, -1) if descending else range(position, len(keys))
+        for index in indexes:
+            experiment_id = keys[index][1]
+            if (candidates is None or experiment_id in candidates) and in_window(experiment_id):
+                if len(page_keys) == limit:
+                    has_more = True
+                    break
+                page_keys.append(keys[index])
+
+        total = None
+        if include_total:
+            if window_from is None and window_to is None:
+                total = len(candidates) if candidates is not None else len(keys)
+            else:
+                counted = candidates if candidates is not None else (key[1] for key in keys)
+                total = sum(1 for experiment_id in counted if in_window(experiment_id))
+        next_cursor = self._encode_cursor(page_keys[-1], sort_by, descending) if has_more else None
+
+        return {
+            "experiments": [self._get_experiment_dump(key[1]) for key in page_keys],
+            "total": total,
+            "next_cursor": next_cursor
+        }
+
+
+    @RPC.export
+    def find_next_free_slot(self, plants: List[str], duration_seconds: float, not_before: Optional[str] = None) -> Dict[str, str]:
+        """
+        Find the earliest time window of the given length in which all listed plants are free.
+
+        Params:
+            plants: List of plant names the window is needed for
+            duration_seconds: Length of the window in seconds
+            not_before: ISO 8601 timezone aware earliest start of the window, defaults to now
+        Returns:
+            Dictionary with ISO 8601 "start_time" and "stop_time" of the free window
+        Raises:
+            ValueError: If the parameters are invalid
         """
 
-        exp_dict = deepcopy(self._experiments_data_list)
-        for exp in exp_dict:
-            if exp.experiment_id == experiment_id:
-                return exp.model_dump()
+        if not plants or not isinstance(plants, list) or not all(isinstance(p, str) for p in plants):
+            _log.warning(f"Could not search a free slot. Plants have to be a non empty list of strings.")
+            raise ValueError("Plants have to be a non empty list of strings.")
+
+        if isinstance(duration_seconds, bool) or not isinstance(duration_seconds, (int, float)) or duration_seconds <= 0:
+            _log.warning(f"Could not search a free slot. Duration has to be a positive number of seconds.")
+            raise ValueError("Duration has to be a positive number of seconds.")
 
-        return {}
+        earliest = datetime.now(timezone.utc) if not_before is None else _parse_aware_datetime(not_before)
+
+        start, stop = self._reservation_index.find_next_free_slot(plants, timedelta(seconds=duration_seconds), earliest)
+        return {"start_time": start.isoformat(), "stop_time": stop.isoformat()}
         
 
+    @RPC.export
+    def register_series_run(self, experiment_data: Dict[str, Any]) -> bool:
+        """
+        WARNING: This method is allowed to be invoked only by scheduler agent.
+        Register a run of an experiment series, which the scheduler plans on its own, as finalized experiment.
+        The run reserves its plants like any other experiment, so the scheduler can report its progress.
+
+        Params:
+            experiment_data: Dictionary with the experiment data of the run, "agents" listing the agents of the run
+        Returns:
+            True on success, False if the plants are not available in the time window of the run
+        Raises:
+            ValueError: If the data is invalid or the experiment ID already exists
+        """
+
+        try:
+            experiment = ExperimentDataModel(**experiment_data)
+        except ValidationError as e:
+            _log.warning(f"Series run validation failed: {e}")
+            raise ValueError(f"Could not register the series run. Experiment data validation failed: {e}")
+
+        if not experiment.agents:
+            _log.warning(f"Could not register the series run \"{experiment.experiment_id}\". No agents are listed.")
+            raise ValueError("No agents are listed.")
+
+        if experiment.experiment_id in self._experiments_data_dict:
+            _log.warning(f"Could not register the series run. An experiment with ID: {experiment.experiment_id} already exists.")
+            raise ValueError(f"Experiment with this ID already exists: {experiment.experiment_id}")
+
+        if not self._plants_are_available(experiment_id=experiment.experiment_id, plants=experiment.plants, start_time=experiment.start_time, stop_time=experiment.stop_time):
+            _log.info(f"Series run \"{experiment.experiment_id}\" not registered, some plants are not available for its time slot.")
+            return False
+
+        self._init_experiment(experiment, initial_state="finalized")
+
+        _log.info(f"Series run \"{experiment.experiment_id}\" was registered and is ready to start.")
+        return True
+
+
     @RPC.export
     def experiment_is_running(self, experiment_id: str) -> bool:
         """
@@ -508,46 +949,150 @@ class Expmanager(Agent, MetadataMixin):
         # TODO: notify user the experiment failed
         return True
 
+    @RPC.export
+    def record_agent_results(self, experiment_id: str, phase: str, results: Dict[str, Dict]) -> bool:
+        """
+        WARNING: This method is allowed to be invoked only by scheduler agent.
+        Store the per agent results of starting or stopping the agents of an experiment.
+
+        Params:
+            experiment_id: String ID of the experiment
+            phase: "start" or "stop"
+            results: Dictionary keyed by agent identity with the result of the start or stop call
+        Returns:
+            True on success
+        Raises:
+            ValueError: If the experiment does not exist or the results are invalid
+        """
+
+        if phase not in ["start", "stop"]:
+            raise ValueError("Phase has to be \"start\" or \"stop\".")
+        if not isinstance(results, dict) or not all(isinstance(result, dict) for result in results.values()):
+            raise ValueError("Results have to be a dictionary keyed by agent identity with a dictionary per agent.")
+
+        experiment = self._experiments_data_dict.get(experiment_id)
+        if experiment is None:
+            _log.warning(f"Could not record agent results for experiment \"{experiment_id}\". Experiment ID not found.")
+            raise ValueError("Experiment ID not found.")
+
+        agent_results = dict(experiment.agent_results or {})
+        agent_results[phase] = results
+        self._set_experiment_fields(experiment_id, agent_results=agent_results)
+
+        failed_agents = [agent for agent, result in results.items() if not result.get("success")]
+        if failed_agents:
+            _log.warning(f"Agents {failed_agents} failed to {phase} for experiment \"{experiment_id}\".")
+        return True
+
+    @RPC.export
+    def record_experiment_timing(self, experiment_id: str, timing: Dict[str, Dict]) -> bool:
+        """
+        WARNING: This method is allowed to be invoked only by scheduler agent.
+        Store the planned versus actual start and stop timing of an experiment.
+
+        Params:
+            experiment_id: String ID of the experiment
+            timing: Dictionary keyed by phase ("start", "release", "stop"), replaces the previous record
+        Returns:
+            True on success
+        Raises:
+            ValueError: If the experiment does not exist or the timing is invalid
+        """
+
+        if not isinstance(timing, dict):
+            raise ValueError("Timing has to be a dictionary keyed by phase.")
+        if experiment_id not in self._experiments_data_dict:
+            _log.warning(f"Could not record timing for experiment \"{experiment_id}\". Experiment ID not found.")
+            raise ValueError("Experiment ID not found.")
+
+        self._set_experiment_fields(experiment_id, timing=timing)
+        return True
+
 # ------------------ Helper Functions ------------------
 
 # ------ data persitence ------
 
     def _reinitialise_state_machines(self):
         """
-        Recreate state machines for each experiment based on state from persisted data 
+        Recreate state machines for each experiment based on state from persisted data.
+        Experiments in a final state get their state machine on demand, see _get_state_machine.
         """
-        for experiment in self._experiments_data_list:
-            try:
-                machine = ExperimentState(experiment.experiment_id, experiment.state)
-                self._experiments_sm_dict[experiment.experiment_id] = machine
-            except MachineError as e:
-                # TODO: currently: on fail initiate state machine as failed. maybe implement other fail safe
-                _log.warning(f"Could not reinstate experiment with id \"{experiment.experiment_id}\" to state \"{experiment.state}\", reason: {e}. The experiment will be initiated as failed.")
-                machine = ExperimentState(experiment.experiment_id, "failed")
-                self._experiments_sm_dict[experiment.experiment_id] = machine
+        for experiment in self._experiments_data_dict.values():
+            if experiment.state not in ExperimentState.final_states:
+                self._experiments_sm_dict[experiment.experiment_id] = self._reinstate_state_machine(experiment)
+
+    def _reinstate_state_machine(self, experiment: ExperimentDataModel) -> ExperimentState:
+        """
+        Create the state machine of an experiment in the state from its data
+        """
+        try:
+            return ExperimentState(experiment.experiment_id, experiment.state)
+        except MachineError as e:
+            # TODO: currently: on fail initiate state machine as failed. maybe implement other fail safe
+            _log.warning(f"Could not reinstate experiment with id \"{experiment.experiment_id}\" to state \"{experiment.state}\", reason: {e}. The experiment will be initiated as failed.")
+            return ExperimentState(experiment.experiment_id, "failed")
+
+    def _get_state_machine(self, experiment_id: str) -> ExperimentState:
+        """
+        State machine of an existing experiment, created from its data if it is not in memory yet
+        """
+        machine = self._experiments_sm_dict.get(experiment_id)
+        if machine is None:
+            machine = self._reinstate_state_machine(self._experiments_data_dict[experiment_id])
+            self._experiments_sm_dict[experiment_id] = machine
+        return machine
 
     def _load_experiments_data(self):
         """
-        Load persisted data from file
+        Load persisted data from file: the snapshot with the journaled changes replayed on top.
+        A non empty journal is compacted into the snapshot right away.
         """
 
-        experiments_copy = self._experiments_data_list.copy()
+        self._experiments_journal = ModelJournal(self._experiments_data_filepath, ExperimentDataModel, "experiment_id", self._journal_compact_threshold)
         try:
-            self._experiments_data_list = pydantic_io.load_model_list(self._experiments_data_filepath, ExperimentDataModel)
+            self._experiments_data_dict = self._experiments_journal.load()
         except Exception as e:
             _log.error(f"Failed to load experiments data file: {e}.")
-            self._experiments_data_list = experiments_copy
+            return
+        self._invalidate_read_cache()
+
+        if self._experiments_journal.journal_entries > 0:
+            self._save_experiments_data()
 
 
     def _save_experiments_data(self):
         """
-        Persist the temporaly cashed data to the file
+        Persist the complete temporaly cashed data to the file and clear the journal
         """
 
         try:
-            pydantic_io.save_model_list(self._experiments_data_filepath, self._experiments_data_list)
+            self._experiments_journal.compact(self._experiments_data_dict)
         except Exception as e:
             _log.error(f"Failed to save experiments to the file: {e}. The experiments data will not be persisted.")
+
+
+    def _persist_experiment(self, experiment_id: str) -> None:
+        """
+        Append the change of a single experiment to the journal instead of rewriting the whole file.
+        The journal is compacted into the file once it grows past the configured threshold.
+
+        Params:
+            experiment_id: ID of the changed experiment, removed experiments are journaled as deletion
+        """
+
+        try:
+            experiment = self._experiments_data_dict.get(experiment_id)
+            if experiment is None:
+                self._experiments_journal.delete(experiment_id)
+            else:
+                self._experiments_journal.put(experiment)
+        except Exception as e:
+            _log.error(f"Failed to journal experiment \"{experiment_id}\": {e}. Saving the complete experiments data instead.")
+            self._save_experiments_data()
+            return
+
+        if self._experiments_journal.needs_compaction():
+            self._save_experiments_data()
     
 
     def _full_data_deletion(self):
@@ -555,28 +1100,176 @@ class Expmanager(Agent, MetadataMixin):
         WARNING: do not use except in testing
         """
         self._experiments_sm_dict = {}
-        self._experiments_data_list = []
+        self._experiments_data_dict = {}
+        self._reservation_index.clear()
+        self._invalidate_read_cache()
         self._save_experiments_data()
     
+    def _get_experiment_dump(self, experiment_id: str) -> Dict:
+        """
+        Serialized experiment data from the cache, serialized on first access after a change
+
+        Params:
+            experiment_id: ID of an existing experiment
+        Returns:
+            Dictionary with the experiment data
+        """
+        dump = self._experiment_dumps.get(experiment_id)
+        if dump is None:
+            dump = self._experiments_data_dict[experiment_id].model_dump()
+            self._experiment_dumps[experiment_id] = dump
+        return dump
+
+
+    def _invalidate_read_cache(self, experiment_id: Optional[str] = None):
+        """
+        Drop the serialized experiments after a change and update the query indexes
+
+        Params:
+            experiment_id: ID of the changed experiment, None drops the cache and indexes of all experiments
+        """
+        if experiment_id is None:
+            self._experiment_dumps = {}
+            self._experiment_windows = {}
+            self._query_entries = None
+            self._sorted_keys = {}
+            self._filter_index = {}
+        else:
+            self._experiment_dumps.pop(experiment_id, None)
+            self._experiment_windows.pop(experiment_id, None)
+            self._reindex_query_experiment(experiment_id)
+        self._experiment_dumps_list = None
+
+
+    def _get_experiment_window(self, experiment_id: str) -> Tuple[datetime, datetime]:
+        """
+        Parsed start and stop time of an existing experiment from the cache
+        """
+        window = self._experiment_windows.get(experiment_id)
+        if window is None:
+            exp = self._experiments_data_dict[experiment_id]
+            window = (datetime.fromisoformat(exp.start_time), datetime.fromisoformat(exp.stop_time))
+            self._experiment_windows[experiment_id] = window
+        return window
+
+
+    def _get_query_entry(self, experiment_id: str) -> Tuple[Dict[str, Tuple], Dict[str, List[str]]]:
+        """
+        Sort keys keyed by sort field and filter values keyed by filter field of an existing experiment
+        """
+        exp = self._experiments_data_dict[experiment_id]
+        start, stop = self._get_experiment_window(experiment_id)
+        sort_keys = {"start_time": (start, experiment_id), "stop_time": (stop, experiment_id)}
+        for field in QUERY_SORT_FIELDS:
+            if field not in QUERY_TIME_SORT_FIELDS:
+                sort_keys[field] = (getattr(exp, field) or "", experiment_id)
+        filter_values = {"state": [exp.state], "plants": list(set(exp.plants)), "experimenter": [exp.experimenter]}
+        return sort_keys, filter_values
+
+
+    def _build_query_index(self):
+        """
+        Build the sort orders and filter indexes of all experiments, if they are not built yet
+        """
+        if self._query_entries is not None:
+            return
+        self._query_entries = {experiment_id: self._get_query_entry(experiment_id) for experiment_id in self._experiments_data_dict}
+        self._sorted_keys = {field: sorted(sort_keys[field] for sort_keys, _ in self._query_entries.values()) for field in QUERY_SORT_FIELDS}
+        self._filter_index = {field: {} for field in QUERY_INDEX_FIELDS}
+        for experiment_id, (_, filter_values) in self._query_entries.items():
+            for field, values in filter_values.items():
+                for value in values:
+                    self._filter_index[field].setdefault(value, set()).add(experiment_id)
+
+
+    def _reindex_query_experiment(self, experiment_id: str):
+        """
+        Replace the entries of a changed, added or removed experiment in the built query indexes
+        """
+        if self._query_entries is None:
+            return
+        old_entry = self._query_entries.pop(experiment_id, None)
+        if old_entry is not None:
+            sort_keys, filter_values = old_entry
+            for field, key in sort_keys.items():
+                keys = self._sorted_keys[field]
+                del keys[bisect_left(keys, key)]
+            for field, values in filter_values.items():
+                for value in values:
+                    ids = self._filter_index[field][value]
+                    ids.discard(experiment_id)
+                    if not ids:
+                        del self._filter_index[field][value]
+        if experiment_id in self._experiments_data_dict:
+            sort_keys, filter_values = self._query_entries[experiment_id] = self._get_query_entry(experiment_id)
+            for field, key in sort_keys.items():
+                insort(self._sorted_keys[field], key)
+            for field, values in filter_values.items():
+                for value in values:
+                    self._filter_index[field].setdefault(value, set()).add(experiment_id)
+
+
+    def _encode_cursor(self, key: Tuple, sort_by: str, descending: bool) -> str:
+        """
+        Opaque cursor pointing after the given sort key
+        """
+        value = key[0].isoformat() if sort_by in QUERY_TIME_SORT_FIELDS else key[0]
+        raw = json.dumps([sort_by, descending, value, key[1]])
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+    def _decode_cursor(self, cursor: str, sort_by: str, descending: bool) -> Tuple:
+        """
+        Sort key of a cursor created by _encode_cursor
+
+        Raises:
+            ValueError: If the cursor is invalid or belongs to another sort order
+        """
+        try:
+            cursor_sort_by, cursor_descending, value, experiment_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            if sort_by in QUERY_TIME_SORT_FIELDS:
+                value = _parse_aware_datetime(value)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        if cursor_sort_by != sort_by or cursor_descending != descending:
+            raise ValueError("Cursor belongs to another sort order.")
+        return (value, experiment_id)
+
+
+    def _build_reservation_index(self):
+        """
+        Rebuild the plant reservation index from the experiments data
+        """
+        self._reservation_index.clear()
+        for experiment in self._experiments_data_dict.values():
+            try:
+                self._reservation_index.update(experiment)
+            except Exception as e:
+                _log.warning(f"Could not index the reservation of experiment \"{experiment.experiment_id}\": {e}")
+
 # ------ experiment managment ------
 
-    def _init_experiment(self, experiment_data: ExperimentDataModel):
+    def _init_experiment(self, experiment_data: ExperimentDataModel, initial_state: str = "submited"):
         """
         Initiate the experiment with submited data and create the state machine for the experiment.
         Persist the newly created experiment 
 
         Params:
             experiment_data: pydantic model with submited data for the experiment to initiate
+            initial_state: state the experiment starts in, "finalized" for runs of a series
         """
 
         # Create state machine for the experiment
-        state_machine = ExperimentState(experiment_data.experiment_id)
+        state_machine = ExperimentState(experiment_data.experiment_id, initial_state)
         self._experiments_sm_dict[experiment_data.experiment_id] = state_machine
         
         # Store experiment data internaly and persist it
         experiment_data.state = state_machine.state
-        self._experiments_data_list.append(experiment_data)
-        self._save_experiments_data()
+        self._experiments_data_dict[experiment_data.experiment_id] = experiment_data
+        self._reservation_index.update(experiment_data)
+        self._invalidate_read_cache(experiment_data.experiment_id)
+        self._persist_experiment(experiment_data.experiment_id)
+        self._publish_lifecycle_event(experiment_data, previous_state=None)
     
 
     def _update_experiment(self, experiment_id: str, sm_trigger: str, **extra_fields) -> None:
@@ -593,16 +1286,14 @@ class Expmanager(Agent, MetadataMixin):
         """
 
         # Find experiment by ID
-        experiment_index = self._find_experiment_index_by_id(experiment_id)
-        if experiment_index is None:
+        experiment: ExperimentDataModel = self._experiments_data_dict.get(experiment_id)
+        if experiment is None:
             _log.error(f"Experiment ID \"{experiment_id}\" not found.")
             raise ValueError("Experiment ID not found.")
-        
-        experiment: ExperimentDataModel = self._experiments_data_list[experiment_index]
 
         # Update state machine
         try:
-            state_machine = self._experiments_sm_dict[experiment.experiment_id]
+            state_machine = self._get_state_machine(experiment.experiment_id)
             # dynamically call state machine trigger
             getattr(state_machine, sm_trigger)()  
         except Exception as e:
@@ -617,8 +1308,26 @@ class Expmanager(Agent, MetadataMixin):
             setattr(updated_experiment, field, value)
 
         # Store and persist
-        self._experiments_data_list[experiment_index] = updated_experiment
-        self._save_experiments_data()
+        self._experiments_data_dict[experiment_id] = updated_experiment
+        self._reservation_index.update(updated_experiment)
+        self._invalidate_read_cache(experiment_id)
+        self._persist_experiment(experiment_id)
+        self._publish_lifecycle_event(updated_experiment, previous_state=experiment.state)
+
+
+    def _set_experiment_fields(self, experiment_id: str, **fields) -> None:
+        """
+        Update data fields of an experiment without a state transition, then persist changes.
+
+        Params:
+            experiment_id: ID of an existing experiment.
+            fields: ExperimentDataModel fields to override.
+        """
+
+        updated_experiment: ExperimentDataModel = self._experiments_data_dict[experiment_id].model_copy(update=fields)
+        self._experiments_data_dict[experiment_id] = updated_experiment
+        self._invalidate_read_cache(experiment_id)
+        self._persist_experiment(experiment_id)
 
 
     def _delete_experiment(self, experiment_id: str) -> ExperimentDataModel:
@@ -633,41 +1342,55 @@ class Expmanager(Agent, MetadataMixin):
             ID of removed experiment
         """
 
-        index = self._find_experiment_index_by_id(experiment_id)
-        if index is None:
+        if experiment_id not in self._experiments_data_dict:
             _log.warning(f"Could not delete experiment with ID \"{experiment_id}\". ID not found.")
             raise ValueError("ID not found.")
 
         # remove state machine
-        del self._experiments_sm_dict[experiment_id]
+        self._experiments_sm_dict.pop(experiment_id, None)
 
         # remove experiment data entry and persist the change
-        removed_experiment = self._experiments_data_list.pop(index)
-        self._save_experiments_data()
+        removed_experiment = self._experiments_data_dict.pop(experiment_id)
+        self._reservation_index.remove(experiment_id)
+        self._invalidate_read_cache(experiment_id)
+        self._persist_experiment(experiment_id)
+        self._publish_lifecycle_event(removed_experiment, previous_state=removed_experiment.state, event="removed")
 
         return removed_experiment
 
 
-    def _find_experiment_index_by_id(self, experiment_id: str) -> int:
+    def _publish_lifecycle_event(self, experiment: ExperimentDataModel, previous_state: Optional[str], event: Optional[str] = None):
         """
-        Find the experiments index in the internal list by the ID
-        
+        Publish a lifecycle event of an experiment on "<lifecycle_topic_prefix>/<experiment_id>".
+        Failing to publish is only logged, the change itself is already persisted.
+
         Params:
-            experiment_id: ID of the experiment.
-        Returns:
-            Int index of the experiment in the list if it exists
-            None if the experiment could not be find
+            experiment: experiment data after the change
+            previous_state: state before the change, None for newly submited experiments
+            event: name of the event, defaults to the new state of the experiment
         """
-
-        for id, exp in enumerate(self._experiments_data_list):
-            if exp.experiment_id == experiment_id:
-                return id
-        return None
+        self._event_seq += 1
+        timestamp = datetime.now(timezone.utc).isoformat()
+        message = {
+            "epoch": self._event_epoch,
+            "seq": self._event_seq,
+            "event": event or experiment.state,
+            "experiment_id": experiment.experiment_id,
+            "state": experiment.state,
+            "previous_state": previous_state,
+            "timestamp": timestamp
+        }
+        header = {"source": self.core.identity, "timestamp": timestamp, "epoch": self._event_epoch, "seq": self._event_seq}
+        try:
+            self.vip.pubsub.publish(peer="pubsub", topic=f"{self._lifecycle_topic_prefix}/{experiment.experiment_id}", headers=header, message=message)
+        except Exception as e:
+            _log.error(f"Failed to publish lifecycle event {self._event_seq} of experiment \"{experiment.experiment_id}\": {e}")
     
 
     def _plants_are_available(self, experiment_id: str, plants: List[str], start_time: str, stop_time: str):
         """
         Check if plants are available for scheduling in the given time window.
+        Only active experiments reserve plants, see PlantReservationIndex.
 
         Params:
             experiment_id: String ID of the experiment
@@ -679,24 +1402,68 @@ class Expmanager(Agent, MetadataMixin):
         Raises:
             Exception: On failure to check availability
         """
-        plants_are_available = True
 
-        for exp in self._experiments_data_list:
-            # check any plants overlap in experiments
-            if any(p in exp.plants for p in plants):            
-                if datetime.fromisoformat(start_time) <= datetime.fromisoformat(exp.stop_time) and datetime.fromisoformat(exp.start_time) <= datetime.fromisoformat(stop_time):
-                    # check if overlap is in finished, canceled or failed experiments
-                    if exp.state in ['finished', 'canceled', 'failed']:
-                        continue
-                    else:
-                        _log.warning(f"Overlaping time window with another experiment using same plants: \"{exp.experiment_id}\" from {exp.start_time} to {exp.stop_time}")
-                        plants_are_available = False
-                        break
+        overlap_id = self._reservation_index.find_overlap(plants, datetime.fromisoformat(start_time), datetime.fromisoformat(stop_time), exclude_id=experiment_id)
+        if overlap_id is not None:
+            exp = self._experiments_data_dict.get(overlap_id)
+            _log.warning(f"Overlaping time window with another experiment using same plants: \"{overlap_id}\" from {exp.start_time} to {exp.stop_time}")
+            return False
 
-        return plants_are_available
+        return True
 
 # ------ external calls ------
 
+    def _call_concurrently(self, calls: Dict[str, Callable[[], Any]], timeout: float = RPC_JOIN_TIMEOUT) -> Dict[str, Tuple[bool, Any]]:
+        """
+        Run independent calls as greenlets and join them with one common deadline,
+        so the total latency is that of the slowest call instead of the sum of all calls.
+
+        Params:
+            calls: Dictionary of names to callables without arguments
+            timeout: Seconds until all calls have to be finished
+        Returns:
+            Dictionary of names to (True, result) or (False, exception) tuples,
+            calls still running at the deadline are killed and return a TimeoutError
+        """
+        greenlets = {name: self.core.spawn(call) for name, call in calls.items()}
+        deadline = time.monotonic() + timeout
+
+        results: Dict[str, Tuple[bool, Any]] = {}
+        for name, greenlet in greenlets.items():
+            try:
+                results[name] = (True, greenlet.get(timeout=max(0, deadline - time.monotonic())))
+            except gevent.Timeout as to:
+                _log.error(f"Call {name} timedout: {to}.")
+                # do not leave the call running behind the deadline, its late result would be ignored
+                if hasattr(greenlet, "kill"):
+                    greenlet.kill(block=False)
+                results[name] = (False, TimeoutError(f"{name} timed out"))
+            except Exception as e:
+                results[name] = (False, e)
+        return results
+
+
+    def _compensate_finalize(self, experiment_id: str, agents: List[str], logging_started: bool, scheduled: bool):
+        """
+        Roll back the external notifications of a failed finalisation, failures are only logged.
+
+        Params:
+            experiment_id: String ID of the experiment
+            agents: List of agent identifiers submited to the scheduler
+            logging_started: The logger started logging topics for the experiment
+            scheduled: The experiment was submited to the scheduler
+        """
+        rollbacks = {}
+        if logging_started:
+            rollbacks["stop_logging"] = lambda: self._stop_logging_topics(experiment_id)
+        if scheduled:
+            rollbacks["remove_schedule"] = lambda: self._remove_experiment_from_scheduler(experiment_id, agents)
+
+        for name, (succeeded, result) in self._call_concurrently(rollbacks).items():
+            if not succeeded:
+                _log.error(f"Could not roll back {name} for experiment \"{experiment_id}\": {result}")
+
+
     def _agents_are_installed(self, agents: List[str]) -> bool:
         """
         Verify that all required agents are installed on the platform.
@@ -33,8 +33,9 @@ def temp_experiments_file():
         f.write("[]")  # <-- ensures valid JSON structure from the start
 
     yield path
-    if os.path.exists(path):
-        os.remove(path)
+    for leftover in (path, path + ".journal"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
 
 
 @pytest.fixture
@@ -1,7 +1,8 @@
 import pytest
 import json
 import os 
-from expmanager.agent import ExperimentState, ExperimentDataModel, Expmanager
+import time
+from expmanager.agent import ExperimentState, ExperimentDataModel, Expmanager, PlantReservationIndex
 from pydantic import BaseModel, ValidationError
 from datetime import datetime
 from transitions import MachineError
@@ -17,7 +18,7 @@ class TestPersistence:
             json.dump("[]", f)
 
         agent = Expmanager({"experiments_data_path": temp_experiments_file})
-        assert agent._experiments_data_list == []
+        assert agent._experiments_data_dict == {}
         agent._full_data_deletion()
 
     def test_corrupted_json_file(self, temp_experiments_file):
@@ -28,7 +29,7 @@ class TestPersistence:
             json.dump("{ invalid json ]", f)
 
         agent = Expmanager({"experiments_data_path": temp_experiments_file})
-        assert agent._experiments_data_list == []
+        assert agent._experiments_data_dict == {}
         agent._full_data_deletion()
 
 
@@ -42,7 +43,7 @@ class TestPersistence:
         agent = Expmanager({"experiments_data_path": temp_experiments_file})
         
         # Add one experiment to internal list
-        agent._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        agent._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         
         # Save to file
         agent._save_experiments_data()
@@ -76,10 +77,10 @@ class TestPersistence:
         agent._load_experiments_data()
         
         # Check agent state
-        assert len(agent._experiments_data_list) == 1
-        exp = agent._experiments_data_list[0]
+        assert len(agent._experiments_data_dict) == 1
+        exp = agent._experiments_data_dict[experiment_data_correct["experiment_id"]]
         assert isinstance(exp, ExperimentDataModel)
-        assert agent._experiments_data_list[0].experiment_id == experiment_data_correct["experiment_id"]
+        assert exp.experiment_id == experiment_data_correct["experiment_id"]
 
         agent._full_data_deletion()
         
@@ -98,24 +99,59 @@ class TestPersistence:
         experiment_id = exp_manager.submit_experiment_data(experiment_data_correct)
         assert experiment_id == experiment_data_correct["experiment_id"]
         
-        # Read file directly
+        # The submit is appended to the journal, the snapshot file is not rewritten
         with open(temp_experiments_file, "r") as f:
-            content = json.load(f)
-
-        # Check file content is correct and complete
-        assert isinstance(content, list)
-        assert len(content) == 1
+            assert json.load(f) == []
+        with open(temp_experiments_file + ".journal", "r") as f:
+            records = [json.loads(line) for line in f]
+
+        # Check journal content is correct and complete
+        assert len(records) == 1
+        assert records[0]["op"] == "put"
+        assert records[0]["key"] == experiment_id
         for key in experiment_data_correct.keys():
-            assert key in content[0]
-            assert content[0][key] == experiment_data_correct[key]
+            assert key in records[0]["value"]
+            assert records[0]["value"][key] == experiment_data_correct[key]
 
-        # Reload from file
+        # Reload from file, the journal is compacted into the snapshot
         new_manager: Expmanager = Expmanager({"experiments_data_path": temp_experiments_file})
         new_manager._configure("config", "NEW", {})
         assert new_manager != None
+        assert not os.path.exists(temp_experiments_file + ".journal")
+        with open(temp_experiments_file, "r") as f:
+            content = json.load(f)
+        assert len(content) == 1
+        assert content[0]["experiment_id"] == experiment_id
+
+        assert len(new_manager._experiments_data_dict) == 1
+        assert new_manager._experiments_data_dict[experiment_id].experiment_id == experiment_id
+
+        new_manager._full_data_deletion()
+
+
+    def test_journal_compaction_threshold(self, experiment_data_correct: dict, temp_experiments_file):
+        """
+        Ensure the journal is folded into the snapshot once it reaches the configured threshold
+        """
+        exp_manager: Expmanager = Expmanager({"experiments_data_path": temp_experiments_file, "journal_compact_threshold": 3})
+        exp_manager._configure("config", "NEW", {})
+
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        exp_manager.authorise_experiment(exp_id, "Dr. Test")
+        assert os.path.exists(temp_experiments_file + ".journal")
 
-        assert len(new_manager._experiments_data_list) == 1
-        assert new_manager._experiments_data_list[0].experiment_id == experiment_id
+        # third change reaches the threshold
+        exp_manager.cancel_experiment(exp_id)
+        assert not os.path.exists(temp_experiments_file + ".journal")
+        with open(temp_experiments_file, "r") as f:
+            content = json.load(f)
+        assert content[0]["state"] == "canceled"
+
+        # removal is journaled as well
+        exp_manager.remove_experiment(exp_id)
+        new_manager: Expmanager = Expmanager({"experiments_data_path": temp_experiments_file})
+        new_manager._configure("config", "NEW", {})
+        assert new_manager._experiments_data_dict == {}
 
         new_manager._full_data_deletion()
 
@@ -140,8 +176,8 @@ class TestPersistence:
         agent._configure("config", "NEW", {})
 
         # Assert that the experiment was loaded
-        assert len(agent._experiments_data_list) == 1
-        assert agent._experiments_data_list[0].experiment_id == experiment_data_correct["experiment_id"]
+        assert len(agent._experiments_data_dict) == 1
+        assert experiment_data_correct["experiment_id"] in agent._experiments_data_dict
 
         # Save again to check _save_experiments works
         agent._save_experiments_data()
@@ -173,8 +209,8 @@ class TestPersistence:
         # Recreate agent to verify loading
         new_agent = Expmanager({})
         new_agent._configure("config", "NEW", {})
-        assert len(new_agent._experiments_data_list) == 1
-        assert new_agent._experiments_data_list[0].experiment_id == experiment_data_correct["experiment_id"]
+        assert len(new_agent._experiments_data_dict) == 1
+        assert experiment_data_correct["experiment_id"] in new_agent._experiments_data_dict
 
         agent._full_data_deletion()
         new_agent._full_data_deletion()
@@ -188,18 +224,18 @@ class TestHelpers:
         Verify the clean up function. it should remove all the data from internal list
         and save the empty list to persistant file
         """
-        assert exp_manager._experiments_data_list == []
+        assert exp_manager._experiments_data_dict == {}
         exp_manager.submit_experiment_data(experiment_data_correct)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         exp_manager._full_data_deletion()
-        assert exp_manager._experiments_data_list == [] 
+        assert exp_manager._experiments_data_dict == {} 
 
 
     def test_get_list_all_experiments_data(self, exp_manager: Expmanager, experiment_data_correct: dict):
         experiment_data_correct_1 = experiment_data_correct.copy()
         experiment_data_correct_1.update({"experiment_id": "1"})
         
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
         experiment_id = exp_manager.submit_experiment_data(experiment_data_correct_1)
         experiment_list = exp_manager.get_list_all_experiments_data()
@@ -224,7 +260,7 @@ class TestHelpers:
 
 
     def test_get_list_experiment_ids(self, exp_manager: Expmanager, experiment_data_correct: dict):
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         experiment_data_correct_1 = experiment_data_correct.copy()
         experiment_data_correct_2 = experiment_data_correct.copy()
         experiment_data_correct_1.update({"experiment_id": "1"})
@@ -242,7 +278,7 @@ class TestHelpers:
 
 
     def test_get_experiment_data(self, exp_manager: Expmanager, experiment_data_correct: dict):
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         experiment_data_correct_1 = experiment_data_correct.copy()
         experiment_data_correct_2 = experiment_data_correct.copy()
         experiment_data_correct_1.update({"experiment_id": "1"})
@@ -261,6 +297,58 @@ class TestHelpers:
         assert experiment_data == {}
 
 
+    def test_lifecycle_events(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        """
+        Every state change is published with an increasing sequence number
+        """
+        exp_manager.vip.pubsub.publish.reset_mock()
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        exp_manager.authorise_experiment(exp_id, "Dr. Test")
+        exp_manager.cancel_experiment(exp_id)
+        exp_manager.remove_experiment(exp_id)
+
+        calls = exp_manager.vip.pubsub.publish.call_args_list
+        messages = [c.kwargs["message"] for c in calls]
+        assert [m["event"] for m in messages] == ["submited", "authorised", "canceled", "removed"]
+        assert [m["previous_state"] for m in messages] == [None, "submited", "authorised", "canceled"]
+        seqs = [m["seq"] for m in messages]
+        assert seqs == sorted(seqs) and len(set(seqs)) == 4
+        assert all(m["epoch"] == exp_manager._event_epoch for m in messages)
+        assert all(c.kwargs["topic"] == f"experiments/lifecycle/{exp_id}" for c in calls)
+        assert calls[0].kwargs["headers"]["seq"] == seqs[0]
+
+        # failed transitions are not published
+        with pytest.raises(ValueError):
+            exp_manager.experiment_is_running(exp_id)
+        assert len(exp_manager.vip.pubsub.publish.call_args_list) == 4
+
+
+    def test_read_cache_invalidation(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        """
+        Reads are served from the cached serialized data until the experiment changes
+        """
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        experiment_data = exp_manager.get_dict_experiment_data(exp_id)
+        experiment_list = exp_manager.get_list_all_experiments_data()
+        assert experiment_data["state"] == "submited"
+        # repeated reads return the cached data without serializing again
+        assert exp_manager.get_dict_experiment_data(exp_id) is experiment_data
+        assert exp_manager.get_list_all_experiments_data() is experiment_list
+        assert experiment_list[0] is experiment_data
+
+        exp_manager.authorise_experiment(exp_id, "Dr. Test")
+        assert exp_manager.get_dict_experiment_data(exp_id)["state"] == "authorised"
+        assert exp_manager.get_list_all_experiments_data()[0]["authorised_name"] == "Dr. Test"
+        # the data read before the change is left untouched
+        assert experiment_data["state"] == "submited"
+
+        exp_manager.cancel_experiment(exp_id)
+        exp_manager.remove_experiment(exp_id)
+        assert exp_manager.get_dict_experiment_data(exp_id) == {}
+        assert exp_manager.get_list_all_experiments_data() == []
+        assert exp_manager.get_list_experiment_ids() == []
+
+
     def test_plants_are_available(self, exp_manager: Expmanager):
         # Load the test data into agent
         experiment_list = [
@@ -280,7 +368,8 @@ class TestHelpers:
             stop_time="2025-11-02T15:00:00+00:00",
             plants=["solar_1"],
         )]
-        exp_manager._experiments_data_list = experiment_list
+        exp_manager._experiments_data_dict = {exp.experiment_id: exp for exp in experiment_list}
+        exp_manager._build_reservation_index()
 
         # Requesting a plant that's not in use
         assert exp_manager._plants_are_available("exp3", ["heatpump_B"], "2025-11-02T10:00:00+00:00", "2025-11-02T12:00:00+00:00")
@@ -297,6 +386,244 @@ class TestHelpers:
         # The new experiment is fully inside exp1's window
         assert not exp_manager._plants_are_available("exp3", ["heatpump_A"], "2025-11-02T10:30:00+00:00", "2025-11-02T11:30:00+00:00")
 
+        # Touching windows overlap
+        assert not exp_manager._plants_are_available("exp3", ["heatpump_A"], "2025-11-02T12:00:00+00:00", "2025-11-02T12:30:00+00:00")
+
+        # Different timezone notation of the same instants
+        assert not exp_manager._plants_are_available("exp3", ["solar_1"], "2025-11-02T15:30:00+02:00", "2025-11-02T16:00:00+02:00")
+
+
+    def test_plants_are_available_follows_state(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        """
+        Only active experiments reserve their plants
+        """
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        start, stop = experiment_data_correct["start_time"], experiment_data_correct["stop_time"]
+        assert not exp_manager._plants_are_available("other", ["plant2"], start, stop)
+        # the experiment itself does not block its own window
+        assert exp_manager._plants_are_available(exp_id, ["plant2"], start, stop)
+
+        exp_manager.cancel_experiment(exp_id)
+        assert exp_manager._plants_are_available("other", ["plant2"], start, stop)
+
+        # the plants can be reserved again once the experiment is canceled
+        experiment_data_correct.update({"experiment_id": "other"})
+        exp_manager.submit_experiment_data(experiment_data_correct)
+        assert not exp_manager._plants_are_available("third", ["plant1"], start, stop)
+
+        exp_manager.remove_experiment(exp_id)
+        assert "other" in exp_manager._reservation_index
+        assert len(exp_manager._reservation_index) == 1
+
+
+    def test_reservation_index_running_maximum(self):
+        """
+        The incrementally updated running maximum matches a full recomputation after every change
+        """
+        import random
+        from datetime import timedelta, timezone
+        rng = random.Random(7)
+        index = PlantReservationIndex()
+        base = datetime(2025, 11, 2, tzinfo=timezone.utc)
+        active = []
+
+        def expected_max_stops():
+            expected, current = [], None
+            for res_start, res_stop, res_id in index._reservations.get("plant", []):
+                if current is None or res_stop > current[0]:
+                    current = (res_stop, res_id)
+                expected.append(current)
+            return expected
+
+        for step in range(300):
+            if active and rng.random() < 0.4:
+                index.remove(active.pop(rng.randrange(len(active))))
+            else:
+                start = base + timedelta(minutes=rng.randrange(1000))
+                experiment = ExperimentDataModel(experiment_id=f"exp{step}", experimenter="test", description="",
+                                                 start_time=start.isoformat(), stop_time=(start + timedelta(minutes=rng.randrange(1, 300))).isoformat(),
+                                                 plants=["plant"], state="submited")
+                index.update(experiment)
+                active.append(experiment.experiment_id)
+            assert index._max_stops.get("plant", []) == expected_max_stops()
+
+
+    def test_find_next_free_slot(self, exp_manager: Expmanager):
+        experiment_list = [
+        ExperimentDataModel(
+            experiment_id="exp1",
+            experimenter="alice",
+            description="Heatpump test",
+            start_time="2025-11-02T10:00:00+00:00",
+            stop_time="2025-11-02T12:00:00+00:00",
+            plants=["heatpump_A"],
+            state="authorised",
+        ),
+        ExperimentDataModel(
+            experiment_id="exp2",
+            experimenter="bob",
+            description="Long test",
+            start_time="2025-11-02T09:00:00+00:00",
+            stop_time="2025-11-02T13:00:00+00:00",
+            plants=["heatpump_A", "solar_1"],
+            state="submited",
+        ),
+        ExperimentDataModel(
+            experiment_id="exp3",
+            experimenter="bob",
+            description="Solar test",
+            start_time="2025-11-02T13:30:00+00:00",
+            stop_time="2025-11-02T15:00:00+00:00",
+            plants=["solar_1"],
+            state="finalized",
+        ),
+        ExperimentDataModel(
+            experiment_id="exp4",
+            experimenter="bob",
+            description="Finished test",
+            start_time="2025-11-02T15:00:00+00:00",
+            stop_time="2025-11-02T18:00:00+00:00",
+            plants=["solar_1"],
+            state="finished",
+        )]
+        exp_manager._experiments_data_dict = {exp.experiment_id: exp for exp in experiment_list}
+        exp_manager._build_reservation_index()
+
+        # the gap between exp2 and exp3 fits 20 minutes but not an hour
+        slot = exp_manager.find_next_free_slot(["heatpump_A", "solar_1"], 20 * 60, "2025-11-02T09:30:00+00:00")
+        assert slot == {"start_time": "2025-11-02T13:00:01+00:00", "stop_time": "2025-11-02T13:20:01+00:00"}
+        slot = exp_manager.find_next_free_slot(["heatpump_A", "solar_1"], 60 * 60, "2025-11-02T09:30:00+00:00")
+        assert slot["start_time"] == "2025-11-02T15:00:01+00:00"
+
+        # before any reservation and for unused plants
+        slot = exp_manager.find_next_free_slot(["heatpump_A"], 30 * 60, "2025-11-02T08:00:00+00:00")
+        assert slot["start_time"] == "2025-11-02T08:00:00+00:00"
+        slot = exp_manager.find_next_free_slot(["heatpump_B"], 30 * 60, "2025-11-02T11:00:00+00:00")
+        assert slot["start_time"] == "2025-11-02T11:00:00+00:00"
+
+        # the found slot passes the availability check
+        slot = exp_manager.find_next_free_slot(["heatpump_A", "solar_1"], 20 * 60, "2025-11-02T10:00:00+00:00")
+        assert exp_manager._plants_are_available("new", ["heatpump_A", "solar_1"], slot["start_time"], slot["stop_time"])
+
+        with pytest.raises(ValueError):
+            exp_manager.find_next_free_slot([], 60)
+        with pytest.raises(ValueError):
+            exp_manager.find_next_free_slot(["heatpump_A"], 0)
+        with pytest.raises(ValueError, match="Datetime must include timezone information"):
+            exp_manager.find_next_free_slot(["heatpump_A"], 60, "2025-11-02T10:00:00")
+
+
+#------------------- Querying of experiments --------------------
+class TestQuery:
+    @pytest.fixture
+    def filled_manager(self, exp_manager: Expmanager):
+        states = ["submited", "authorised", "finished", "canceled", "running"]
+        for i in range(10):
+            exp = ExperimentDataModel(
+                experiment_id=f"exp{i}",
+                experimenter="alice" if i % 2 == 0 else "bob",
+                description="Query test",
+                start_time=f"2025-11-{i + 1:02d}T10:00:00+00:00",
+                stop_time=f"2025-11-{i + 1:02d}T12:00:00+00:00",
+                plants=["heatpump_A"] if i < 5 else ["solar_1"],
+                state=states[i % 5],
+            )
+            exp_manager._experiments_data_dict[exp.experiment_id] = exp
+        return exp_manager
+
+    def test_query_pages_follow_cursor(self, filled_manager: Expmanager):
+        page = filled_manager.query_experiments(limit=4)
+        assert page["total"] == 10
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp0", "exp1", "exp2", "exp3"]
+
+        ids = [e["experiment_id"] for e in page["experiments"]]
+        while page["next_cursor"] is not None:
+            page = filled_manager.query_experiments(limit=4, cursor=page["next_cursor"])
+            ids += [e["experiment_id"] for e in page["experiments"]]
+        assert ids == [f"exp{i}" for i in range(10)]
+
+        # an exactly filled last page has no cursor
+        page = filled_manager.query_experiments(limit=10)
+        assert page["next_cursor"] is None
+
+    def test_query_descending_and_stable_cursor(self, filled_manager: Expmanager, experiment_data_correct: dict):
+        page = filled_manager.query_experiments(sort_by="start_time", descending=True, limit=3)
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp9", "exp8", "exp7"]
+
+        # experiments added in front of the cursor do not shift the next page
+        experiment_data_correct.update({"experiment_id": "late"})
+        filled_manager.submit_experiment_data(experiment_data_correct)
+        page = filled_manager.query_experiments(sort_by="start_time", descending=True, limit=3, cursor=page["next_cursor"])
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp6", "exp5", "exp4"]
+        assert page["total"] == 11
+
+    def test_query_filters(self, filled_manager: Expmanager):
+        page = filled_manager.query_experiments(states=["finished", "canceled"])
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp2", "exp3", "exp7", "exp8"]
+        assert page["total"] == 4
+
+        page = filled_manager.query_experiments(plants=["solar_1"], experimenter="alice", limit=1)
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp6"]
+        assert page["total"] == 2
+        page = filled_manager.query_experiments(plants=["solar_1"], experimenter="alice", limit=1, cursor=page["next_cursor"])
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp8"]
+        assert page["next_cursor"] is None
+
+        # time range selects experiments overlapping the range
+        page = filled_manager.query_experiments(time_from="2025-11-03T11:00:00+00:00", time_to="2025-11-05T10:00:00+00:00")
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp2", "exp3", "exp4"]
+
+        page = filled_manager.query_experiments(sort_by="experimenter", states=["running"])
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp4", "exp9"]
+
+    def test_query_indexes_follow_changes(self, filled_manager: Expmanager):
+        filled_manager.query_experiments()
+
+        filled_manager._set_experiment_fields("exp0", experimenter="carol", plants=["solar_1"])
+        del filled_manager._experiments_data_dict["exp6"]
+        filled_manager._invalidate_read_cache("exp6")
+        page = filled_manager.query_experiments(plants=["solar_1"], sort_by="experimenter")
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp8", "exp5", "exp7", "exp9", "exp0"]
+        assert page["total"] == 5
+        assert filled_manager.query_experiments(experimenter="alice")["total"] == 3
+        assert filled_manager.query_experiments(experimenter="carol")["total"] == 1
+
+        # the indexes match a rebuild from scratch
+        sorted_keys, filter_index = filled_manager._sorted_keys, filled_manager._filter_index
+        filled_manager._invalidate_read_cache()
+        filled_manager.query_experiments()
+        assert filled_manager._sorted_keys == sorted_keys
+        assert filled_manager._filter_index == filter_index
+
+    def test_query_indexed_filters_do_not_scan_all_experiments(self, filled_manager: Expmanager):
+        filled_manager.query_experiments()
+        # only the two running experiments are checked against the time window
+        with patch.object(filled_manager, "_get_experiment_window", wraps=filled_manager._get_experiment_window) as get_window:
+            page = filled_manager.query_experiments(states=["running"], time_to="2025-11-30T00:00:00+00:00", limit=1)
+        assert [e["experiment_id"] for e in page["experiments"]] == ["exp4"]
+        assert page["total"] == 2
+        assert {call.args[0] for call in get_window.call_args_list} == {"exp4", "exp9"}
+
+        page = filled_manager.query_experiments(states=["running"], limit=1, include_total=False)
+        assert page["total"] is None
+        assert page["next_cursor"] is not None
+
+    def test_query_invalid_params(self, filled_manager: Expmanager):
+        with pytest.raises(ValueError):
+            filled_manager.query_experiments(sort_by="description")
+        with pytest.raises(ValueError):
+            filled_manager.query_experiments(limit=0)
+        with pytest.raises(ValueError):
+            filled_manager.query_experiments(states="running")
+        with pytest.raises(ValueError, match="Datetime must include timezone information"):
+            filled_manager.query_experiments(time_from="2025-11-03T11:00:00")
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            filled_manager.query_experiments(cursor="not a cursor")
+
+        cursor = filled_manager.query_experiments(limit=1)["next_cursor"]
+        with pytest.raises(ValueError, match="another sort order"):
+            filled_manager.query_experiments(limit=1, cursor=cursor, descending=True)
+
 
 #------------------- Submiting of experiments data --------------------
 class TestSubmitExperiments:
@@ -304,11 +631,11 @@ class TestSubmitExperiments:
         """
         Verifies the adding an experiment with valid data works correctly
         """
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         experiment_id = exp_manager.submit_experiment_data(experiment_data_correct)
         assert experiment_id == experiment_data_correct["experiment_id"]
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_data_list[0].experiment_id == experiment_id
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._experiments_data_dict[experiment_id].experiment_id == experiment_id
 
 
     def test_submit_experiment_invalid_time(self, exp_manager: Expmanager, experiment_data_correct: dict):
@@ -368,67 +695,67 @@ class TestSubmitExperiments:
         """
         Verifies the adding of an experiment with a id already existing raises error
         """
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
         # Verify the experiment is submited
         experiment_id =  exp_manager.submit_experiment_data(experiment_data_correct)
         assert experiment_id == experiment_data_correct["experiment_id"]
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_data_list[0].experiment_id == experiment_id
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._experiments_data_dict[experiment_id].experiment_id == experiment_id
 
         # Verify there is only one Experiment in  the list
         with pytest.raises(ValueError):
             exp_manager.submit_experiment_data(experiment_data_correct)
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_data_list[0].experiment_id == experiment_id
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._experiments_data_dict[experiment_id].experiment_id == experiment_id
 
  
     def test_submit_experiment_invalid_time_format(self, exp_manager: Expmanager, experiment_data_correct: dict):
         """
         Validates the passed time string is in correct format
         """
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         experiment_data_correct_time = experiment_data_correct.copy()
         exp_manager.submit_experiment_data(experiment_data_correct_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
         # Not ISO Format
         experiment_data_incorrect_time = experiment_data_correct.copy()
         experiment_data_incorrect_time.update({"start_time": "bajajaba"}) 
         with pytest.raises(ValueError, match="Invalid datetime format. Use ISO 8601."):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
         # No timezone information
         experiment_data_incorrect_time.update({"start_time": datetime.now()}) 
         with pytest.raises(ValueError, match="Datetime must include timezone information"):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
         # Not time type
         experiment_data_incorrect_time.update({"start_time": []}) 
         with pytest.raises(ValueError, match="Must be a datetime or ISO 8601 string."):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
         # Not ISO Format
         experiment_data_incorrect_time = experiment_data_correct.copy()
         experiment_data_incorrect_time.update({"stop_time": "bajajaba"}) 
         with pytest.raises(ValueError, match="Invalid datetime format. Use ISO 8601."):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         
         # No timezone information
         experiment_data_incorrect_time.update({"stop_time": datetime.now()}) 
         with pytest.raises(ValueError, match="Datetime must include timezone information"):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
         # Not time type
         experiment_data_incorrect_time.update({"stop_time": []}) 
         with pytest.raises(ValueError, match="Must be a datetime or ISO 8601 string."):
             exp_manager.submit_experiment_data(experiment_data_incorrect_time)
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
 
 
 #------------------- Authorisation of experiments --------------------
@@ -441,16 +768,16 @@ class TestAuthorisation:
         state = "submited"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         # Then authorise
         result = exp_manager.authorise_experiment(experiment_id=exp_id, supervisor_name="Dr. Test")
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "authorised"
         assert exp.authorised_name == "Dr. Test"
 
@@ -487,10 +814,10 @@ class TestFinalising:
         state = "authorised"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         # Then finalize
@@ -504,7 +831,7 @@ class TestFinalising:
             topics = ["test_topic"]
             result = exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=agents, topics_to_log=topics)
             assert result is True
-            exp = exp_manager._experiments_data_list[0]
+            exp = exp_manager._experiments_data_dict[exp_id]
             assert exp.state is "finalized"
             assert exp.agents == agents
             for t in exp.topics: assert t in ["test_topic", "feedback_test", "plant_test"] 
@@ -516,10 +843,10 @@ class TestFinalising:
         state = "authorised"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         # Then finalize
@@ -531,11 +858,116 @@ class TestFinalising:
             topics = ["test_topic"]
             result = exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=agents, topics_to_log=topics)
             assert result is True
-            exp = exp_manager._experiments_data_list[0]
+            exp = exp_manager._experiments_data_dict[exp_id]
             assert exp.state is "finalized"
             assert exp.agents == agents
             assert exp.topics == topics
 
+    def testfinalize_experiment_compensation(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        exp_id = "test1"
+        experiment_data_correct.update({"experiment_id": exp_id})
+        experiment_data_correct.update({"state": "authorised"})
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
+        exp_manager._reinitialise_state_machines()
+
+        # scheduler fails: logging is stopped again
+        with patch("expmanager.agent.Expmanager._agents_are_installed", return_value=True), \
+            patch("expmanager.agent.Expmanager._get_feedback_topics", return_value=[]), \
+            patch("expmanager.agent.Expmanager._start_logging_topics", return_value=True), \
+            patch("expmanager.agent.Expmanager._submit_experiment_to_scheduler", side_effect=Exception("scheduler down")), \
+            patch("expmanager.agent.Expmanager._stop_logging_topics", return_value=True) as stop_logging, \
+            patch("expmanager.agent.Expmanager._remove_experiment_from_scheduler", return_value=True) as remove_schedule:
+            with pytest.raises(RuntimeError, match="RPC Call failed"):
+                exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=["test_agent"], topics_to_log=["test_topic"])
+            stop_logging.assert_called_once_with(exp_id)
+            remove_schedule.assert_not_called()
+
+        # logging fails: the schedule is removed again
+        with patch("expmanager.agent.Expmanager._agents_are_installed", return_value=True), \
+            patch("expmanager.agent.Expmanager._get_feedback_topics", return_value=[]), \
+            patch("expmanager.agent.Expmanager._start_logging_topics", side_effect=Exception("logger down")), \
+            patch("expmanager.agent.Expmanager._submit_experiment_to_scheduler", return_value=True), \
+            patch("expmanager.agent.Expmanager._stop_logging_topics", return_value=True) as stop_logging, \
+            patch("expmanager.agent.Expmanager._remove_experiment_from_scheduler", return_value=True) as remove_schedule:
+            with pytest.raises(RuntimeError, match="RPC Call failed"):
+                exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=["test_agent"], topics_to_log=["test_topic"])
+            stop_logging.assert_not_called()
+            remove_schedule.assert_called_once_with(exp_id, ["test_agent"])
+
+        # agents are missing: nothing is notified
+        with patch("expmanager.agent.Expmanager._agents_are_installed", return_value=False), \
+            patch("expmanager.agent.Expmanager._get_feedback_topics", return_value=[]), \
+            patch("expmanager.agent.Expmanager._start_logging_topics", return_value=True) as start_logging:
+            with pytest.raises(RuntimeError, match="Not all agents are installed"):
+                exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=["test_agent"], topics_to_log=["test_topic"])
+            start_logging.assert_not_called()
+
+        assert exp_manager._experiments_data_dict[exp_id].state == "authorised"
+
+
+    def testfinalize_experiment_runs_calls_concurrently(self, exp_manager: Expmanager, experiment_data_correct: dict, monkeypatch):
+        # use real greenlets instead of the synchronous spawn
+        import gevent
+        monkeypatch.setattr("volttron.platform.vip.agent.core.ZMQCore.spawn", lambda self, func, *args, **kwargs: gevent.spawn(func, *args, **kwargs))
+
+        exp_id = "test1"
+        experiment_data_correct.update({"experiment_id": exp_id})
+        experiment_data_correct.update({"state": "authorised"})
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
+        exp_manager._reinitialise_state_machines()
+
+        def slow(result):
+            def call(*args, **kwargs):
+                gevent.sleep(0.2)
+                return result
+            return call
+
+        with patch("expmanager.agent.Expmanager._agents_are_installed", side_effect=slow(True)), \
+            patch("expmanager.agent.Expmanager._get_feedback_topics", side_effect=slow(["feedback_test"])), \
+            patch("expmanager.agent.Expmanager._start_logging_topics", side_effect=slow(True)), \
+            patch("expmanager.agent.Expmanager._submit_experiment_to_scheduler", side_effect=slow(True)):
+            started = time.monotonic()
+            assert exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=["test_agent"], topics_to_log=["test_topic"])
+            # two concurrent rounds instead of four sequential calls
+            assert time.monotonic() - started < 0.6
+
+        assert exp_manager._experiments_data_dict[exp_id].topics == ["test_topic", "feedback_test"]
+
+    def testfinalize_experiment_kills_and_compensates_timed_out_calls(self, exp_manager: Expmanager, experiment_data_correct: dict, monkeypatch):
+        import gevent
+        monkeypatch.setattr("volttron.platform.vip.agent.core.ZMQCore.spawn", lambda self, func, *args, **kwargs: gevent.spawn(func, *args, **kwargs))
+
+        exp_id = "test1"
+        experiment_data_correct.update({"experiment_id": exp_id})
+        experiment_data_correct.update({"state": "authorised"})
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
+        exp_manager._reinitialise_state_machines()
+
+        finished = []
+        def hanging_scheduler(*args, **kwargs):
+            gevent.sleep(0.3)
+            finished.append("scheduler")
+            return True
+
+        call_concurrently = Expmanager._call_concurrently
+        monkeypatch.setattr(Expmanager, "_call_concurrently", lambda self, calls, timeout=0.1: call_concurrently(self, calls, timeout))
+
+        with patch("expmanager.agent.Expmanager._agents_are_installed", return_value=True), \
+            patch("expmanager.agent.Expmanager._get_feedback_topics", return_value=[]), \
+            patch("expmanager.agent.Expmanager._start_logging_topics", return_value=True), \
+            patch("expmanager.agent.Expmanager._submit_experiment_to_scheduler", side_effect=hanging_scheduler), \
+            patch("expmanager.agent.Expmanager._stop_logging_topics", return_value=True) as stop_logging, \
+            patch("expmanager.agent.Expmanager._remove_experiment_from_scheduler", return_value=True) as remove_schedule:
+            with pytest.raises(RuntimeError, match="RPC Call failed"):
+                exp_manager.finalize_experiment(experiment_id=exp_id, agents_for_experiment=["test_agent"], topics_to_log=["test_topic"])
+            # the timed out submission may have reached the scheduler, so it is rolled back like the logging
+            stop_logging.assert_called_once_with(exp_id)
+            remove_schedule.assert_called_once_with(exp_id, ["test_agent"])
+
+        gevent.sleep(0.4)
+        assert finished == []
+        assert exp_manager._experiments_data_dict[exp_id].state == "authorised"
+
 #------------------- Starting of Experiments --------------------
 class TestStarting:
     def testexperiment_is_running_success(self, exp_manager: Expmanager, experiment_data_correct: dict):
@@ -548,16 +980,16 @@ class TestStarting:
         state = "finalized"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         # Then run
         result = exp_manager.experiment_is_running(experiment_id=exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "running"
 
 
@@ -567,16 +999,64 @@ class TestStarting:
         state = "finished"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
 
         # Then run
         with pytest.raises(RuntimeError, match="Can't trigger event run from state finished"):
             exp_manager.experiment_is_running(experiment_id=exp_id)
         
+    def test_register_series_run(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        run_data = {**experiment_data_correct, "experiment_id": "campaign_run0", "agents": ["agent1"]}
+        assert exp_manager.register_series_run(run_data) is True
+        assert exp_manager.get_dict_experiment_data("campaign_run0")["state"] == "finalized"
+        assert "campaign_run0" in exp_manager._reservation_index
+
+        # the registered run reserves its plants and takes the regular lifecycle
+        assert exp_manager.register_series_run({**run_data, "experiment_id": "campaign_run1"}) is False
+        assert "campaign_run1" not in exp_manager._experiments_data_dict
+        assert exp_manager.experiment_is_running("campaign_run0")
+        assert exp_manager.record_agent_results("campaign_run0", "start", {"agent1": {"success": True}})
+        assert exp_manager.experiment_is_finished("campaign_run0")
+        assert "campaign_run0" not in exp_manager._reservation_index
+
+        with pytest.raises(ValueError, match="already exists"):
+            exp_manager.register_series_run(run_data)
+        with pytest.raises(ValueError, match="No agents"):
+            exp_manager.register_series_run({**run_data, "experiment_id": "campaign_run2", "agents": []})
+
+    def test_record_agent_results(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        start_results = {"agent1": {"success": True, "error": None, "elapsed": 0.01}}
+        stop_results = {"agent1": {"success": False, "error": "rc: False", "elapsed": 0.02}}
+
+        assert exp_manager.record_agent_results(exp_id, "start", start_results) is True
+        assert exp_manager.record_agent_results(exp_id, "stop", stop_results) is True
+        data = exp_manager.get_dict_experiment_data(exp_id)
+        assert data["agent_results"] == {"start": start_results, "stop": stop_results}
+        assert data["state"] == "submited"
+
+        with pytest.raises(ValueError, match="Experiment ID not found"):
+            exp_manager.record_agent_results("wrong_id", "start", start_results)
+        with pytest.raises(ValueError):
+            exp_manager.record_agent_results(exp_id, "warmup", start_results)
+        with pytest.raises(ValueError, match="a dictionary per agent"):
+            exp_manager.record_agent_results(exp_id, "start", {"agent1": True})
+        assert exp_manager.get_dict_experiment_data(exp_id)["agent_results"]["start"] == start_results
+
+    def test_record_experiment_timing(self, exp_manager: Expmanager, experiment_data_correct: dict):
+        exp_id = exp_manager.submit_experiment_data(experiment_data_correct)
+        timing = {"start": {"planned": "2025-07-10T14:00:00+00:00", "fired": "2025-07-10T14:00:00.012000+00:00", "fire_delay": 0.012}}
+
+        assert exp_manager.record_experiment_timing(exp_id, timing) is True
+        assert exp_manager.get_dict_experiment_data(exp_id)["timing"] == timing
+
+        with pytest.raises(ValueError, match="Experiment ID not found"):
+            exp_manager.record_experiment_timing("wrong_id", timing)
+
 #------------------- Finishing of experiments --------------------
 class TestFinishing:
     def testexperiment_is_finished_success(self, exp_manager: Expmanager, experiment_data_correct: dict):
@@ -590,16 +1070,16 @@ class TestFinishing:
         state = "running"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         # Then finish
         result = exp_manager.experiment_is_finished(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "finished"
  
     
@@ -609,10 +1089,10 @@ class TestFinishing:
         state = "submited"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Try finish not authorised
         with pytest.raises(RuntimeError, match="Can't trigger event finish from state submited"):
@@ -620,10 +1100,10 @@ class TestFinishing:
 
         # authorise an exp
         state = "authorised"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Try finish when experiment is not finilized
         with pytest.raises(RuntimeError, match="Can't trigger event finish from state authorised"):
@@ -631,10 +1111,10 @@ class TestFinishing:
 
         # finalize an exp
         state = "finalized"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Try finish when experiment is not ready
         with pytest.raises(RuntimeError, match="Can't trigger event finish from state finalized"):
@@ -642,15 +1122,15 @@ class TestFinishing:
 
         # run an exp
         state = "running"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
 
         result = exp_manager.experiment_is_finished(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "finished"
 
         # try to finish second time        
@@ -666,54 +1146,54 @@ class TestCancel:
         state = "submited"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Then cancel
         result = exp_manager.cancel_experiment(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "canceled"
 
         # authorise an exp
         state = "authorised"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Then cancel
         result = exp_manager.cancel_experiment(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "canceled"
 
         # finalize an exp
         state = "finalized"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Then cancel
         result = exp_manager.cancel_experiment(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "canceled"
 
         # run an exp
         state = "running"
-        exp_manager._experiments_data_list[0].state = state
+        exp_manager._experiments_data_dict[exp_id].state = state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Then cancel
         result = exp_manager.cancel_experiment(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "canceled"
 
 
@@ -725,15 +1205,15 @@ class TestFail:
         state = "running"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict[exp_id].state is state
         # Then fail
         result = exp_manager.experiment_is_failed(exp_id)
         assert result is True
-        exp = exp_manager._experiments_data_list[0]
+        exp = exp_manager._experiments_data_dict[exp_id]
         assert exp.state is "failed"
 
 
@@ -743,11 +1223,11 @@ class TestFail:
         state = "finished"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         
         # fail non existing id
         with pytest.raises(ValueError, match="Experiment ID not found"):
@@ -771,44 +1251,44 @@ class TestRemoveExperiments:
         state = "finished"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         # Then remove
         result = exp_manager.remove_experiment(exp_id)
         assert result is True
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
         # cancel an exp
         state = "canceled"
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         # Then remove
         result = exp_manager.remove_experiment(exp_id)
         assert result is True
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
         # fail an exp
         state = "failed"
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         # Then remove
         result = exp_manager.remove_experiment(exp_id)
         assert result is True
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
    
     def test_remove_non_existing_experiment(self, exp_manager: Expmanager, experiment_data_correct: dict):
@@ -820,11 +1300,11 @@ class TestRemoveExperiments:
         state = "failed"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         # Then remove
         with pytest.raises(ValueError, match="Experiment ID not found"):
             exp_manager.remove_experiment("wrong_id")
@@ -835,7 +1315,7 @@ class TestRemoveExperiments:
         Verify some edge cases like remove on empty list and remove the same experiment twice
         """
         # remove on empty list
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         with pytest.raises(ValueError, match="Experiment ID not found"):
             exp_manager.remove_experiment("experiment_id")
 
@@ -845,21 +1325,21 @@ class TestRemoveExperiments:
         state = "finished"
         experiment_data_correct.update({"experiment_id": exp_id})
         experiment_data_correct.update({"state": state})
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_correct))
+        exp_manager._experiments_data_dict[experiment_data_correct["experiment_id"]] = ExperimentDataModel(**experiment_data_correct)
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
-        assert exp_manager._experiments_sm_dict[exp_id].state is state
+        assert len(exp_manager._experiments_sm_dict) == 0
+        assert len(exp_manager._experiments_data_dict) == 1
+        assert exp_manager._get_state_machine(exp_id).state is state
         # remove first time
         result = exp_manager.remove_experiment(exp_id)
         assert result is True
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
         # remove second time
         with pytest.raises(ValueError, match="Experiment ID not found"):
             exp_manager.remove_experiment(exp_id)
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0
+        assert len(exp_manager._experiments_data_dict) == 0
 
 
 #------------------- State Machine --------------------
@@ -923,10 +1403,31 @@ class TestStateMachine:
             m.run()
 
 
+    def test_shared_transition_table(self):
+        m1 = ExperimentState("testexp1")
+        m2 = ExperimentState("testexp2", "running")
+        # the states only hold their data, the transitions are shared
+        assert not hasattr(m1, "__dict__")
+        assert ExperimentState.transition_table["cancel"]["running"] == "canceled"
+
+        m1.cancel()
+        assert m1.is_canceled()
+        assert m2.is_running()
+        assert m2.trigger("fail") is True
+        assert m2.state == "failed"
+
+        with pytest.raises(MachineError, match="Can't trigger event finish from state failed!"):
+            m2.finish()
+        with pytest.raises(AttributeError):
+            m2.trigger("explode")
+        with pytest.raises(MachineError, match="Invalid initial state"):
+            ExperimentState("testexp3", "exploded")
+
+
     def test_reinitialise(self, exp_manager: Expmanager, experiment_data_correct: dict):
         # check that there are no experiments and no state machines in the memory
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0 
+        assert len(exp_manager._experiments_data_dict) == 0 
 
         # load data but not machine
         experiment_data_correct.update({"experiment_id": "test1"})
@@ -935,34 +1436,41 @@ class TestStateMachine:
         experiment_data_correct.update({"experiment_id": "test2"})
         experiment_data_correct.update({"state": "finished"})
         experiment_data_2= experiment_data_correct.copy()
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_1))
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_2))
+        exp_manager._experiments_data_dict[experiment_data_1["experiment_id"]] = ExperimentDataModel(**experiment_data_1)
+        exp_manager._experiments_data_dict[experiment_data_2["experiment_id"]] = ExperimentDataModel(**experiment_data_2)
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 2 
+        assert len(exp_manager._experiments_data_dict) == 2 
 
         # reinitialise machine and check its state
         exp_manager._reinitialise_state_machines()
-        assert len(exp_manager._experiments_sm_dict) == 2
-        assert len(exp_manager._experiments_data_list) == 2
+        assert len(exp_manager._experiments_sm_dict) == 1
+        assert len(exp_manager._experiments_data_dict) == 2
         assert exp_manager._experiments_sm_dict["test1"].state is "submited"
-        assert exp_manager._experiments_sm_dict["test2"].state is "finished"
+
+        # finished experiments get their machine on demand
+        assert exp_manager._get_state_machine("test2").state is "finished"
+        assert exp_manager._get_state_machine("test2") is exp_manager._experiments_sm_dict["test2"]
+        with pytest.raises(RuntimeError, match="Failed to update experiment state"):
+            exp_manager._update_experiment("test2", "cancel")
+        exp_manager._delete_experiment("test2")
+        assert "test2" not in exp_manager._experiments_sm_dict
 
 
     def test_reinitialise_raises(self, exp_manager: Expmanager, experiment_data_correct: dict):
         # check that there are no experiments and no state machines in the memory
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 0 
+        assert len(exp_manager._experiments_data_dict) == 0 
 
         # load wringfull data but not machine
         experiment_data_correct.update({"experiment_id": "test1"})
         experiment_data_correct.update({"state": "non existing state"})
         experiment_data_1 = experiment_data_correct.copy()
-        exp_manager._experiments_data_list.append(ExperimentDataModel(**experiment_data_1))
+        exp_manager._experiments_data_dict[experiment_data_1["experiment_id"]] = ExperimentDataModel(**experiment_data_1)
         assert len(exp_manager._experiments_sm_dict) == 0
-        assert len(exp_manager._experiments_data_list) == 1 
+        assert len(exp_manager._experiments_data_dict) == 1 
 
         # reinitialise machine and check its state
         exp_manager._reinitialise_state_machines()
         assert len(exp_manager._experiments_sm_dict) == 1
-        assert len(exp_manager._experiments_data_list) == 1
+        assert len(exp_manager._experiments_data_dict) == 1
         assert exp_manager._experiments_sm_dict["test1"].state is "failed"
\ No newline at end of file
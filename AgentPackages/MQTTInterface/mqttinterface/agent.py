@@ -11,7 +11,7 @@ import threading
 import paho.mqtt.client as mqtt
 import ssl
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional
 import gevent
 
 from volttron.platform.agent import utils
@@ -23,6 +23,8 @@ class MessageHeader(BaseModel):
     source: str
     target: str
     timestamp: str
+    # id to match commands, feedback and plant echoes end to end
+    correlation_id: Optional[str] = None
     additional: Dict = None
 
 _log = logging.getLogger(__name__)
@@ -65,6 +67,8 @@ class Mqttinterface(Agent, MetadataMixin):
         self._mqtt_config = config.get("mqtt", {})
         # TODO: remove topic registry from config and replace with querry to registry agent
         self._topic_registry_identity = config.get("topic_registry_identity", "topicregistryagent-0.1_1")
+        # add the correlation id of commands to the MQTT payload, only if the plant side accepts the extra field
+        self._forward_correlation_id: bool = config.get("forward_correlation_id", False)
         
         self._topic_map_ext2int_command = {}
         self._topic_map_ext2int_noncommand = {}
@@ -85,6 +89,7 @@ class Mqttinterface(Agent, MetadataMixin):
         
         # TODO: remove topic registry from config and replace with querry to registry agent
         self._topic_registry_identity = contents.get("topic_registry_identity", self._topic_registry_identity)
+        self._forward_correlation_id = contents.get("forward_correlation_id", self._forward_correlation_id)
         
         self._retrieve_mappings()
         self._setup_internal_subscriptions()
@@ -136,6 +141,7 @@ class Mqttinterface(Agent, MetadataMixin):
         def callback(peer, sender, bus, topic, headers, message):
             value = None
             timestamp = None
+            correlation_id = None
             # Parse and validate header
             try:
                 header = MessageHeader(**headers)
@@ -145,6 +151,7 @@ class Mqttinterface(Agent, MetadataMixin):
                     return
                 value = message
                 timestamp = header.timestamp
+                correlation_id = header.correlation_id
 
                 # TODO: here can be some kind of additional validation to make sure the message is from the right source
             except Exception as e:
@@ -153,11 +160,11 @@ class Mqttinterface(Agent, MetadataMixin):
 
             # Prepape and put the mqtt message into the queue 
             try:
-                mqtt_payload = self._prepare_mqtt_payload(value, timestamp)
+                mqtt_payload = self._prepare_mqtt_payload(value, timestamp, correlation_id)
 
                 # Non-blocking enqueue; drops messages if queue is full
                 self._outgoing_message_queue.put_nowait((external_topic, mqtt_payload))
-                _log.debug(f"Volttron → MQTT: {topic} → {external_topic} | {mqtt_payload}, timestamp: {timestamp}")
+                _log.debug(f"Volttron → MQTT: {topic} → {external_topic} | {mqtt_payload}, timestamp: {timestamp}, correlation id: {correlation_id}")
 
             except gevent.queue.Full:
                 _log.warning(f"Outgoing MQTT queue full. Dropping message from {topic}")
@@ -166,7 +173,7 @@ class Mqttinterface(Agent, MetadataMixin):
 
         return callback
     
-    def _prepare_mqtt_payload(self, value, timestamp):
+    def _prepare_mqtt_payload(self, value, timestamp, correlation_id: Optional[str] = None):
 
         # Make sure the value is serializable. Not striclty nessecery because of how mqtt in volttron works but still
         try:
@@ -174,6 +181,8 @@ class Mqttinterface(Agent, MetadataMixin):
         except (TypeError, ValueError):
             raise ValueError(f"value must be a serializable, got {type(value)}")
         
+        if self._forward_correlation_id and correlation_id:
+            return {"value": value, "correlation_id": correlation_id}
         return {"value": value}
         
         # Optional add timestamp of the plattform timestamp
@@ -200,6 +209,7 @@ class Mqttinterface(Agent, MetadataMixin):
         
         The MQTT payload is expected to be a JSON dict:
             {"value": <number>, "timestamp": <unix_ms>}
+        An optional "correlation_id" echoed by the plant is placed into the message header.
 
         The timestamp is converted to UTC ISO 8601 and placed into the Volttron
         message header. The payload published to Volttron contains only "value".
@@ -233,8 +243,10 @@ class Mqttinterface(Agent, MetadataMixin):
             # Convert millis ts into ISO8601 String with UTC timeyone
             timestamp_utc = (datetime.fromtimestamp(unix_ms / 1000, tz=timezone.utc).isoformat())
 
+            correlation_id = json_payload.get("correlation_id")
+
             # Build Volttron header
-            header = MessageHeader(source=self._agent_id, target="volttron-bus", timestamp=timestamp_utc)
+            header = MessageHeader(source=self._agent_id, target="volttron-bus", timestamp=timestamp_utc, correlation_id=str(correlation_id) if correlation_id is not None else None)
 
             # Publish only the value to Volttron
             self.vip.pubsub.publish("pubsub", internal_topic, header.model_dump(), value)
@@ -5,21 +5,26 @@ Agent documentation goes here.
 __docformat__ = 'reStructuredText'
 
 import logging
+import os
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
 from pydantic import BaseModel, Field, model_validator, ValidationError
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional
+from math import prod
+from collections import OrderedDict
 import pytz
-import json
-import importlib
 import gevent
+import time
 
 from metadata.metadata_mixin import MetadataMixin
+from persistence.pydantic_io import save_model_list, load_model_list
 
 from apscheduler.schedulers.gevent import GeventScheduler
 from apscheduler.jobstores.base import JobLookupError
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.cron import CronTrigger
 
 
 _log = logging.getLogger(__name__)
@@ -31,8 +36,15 @@ class ScheduledExperiment(BaseModel):
     start_time: str
     stop_time: str
     agents: List[str]
+    # seconds the agents are started before start_time, they are released with the go signal at start_time
+    warmup_lead_time: float = Field(default=0, ge=0)
+    # setpoints of a sweep run, sent to the agents with the go signal
+    parameters: Optional[Dict[str, Any]] = None
+    # ID of the series this experiment is a run of
+    series_id: Optional[str] = None
     
     started: bool = False
+    released: bool = False
     stopped: bool = False
 
     @model_validator(mode='after')
@@ -40,11 +52,115 @@ class ScheduledExperiment(BaseModel):
         if self.stop_time <= self.start_time:
             raise ValueError("stop_time must be after start_time")
         return self
-    
+
+
+class ScheduledSeries(BaseModel):
+    """
+    Definition of a recurring experiment, expanded lazily into one run (a ScheduledExperiment) at a time.
+    Runs recur by interval or cron expression; with a sweep every run gets the next combination of setpoints.
+    """
+    series_id: str
+    agents: List[str]
+    # every run is registered with the experiment manager under this experimenter
+    experimenter: str = "scheduler"
+    description: Optional[str] = None
+    # plants used by the runs, every occurrence is checked for availability with the experiment manager
+    plants: List[str] = []
+    duration_seconds: float = Field(gt=0)
+    interval_seconds: Optional[float] = Field(default=None, gt=0)
+    # standard crontab expression "minute hour day month day_of_week", numeric days count
+    # from 0 = Sunday as in crontab (7 is Sunday as well), not from 0 = Monday as in APScheduler
+    cron: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    max_runs: Optional[int] = Field(default=None, gt=0)
+    # parameter name to list of values, the runs iterate the cartesian product of all values
+    sweep: Optional[Dict[str, List[Any]]] = None
+    warmup_lead_time: float = Field(default=0, ge=0)
+
+    next_run_index: int = 0
+    skipped_occurrences: int = 0
+    active_run_id: Optional[str] = None
+    # start of the latest run, the next run is always at a later occurrence
+    last_occurrence: Optional[str] = None
+
+    @model_validator(mode='after')
+    def validate_recurrence(self) -> 'ScheduledSeries':
+        if (self.interval_seconds is None) == (self.cron is None):
+            raise ValueError("exactly one of interval_seconds or cron must be set")
+        if self.sweep is not None and (not self.sweep or not all(self.sweep.values())):
+            raise ValueError("sweep must map parameter names to non empty lists of values")
+        return self
+
+    def total_runs(self) -> Optional[int]:
+        """
+        Number of runs the series is limited to by max_runs and the sweep, None if unlimited
+        """
+        limits = [self.max_runs] if self.max_runs else []
+        if self.sweep:
+            limits.append(prod(len(values) for values in self.sweep.values()))
+        return min(limits) if limits else None
+
+    def run_parameters(self, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Setpoints of the run with the given index, computed from the index so the sweep is never expanded.
+        The last parameter changes fastest.
+        """
+        if not self.sweep:
+            return None
+        parameters = {}
+        for name in reversed(list(self.sweep)):
+            values = self.sweep[name]
+            index, position = divmod(index, len(values))
+            parameters[name] = values[position]
+        return {name: parameters[name] for name in self.sweep}
+
 DEFAULT_SCHEDULES_PATH = "/home/volttron/.volttron/AgentPackages/SchedulerAgent/scheduler/schedules.json"
 DEFAULT_AGENT_MANAGER_IDENTITY = "agentmanageragent-0.1_1"
 DEFAULT_EXPERIMENT_MANAGER_IDENTITY = "expmanageragent-0.1_1"
+# start/stop RPCs time out after 2 seconds each, all agents of an experiment are joined with one deadline
+DEFAULT_AGENT_JOIN_TIMEOUT = 3
+# seconds a start or stop job may run late, also applies to jobs re-armed after a restart
+MISFIRE_GRACE_TIME = 60
+DEFAULT_WARMUP_LEAD_TIME = 0
+DEFAULT_GO_SIGNAL_TOPIC = "experiments/go"
+# number of experiments whose timing records are kept in memory
+MAX_TIMING_RECORDS = 100
+# occurrences of a series checked for free plants at once, afterwards the search is continued by a retry job
+MAX_SKIPPED_OCCURRENCES = 50
+# seconds until the next run of a series is searched again if the experiment manager could not be reached
+SERIES_RETRY_DELAY = 60
 TIMEZONE = pytz.utc
+# crontab day numbers to day names, APScheduler would read the numbers as 0 = Monday
+CRONTAB_WEEKDAYS = ["sun", "mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _crontab_day_of_week(field: str) -> str:
+    """
+    Translate the day_of_week field of a crontab expression to day names, so APScheduler reads it with crontab semantics.
+    Numeric values, ranges and steps are expanded to a list of names, "*" and name expressions are kept.
+
+    Raises:
+        ValueError on invalid numeric values
+    """
+    days = []
+    for token in field.split(","):
+        if token == "*" or any(char.isalpha() for char in token):
+            days.append(token)
+            continue
+        expression, _, step = token.partition("/")
+        if expression == "*":
+            first, last = 0, 6
+        elif "-" in expression:
+            first, last = (int(value) for value in expression.split("-", 1))
+        else:
+            first = int(expression)
+            last = 7 if step else first
+        step = int(step) if step else 1
+        if not 0 <= first <= last <= 7 or step < 1:
+            raise ValueError(f"invalid day_of_week \"{token}\", days range from 0 (Sunday) to 7 (Sunday)")
+        days.extend(CRONTAB_WEEKDAYS[day] for day in range(first, last + 1, step))
+    return ",".join(dict.fromkeys(days))
 
 def scheduler(config_path, **kwargs):
     """
@@ -75,11 +191,21 @@ class Scheduler(Agent, MetadataMixin):
 
         self._config = config
         self._scheduled_experiments_filepath = self._config.get("schedules_path", DEFAULT_SCHEDULES_PATH)
+        self._scheduled_series_filepath = self._config.get("series_path", self._default_series_path(self._scheduled_experiments_filepath))
         # TODO: Later can be replaced with a call to Agent Registry
         self._agent_manager = self._config.get("agent_manager_identity", DEFAULT_AGENT_MANAGER_IDENTITY)
         self._experiment_manager = self._config.get("experiment_manager_identity", DEFAULT_EXPERIMENT_MANAGER_IDENTITY)
+        self._agent_join_timeout = self._config.get("agent_join_timeout", DEFAULT_AGENT_JOIN_TIMEOUT)
+        self._warmup_lead_time = self._config.get("warmup_lead_time", DEFAULT_WARMUP_LEAD_TIME)
+        self._go_signal_topic = self._config.get("go_signal_topic", DEFAULT_GO_SIGNAL_TOPIC)
 
         self._scheduler = GeventScheduler(timezone=TIMEZONE)
+        # experiments with pending start or stop jobs, this is what gets persisted
+        self._scheduled_experiments: Dict[str, ScheduledExperiment] = {}
+        # recurring experiments, keyed by series ID, only their next run is in _scheduled_experiments
+        self._scheduled_series: Dict[str, ScheduledSeries] = {}
+        # planned versus actual timing of the start, release and stop phases, keyed by experiment ID
+        self._experiment_timings: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
       
         self.vip.config.set_default("config", config)
         self.vip.config.subscribe(self._configure, actions=["NEW", "UPDATE"], pattern="config")
@@ -88,13 +214,19 @@ class Scheduler(Agent, MetadataMixin):
     def _configure(self, config_name, action, contents):
         self._config = contents
         self._scheduled_experiments_filepath = contents.get("schedules_path", self._scheduled_experiments_filepath)
+        self._scheduled_series_filepath = contents.get("series_path", self._default_series_path(self._scheduled_experiments_filepath))
         # TODO: Later can be replaced with a call to Agent Registry
         self._agent_manager = self._config.get("agent_manager_identity", self._agent_manager)
         self._experiment_manager = self._config.get("experiment_manager_identity", self._experiment_manager)
+        self._agent_join_timeout = self._config.get("agent_join_timeout", self._agent_join_timeout)
+        self._warmup_lead_time = self._config.get("warmup_lead_time", self._warmup_lead_time)
+        self._go_signal_topic = self._config.get("go_signal_topic", self._go_signal_topic)
 
-        self._start_scheduler()
-        # TODO persistence check
-        #self._load_scheduled_experiments()
+        # configure is called again on config updates, the schedules are only re-armed on the first call
+        if not self._scheduler.running:
+            self._start_scheduler()
+            self._load_scheduled_experiments()
+            self._load_scheduled_series()
 
 # ----------------- RPC exposed functions ----------------- 
 
@@ -110,8 +242,11 @@ class Scheduler(Agent, MetadataMixin):
                 "experiment_id": "exp_001",
                 "start_time": "2025-07-10T14:00:00+00:00",
                 "stop_time": "2025-07-10T16:30:00+00:00",
-                "agents": ["agent1.identity", "agent2.identity", ...]
+                "agents": ["agent1.identity", "agent2.identity", ...],
+                "warmup_lead_time": 30 (optional, defaults to the configured warmup_lead_time)
             }
+            With a warmup lead time the agents are started that many seconds early
+            and released with a go signal on the go signal topic at start_time.
         Returns:
             True on success
         Raises:
@@ -119,12 +254,11 @@ class Scheduler(Agent, MetadataMixin):
         """
         
         try:
-            experiment = ScheduledExperiment(**experiment_data)
+            experiment = ScheduledExperiment(**{"warmup_lead_time": self._warmup_lead_time, **experiment_data})
 
-            start_job_id: str = 'start_'+experiment.experiment_id
-            stop_job_id: str = 'stop_'+experiment.experiment_id
-            self._scheduler.add_job(self._start_agents, trigger='date', run_date=experiment.start_time, args=[experiment.agents, experiment.experiment_id], id=start_job_id, misfire_grace_time=60)
-            self._scheduler.add_job(self._stop_agents, trigger='date', run_date=experiment.stop_time, args=[experiment.agents, experiment.experiment_id], id=stop_job_id, misfire_grace_time=60)
+            self._arm_experiment(experiment)
+            self._scheduled_experiments[experiment.experiment_id] = experiment
+            self._save_scheduled_experiments()
 
             _log.info(f"Experiment \"{experiment.experiment_id}\" scheduled from {experiment.start_time} to {experiment.stop_time}")
             return True
@@ -133,6 +267,162 @@ class Scheduler(Agent, MetadataMixin):
             _log.error(f"Exception occured while scheduling experiment: {e}")
             raise RuntimeError(f"Failed to schedule: {e}")
 
+    @RPC.export
+    def submit_experiment_schedules(self, experiments_data: List[Dict]) -> bool:
+        """
+        Accepts a batch of experiment schedules and registers all of them or none.
+        The whole batch is validated first, then the jobs are armed and the schedules are persisted once.
+        
+        Params:
+            List of experiment data dicts in the format of submit_experiment_schedule
+        Returns:
+            True on success
+        Raises:
+            RuntimeError if any schedule in the batch is invalid, an experiment ID is used twice or is already scheduled,
+            or the same agent is used by two experiments of the batch at overlapping times (including the warmup).
+            Nothing is scheduled in that case.
+        """
+
+        if not isinstance(experiments_data, list) or not experiments_data:
+            raise RuntimeError("Failed to schedule: expected a non empty list of experiment schedules")
+
+        experiments: List[ScheduledExperiment] = []
+        errors: List[str] = []
+        for index, experiment_data in enumerate(experiments_data):
+            try:
+                experiment = ScheduledExperiment(**{"warmup_lead_time": self._warmup_lead_time, **experiment_data})
+                self._parse_time(experiment.start_time)
+                self._parse_time(experiment.stop_time)
+                experiments.append(experiment)
+            except (ValueError, TypeError) as e:
+                errors.append(f"#{index}: {e}")
+        if not errors:
+            errors = self._find_batch_conflicts(experiments)
+        if errors:
+            _log.error(f"Rejected batch of {len(experiments_data)} experiment schedules: {errors}")
+            raise RuntimeError(f"Failed to schedule batch: {'; '.join(errors)}")
+
+        armed: List[ScheduledExperiment] = []
+        try:
+            for experiment in experiments:
+                self._arm_experiment(experiment)
+                armed.append(experiment)
+        except Exception as e:
+            for experiment in armed:
+                self._disarm_experiment(experiment.experiment_id)
+            _log.error(f"Exception occured while scheduling batch, removed {len(armed)} already armed experiments: {e}")
+            raise RuntimeError(f"Failed to schedule batch: {e}")
+
+        for experiment in experiments:
+            self._scheduled_experiments[experiment.experiment_id] = experiment
+        self._save_scheduled_experiments()
+
+        _log.info(f"Scheduled batch of {len(experiments)} experiments")
+        return True
+
+    @RPC.export
+    def submit_experiment_series(self, series_data: Dict) -> bool:
+        """
+        Accepts a recurring or parameter sweep experiment and schedules its first run.
+        Only the next run of a series is scheduled at any time, the following one is scheduled once it finished.
+        Occurrences at which the plants are reserved by the experiment manager are skipped.
+        
+        Params:
+            Dict of the series definition
+            Expected format:
+            {
+                "series_id": "impulse_campaign",
+                "agents": ["agent1.identity", ...],
+                "plants": ["bhkw", ...],
+                "experimenter": "alice" (optional, defaults to "scheduler"),
+                "description": "Impulse campaign" (optional),
+                "duration_seconds": 900,
+                "interval_seconds": 3600 or "cron": "0 8-16 * * mon-fri",
+                "start_time": "2025-07-10T14:00:00+00:00" (optional, defaults to now),
+                "end_time": "2025-07-20T14:00:00+00:00" (optional),
+                "max_runs": 20 (optional),
+                "sweep": {"einschaltpunkt": [30, 40], "ausschaltpunkt": [60, 70]} (optional),
+                "warmup_lead_time": 30 (optional, defaults to the configured warmup_lead_time)
+            }
+            The setpoints of a sweep run are sent as "parameters" with the go signal.
+        Returns:
+            True on success
+        Raises:
+            RuntimeError on invalid definition or if the series ID is already used
+        """
+
+        try:
+            series = ScheduledSeries(**{"warmup_lead_time": self._warmup_lead_time, **series_data})
+            if series.start_time is None:
+                series = series.model_copy(update={"start_time": datetime.now(TIMEZONE).isoformat()})
+            self._series_trigger(series)
+        except (ValueError, TypeError) as e:
+            _log.error(f"Exception occured while scheduling series: {e}")
+            raise RuntimeError(f"Failed to schedule series: {e}")
+
+        if series.series_id in self._scheduled_series:
+            raise RuntimeError(f"Failed to schedule series: \"{series.series_id}\" is already scheduled")
+
+        self._scheduled_series[series.series_id] = series
+        self._save_scheduled_series()
+        run_id = self._schedule_next_series_run(series.series_id)
+
+        _log.info(f"Series \"{series.series_id}\" scheduled, first run: {run_id}")
+        return True
+
+    @RPC.export
+    def remove_experiment_series(self, series_id: str) -> bool:
+        """
+        Removes a series and its scheduled run, a running run is stopped
+        
+        Params:
+            series_id: ID of the series
+        Returns:
+            True on success
+        Raises:
+            RuntimeError if the series is not scheduled
+        """
+
+        series = self._scheduled_series.pop(series_id, None)
+        if series is None:
+            raise RuntimeError(f"Failed to remove series, \"{series_id}\" is not scheduled")
+        self._save_scheduled_series()
+
+        try:
+            self._scheduler.remove_job('series_'+series_id)
+        except JobLookupError:
+            pass
+        run = self._scheduled_experiments.get(series.active_run_id)
+        if run is not None:
+            try:
+                self.remove_experiment_schedule({"experiment_id": run.experiment_id, "agents": run.agents})
+            except RuntimeError as e:
+                _log.warning(f"Could not remove run \"{run.experiment_id}\" of series \"{series_id}\": {e}")
+            # a started run is reported as finished by _stop_agents, a pending one releases its reservation
+            if not run.started:
+                self.notify_experiment_is_canceled(run.experiment_id)
+
+        _log.info(f"Removed series \"{series_id}\"")
+        return True
+
+    @RPC.export
+    def get_experiment_series(self, series_id: str) -> Dict[str, Any]:
+        """
+        Returns the definition and progress of a series
+
+        Params:
+            series_id: ID of the series
+        Returns:
+            Dict of the series definition with "next_run_index", "skipped_occurrences",
+            "active_run_id", "last_occurrence" and "total_runs" (None if unlimited)
+        Raises:
+            ValueError if the series is not scheduled
+        """
+        series = self._scheduled_series.get(series_id)
+        if series is None:
+            raise ValueError(f"Series \"{series_id}\" is not scheduled")
+        return {**series.model_dump(), "total_runs": series.total_runs()}
+
     @RPC.export
     def remove_experiment_schedule(self, experiment_data: Dict) -> bool:
         """
@@ -163,6 +453,11 @@ class Scheduler(Agent, MetadataMixin):
         start_job_id: str = 'start_'+experiment_id
         stop_job_id: str = 'stop_'+experiment_id
         
+        # Remove go signal schedule, only exists for experiments with a warmup that are not released yet
+        try:
+            self._scheduler.remove_job('go_'+experiment_id)
+        except JobLookupError:
+            pass
         # Remove start schedule
         try:    
             self._scheduler.remove_job(start_job_id)
@@ -179,6 +474,9 @@ class Scheduler(Agent, MetadataMixin):
         except JobLookupError as e:        
             _log.warning(f"Could not remove schedule for stopping experiment \"{experiment_id}\": {e}")
             result = False
+
+        if self._scheduled_experiments.pop(experiment_id, None) is not None:
+            self._save_scheduled_experiments()
         
         if result: 
             _log.info(f"Successfully removed schedules for experiment \"{experiment_id}\".")
@@ -187,61 +485,157 @@ class Scheduler(Agent, MetadataMixin):
             _log.error(f"Exception occured while removing schedule for experiment \"{experiment_id}\"")
             raise RuntimeError(f"Failed to remove schedule")
     
+    @RPC.export
+    def get_experiment_timing(self, experiment_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the timing record of an experiment, to measure how late experiments start and stop.
+
+        Params:
+            experiment_id: Experiment ID string
+        Returns:
+            Dictionary keyed by phase ("start", "release", "stop"), each with:
+            "planned": ISO time the job was due,
+            "fired": ISO time the job actually ran,
+            "fire_delay": seconds between planned and fired,
+            and depending on the phase "agents" (per agent success and seconds after firing until
+            the start or stop RPC returned), "completed_after", "acknowledged" and "acknowledged_after"
+            (seconds after firing until the experiment manager acknowledged the running or finished state)
+        Raises:
+            ValueError if there is no timing record for the experiment
+        """
+        timing = self._experiment_timings.get(experiment_id)
+        if timing is None:
+            raise ValueError(f"No timing recorded for experiment \"{experiment_id}\"")
+        return timing
+
 # ----------------- Helper functions ----------------- 
 
 # -------- Data peristence --------
 
     def _load_scheduled_experiments(self):
         """
-        Load persisted schedules data from file into agent
-        """
-        # Note the last compatible versions of apscheduler for volttron 9.0.1 is 3.x and they do not support export_jobs() or import_jobs()
-        #self._scheduler.import_jobs(self._scheduled_experiments_filepath)
-
-        return
-        # TODO: Raises error due to some objects inside trigger not json serializable like timezone
-        with open(self._scheduled_experiments_filepath, "r") as f:
-            jobs_data = json.load(f)
-
-        for job_data in jobs_data:
-            # resolve function reference
-            module_name, func_name = job_data["func"].split(":")
-            mod = importlib.import_module(module_name)
-            func = getattr(mod, func_name)
-
-            # restore trigger from state
-            trigger_class = self._scheduler._create_trigger(job_data["trigger_args"])
-            self._scheduler.add_job(
-                func,
-                trigger=trigger_class,
-                args=job_data["args"],
-                kwargs=job_data["kwargs"],
-                id=job_data["id"],
-                replace_existing=True,
-            )
+        Load persisted schedules from file and re-arm their start and stop jobs.
+
+        A start that is overdue by less than the misfire grace time is run right away,
+        an experiment whose start was missed by more is reported as failed.
+        A running experiment whose stop time passed while the agent was down is stopped right away.
+        """
+        # Note the last compatible versions of apscheduler for volttron 9.0.1 is 3.x and they do not support export_jobs() or import_jobs(),
+        # so instead of the jobs the experiment schedules are persisted and the jobs are recreated from them
+        try:
+            experiments: List[ScheduledExperiment] = load_model_list(self._scheduled_experiments_filepath, ScheduledExperiment)
+        except FileNotFoundError:
+            _log.info(f"No persisted schedules at {self._scheduled_experiments_filepath}")
+            return
+        except (ValueError, ValidationError) as e:
+            _log.error(f"Could not load persisted schedules from {self._scheduled_experiments_filepath}: {e}")
+            return
+
+        now = datetime.now(TIMEZONE)
+        grace = timedelta(seconds=MISFIRE_GRACE_TIME)
+        missed_experiments: List[str] = []
+        self._scheduled_experiments = {}
+
+        for experiment in experiments:
+            start_time = self._parse_time(experiment.start_time)
+            stop_time = self._parse_time(experiment.stop_time)
+
+            if not experiment.started and (start_time < now - grace or stop_time <= now):
+                _log.warning(f"Start of experiment \"{experiment.experiment_id}\" was missed at {experiment.start_time}")
+                missed_experiments.append(experiment.experiment_id)
+                continue
+
+            if not experiment.started:
+                self._add_start_job(experiment, max(start_time - timedelta(seconds=experiment.warmup_lead_time), now))
+            if experiment.warmup_lead_time and not experiment.released:
+                self._add_go_job(experiment, max(start_time, now))
+            self._add_stop_job(experiment, max(stop_time, now))
+            self._scheduled_experiments[experiment.experiment_id] = experiment
+            _log.info(f"Re-armed schedule for experiment \"{experiment.experiment_id}\" (started: {experiment.started})")
+
+        self._save_scheduled_experiments()
+        for experiment_id in missed_experiments:
+            self.notify_experiment_is_failed(experiment_id)
 
     def _save_scheduled_experiments(self):
         """
-        Persist the temporarly cached schedules data to file
-        """
-        # Note the last compatible versions of apscheduler for volttron 9.0.1 is 3.x and they do not support export_jobs() or import_jobs()
-        #self._scheduler.export_jobs(self._scheduled_experiments_filepath)
-
-        return
-        # TODO: Raises error due to some objects inside trigger not json serializable like timezone
-        jobs_data = []
-        for job in self._scheduler.get_jobs():
-            jobs_data.append({
-                "id": job.id,
-                "func": f"{job.func.__module__}:{job.func.__qualname__}",  # reference
-                "trigger": str(job.trigger),  # for logging/debug
-                "trigger_args": job.trigger.__getstate__(),  # APScheduler trigger state
-                "args": job.args,
-                "kwargs": job.kwargs,
-            })
+        Persist the pending experiment schedules to file.
+        The file is replaced atomically, so a crash while saving leaves the previous version.
+        """
+        self._save_models(self._scheduled_experiments_filepath, list(self._scheduled_experiments.values()))
+
+    def _load_scheduled_series(self):
+        """
+        Load persisted series from file and schedule the next run of every series whose run was not re-armed
+        """
+        try:
+            series_list: List[ScheduledSeries] = load_model_list(self._scheduled_series_filepath, ScheduledSeries)
+        except FileNotFoundError:
+            _log.info(f"No persisted series at {self._scheduled_series_filepath}")
+            return
+        except (ValueError, ValidationError) as e:
+            _log.error(f"Could not load persisted series from {self._scheduled_series_filepath}: {e}")
+            return
+
+        self._scheduled_series = {series.series_id: series for series in series_list}
+        for series in series_list:
+            if series.active_run_id not in self._scheduled_experiments:
+                self._schedule_next_series_run(series.series_id)
+
+    def _save_scheduled_series(self):
+        """
+        Persist the series definitions to file
+        """
+        self._save_models(self._scheduled_series_filepath, list(self._scheduled_series.values()))
+
+    def _save_models(self, filepath: str, models: List[BaseModel]):
+        """
+        The file is replaced atomically, so a crash while saving leaves the previous version.
+        """
+        tmp_filepath = filepath + ".tmp"
+        try:
+            save_model_list(tmp_filepath, models)
+            os.replace(tmp_filepath, filepath)
+        except OSError as e:
+            _log.error(f"Could not persist to {filepath}: {e}")
+
+    def _default_series_path(self, schedules_path: str) -> str:
+        return os.path.splitext(schedules_path)[0] + "_series.json"
+
+    def _mark_experiment_started(self, experiment_id: str):
+        """
+        Record that the experiment started, so a restart does not start its agents again
+        """
+        self._update_experiment(experiment_id, started=True)
+
+    def _update_experiment(self, experiment_id: str, **fields):
+        """
+        Update fields of a scheduled experiment and persist the change
+        """
+        experiment = self._scheduled_experiments.get(experiment_id)
+        if experiment is not None:
+            self._scheduled_experiments[experiment_id] = experiment.model_copy(update=fields)
+            self._save_scheduled_experiments()
+
+    def _forget_experiment(self, experiment_id: str) -> Optional[ScheduledExperiment]:
+        """
+        Drop the schedule of an experiment that finished or failed
+
+        Returns:
+            The dropped schedule, None if the experiment was not scheduled
+        """
+        experiment = self._scheduled_experiments.pop(experiment_id, None)
+        if experiment is not None:
+            self._save_scheduled_experiments()
+        return experiment
 
-        with open(self._scheduled_experiments_filepath, "w") as file:
-            json.dump(jobs_data, file, indent=2)
+    def _continue_series(self, experiment: Optional[ScheduledExperiment]):
+        """
+        Search the next run of the series a finished or failed run belongs to.
+        The search runs as its own job, so it neither delays nor prevents the notifications of the run.
+        """
+        if experiment is not None and experiment.series_id is not None and experiment.series_id in self._scheduled_series:
+            self._add_series_search_job(experiment.series_id, datetime.now(TIMEZONE))
 
 
     def _full_data_deletions(self):
@@ -250,7 +644,10 @@ class Scheduler(Agent, MetadataMixin):
         """
 
         self._scheduler.remove_all_jobs()
+        self._scheduled_experiments = {}
+        self._scheduled_series = {}
         self._save_scheduled_experiments()
+        self._save_scheduled_series()
 
 
     def _get_schedules(self) -> List:
@@ -262,6 +659,271 @@ class Scheduler(Agent, MetadataMixin):
 
 # -------- Schedule managment --------
 
+    def _arm_experiment(self, experiment: ScheduledExperiment):
+        """
+        Add the start, go and stop jobs of a new experiment schedule.
+        If adding a job fails, the jobs added so far are removed again before the exception is raised.
+        """
+        start_time = self._parse_time(experiment.start_time)
+        try:
+            self._add_start_job(experiment, start_time - timedelta(seconds=experiment.warmup_lead_time))
+            if experiment.warmup_lead_time:
+                self._add_go_job(experiment, start_time)
+            self._add_stop_job(experiment, experiment.stop_time)
+        except Exception:
+            self._disarm_experiment(experiment.experiment_id)
+            raise
+
+    def _disarm_experiment(self, experiment_id: str):
+        """
+        Remove all jobs of an experiment, jobs that do not exist are skipped
+        """
+        for job_id in ['start_'+experiment_id, 'go_'+experiment_id, 'stop_'+experiment_id]:
+            try:
+                self._scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+
+    def _find_batch_conflicts(self, experiments: List[ScheduledExperiment]) -> List[str]:
+        """
+        Check a batch of schedules for experiment IDs that are used twice or already scheduled,
+        and for agents used by two experiments of the batch at overlapping times.
+
+        Returns:
+            List of conflict descriptions, empty if there are none
+        """
+        conflicts: List[str] = []
+        seen_ids = set()
+        for experiment in experiments:
+            if experiment.experiment_id in seen_ids:
+                conflicts.append(f"experiment \"{experiment.experiment_id}\" is in the batch twice")
+            elif experiment.experiment_id in self._scheduled_experiments or self._scheduler.get_job('start_'+experiment.experiment_id):
+                conflicts.append(f"experiment \"{experiment.experiment_id}\" is already scheduled")
+            seen_ids.add(experiment.experiment_id)
+
+        # the agents run from the start of the warmup until the stop, sorting the windows
+        # per agent means only neighbours have to be compared
+        windows: Dict[str, List] = {}
+        for experiment in experiments:
+            begin = self._parse_time(experiment.start_time) - timedelta(seconds=experiment.warmup_lead_time)
+            end = self._parse_time(experiment.stop_time)
+            for agent in set(experiment.agents):
+                windows.setdefault(agent, []).append((begin, end, experiment.experiment_id))
+
+        for agent, agent_windows in windows.items():
+            agent_windows.sort()
+            latest_end, latest_id = agent_windows[0][1], agent_windows[0][2]
+            for begin, end, experiment_id in agent_windows[1:]:
+                if begin < latest_end:
+                    conflicts.append(f"agent \"{agent}\" is used by \"{latest_id}\" and \"{experiment_id}\" at the same time")
+                if end > latest_end:
+                    latest_end, latest_id = end, experiment_id
+
+        return conflicts
+
+    def _series_trigger(self, series: ScheduledSeries):
+        """
+        Build the APScheduler trigger computing the occurrences of a series
+
+        Raises:
+            ValueError on an invalid cron expression or time
+        """
+        start_date = self._parse_time(series.start_time) if series.start_time else None
+        end_date = self._parse_time(series.end_time) if series.end_time else None
+        if series.interval_seconds is not None:
+            return IntervalTrigger(seconds=series.interval_seconds, start_date=start_date, end_date=end_date, timezone=TIMEZONE)
+
+        fields = series.cron.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression \"{series.cron}\" must have 5 fields")
+        minute, hour, day, month, day_of_week = fields
+        return CronTrigger(minute=minute, hour=hour, day=day, month=month, day_of_week=_crontab_day_of_week(day_of_week),
+                           start_date=start_date, end_date=end_date, timezone=TIMEZONE)
+
+    def _schedule_next_series_run(self, series_id: str) -> Optional[str]:
+        """
+        Schedule the next run of a series at its next occurrence for which the plants are free.
+        The free window is looked up with find_next_free_slot of the experiment manager, so reserved
+        occurrences are skipped in one step. The run is then registered with the experiment manager,
+        which reserves its plants, an occurrence taken in the meantime is skipped as well.
+        A series that ran out of occurrences or runs is removed.
+
+        Params:
+            series_id: ID of the series
+        Returns:
+            ID of the scheduled run, None if no run was scheduled
+        """
+        series = self._scheduled_series.get(series_id)
+        if series is None:
+            return None
+
+        trigger = self._series_trigger(series)
+        total_runs = series.total_runs()
+        lead = timedelta(seconds=series.warmup_lead_time)
+        duration = timedelta(seconds=series.duration_seconds)
+        earliest = datetime.now(TIMEZONE) + lead
+        if series.last_occurrence is not None:
+            earliest = max(earliest, self._parse_time(series.last_occurrence) + timedelta(seconds=1))
+        skipped = 0
+
+        for _ in range(MAX_SKIPPED_OCCURRENCES):
+            occurrence = trigger.get_next_fire_time(None, earliest)
+            if occurrence is None or (total_runs is not None and series.next_run_index >= total_runs):
+                self._scheduled_series.pop(series_id, None)
+                self._save_scheduled_series()
+                _log.info(f"Series \"{series_id}\" completed after {series.next_run_index} runs")
+                return None
+
+            if series.plants:
+                try:
+                    slot = self.vip.rpc.call(self._experiment_manager, "find_next_free_slot", series.plants,
+                                             (lead + duration).total_seconds(), (occurrence - lead).isoformat()).get(timeout=2)
+                except (Exception, gevent.Timeout) as e:
+                    _log.warning(f"Could not check plants for series \"{series_id}\", retrying in {SERIES_RETRY_DELAY}s: {e}")
+                    self._add_series_search_job(series_id, datetime.now(TIMEZONE) + timedelta(seconds=SERIES_RETRY_DELAY))
+                    return None
+                free_from = self._parse_time(slot["start_time"]) + lead
+                if free_from > occurrence:
+                    _log.info(f"Plants of series \"{series_id}\" are reserved at {occurrence.isoformat()}, skipping to {free_from.isoformat()}")
+                    skipped += 1
+                    earliest = free_from
+                    continue
+
+            run = ScheduledExperiment(
+                experiment_id=f"{series_id}_run{series.next_run_index}",
+                start_time=occurrence.isoformat(),
+                stop_time=(occurrence + duration).isoformat(),
+                agents=series.agents,
+                warmup_lead_time=series.warmup_lead_time,
+                parameters=series.run_parameters(series.next_run_index),
+                series_id=series_id
+            )
+            try:
+                registered = self.vip.rpc.call(self._experiment_manager, "register_series_run", self._series_run_data(series, run)).get(timeout=2)
+            except (Exception, gevent.Timeout) as e:
+                _log.warning(f"Could not register run \"{run.experiment_id}\" of series \"{series_id}\", retrying in {SERIES_RETRY_DELAY}s: {e}")
+                self._add_series_search_job(series_id, datetime.now(TIMEZONE) + timedelta(seconds=SERIES_RETRY_DELAY))
+                return None
+            if not registered:
+                _log.info(f"Plants of series \"{series_id}\" were reserved at {occurrence.isoformat()} in the meantime, skipping")
+                skipped += 1
+                earliest = occurrence + timedelta(seconds=1)
+                continue
+
+            self._arm_experiment(run)
+            self._scheduled_experiments[run.experiment_id] = run
+            self._scheduled_series[series_id] = series.model_copy(update={
+                "next_run_index": series.next_run_index + 1,
+                "skipped_occurrences": series.skipped_occurrences + skipped,
+                "active_run_id": run.experiment_id,
+                "last_occurrence": run.start_time
+            })
+            self._save_scheduled_experiments()
+            self._save_scheduled_series()
+            _log.info(f"Scheduled run \"{run.experiment_id}\" of series \"{series_id}\" from {run.start_time} to {run.stop_time}")
+            return run.experiment_id
+
+        # the plants are busy for a long time, continue the search once the last found window is near
+        self._scheduled_series[series_id] = series.model_copy(update={"skipped_occurrences": series.skipped_occurrences + skipped, "active_run_id": None})
+        self._save_scheduled_series()
+        self._add_series_search_job(series_id, max(earliest - lead, datetime.now(TIMEZONE)))
+        return None
+
+    def _series_run_data(self, series: ScheduledSeries, run: ScheduledExperiment) -> Dict[str, Any]:
+        """
+        Experiment data of a series run as registered with the experiment manager
+        """
+        description = f"Run {series.next_run_index} of series \"{series.series_id}\""
+        if series.description:
+            description = f"{series.description} ({description})"
+        return {
+            "experiment_id": run.experiment_id,
+            "experimenter": series.experimenter,
+            "description": description,
+            "start_time": run.start_time,
+            "stop_time": run.stop_time,
+            "plants": series.plants,
+            "agents": run.agents
+        }
+
+    def _search_next_series_run(self, series_id: str):
+        """
+        Job wrapper of _schedule_next_series_run, a failed search is retried later instead of stalling the series
+        """
+        try:
+            self._schedule_next_series_run(series_id)
+        except Exception as e:
+            _log.error(f"Could not schedule the next run of series \"{series_id}\", retrying in {SERIES_RETRY_DELAY}s: {e}")
+            if series_id in self._scheduled_series:
+                self._add_series_search_job(series_id, datetime.now(TIMEZONE) + timedelta(seconds=SERIES_RETRY_DELAY))
+
+    def _add_series_search_job(self, series_id: str, run_date):
+        self._scheduler.add_job(self._search_next_series_run, trigger='date', run_date=run_date, args=[series_id],
+                                id='series_'+series_id, misfire_grace_time=MISFIRE_GRACE_TIME, replace_existing=True)
+
+    def _add_start_job(self, experiment: ScheduledExperiment, run_date):
+        self._scheduler.add_job(self._start_agents, trigger='date', run_date=run_date, args=[experiment.agents, experiment.experiment_id],
+                                id='start_'+experiment.experiment_id, misfire_grace_time=MISFIRE_GRACE_TIME, replace_existing=True)
+
+    def _add_go_job(self, experiment: ScheduledExperiment, run_date):
+        self._scheduler.add_job(self._release_agents, trigger='date', run_date=run_date, args=[experiment.agents, experiment.experiment_id],
+                                id='go_'+experiment.experiment_id, misfire_grace_time=MISFIRE_GRACE_TIME, replace_existing=True)
+
+    def _add_stop_job(self, experiment: ScheduledExperiment, run_date):
+        self._scheduler.add_job(self._stop_agents, trigger='date', run_date=run_date, args=[experiment.agents, experiment.experiment_id],
+                                id='stop_'+experiment.experiment_id, misfire_grace_time=MISFIRE_GRACE_TIME, replace_existing=True)
+
+    def _parse_time(self, timestamp: str) -> datetime:
+        """
+        Parse an ISO timestamp, naive timestamps are taken as UTC
+        """
+        parsed = datetime.fromisoformat(timestamp)
+        if parsed.tzinfo is None:
+            parsed = TIMEZONE.localize(parsed)
+        return parsed
+
+    def _planned_time(self, experiment_id: str, phase: str) -> Optional[datetime]:
+        """
+        Time the job of the phase was due, None if the experiment is not scheduled
+        """
+        experiment = self._scheduled_experiments.get(experiment_id)
+        if experiment is None:
+            return None
+        start_time = self._parse_time(experiment.start_time)
+        if phase == "start":
+            return start_time - timedelta(seconds=experiment.warmup_lead_time)
+        if phase == "release":
+            return start_time
+        return self._parse_time(experiment.stop_time)
+
+    def _begin_timing(self, experiment_id: str, phase: str) -> float:
+        """
+        Record when the job of a phase fired compared to when it was planned
+
+        Returns:
+            Monotonic time of firing, the later measurements of the phase are relative to it
+        """
+        fired_monotonic = time.monotonic()
+        fired = datetime.now(TIMEZONE)
+        planned = self._planned_time(experiment_id, phase)
+
+        if experiment_id not in self._experiment_timings:
+            self._experiment_timings[experiment_id] = {}
+            while len(self._experiment_timings) > MAX_TIMING_RECORDS:
+                self._experiment_timings.popitem(last=False)
+        self._experiment_timings[experiment_id][phase] = {
+            "planned": planned.isoformat() if planned else None,
+            "fired": fired.isoformat(),
+            "fire_delay": (fired - planned).total_seconds() if planned else None
+        }
+        return fired_monotonic
+
+    def _record_timing(self, experiment_id: str, phase: str, **fields):
+        """
+        Add measurements to the timing record of a phase
+        """
+        self._experiment_timings.get(experiment_id, {}).get(phase, {}).update(fields)
+
     def _start_scheduler(self):
         """
         """
@@ -276,7 +938,10 @@ class Scheduler(Agent, MetadataMixin):
 
     def _start_agents(self, agents: List[str], experiment_id: str) -> bool:
         """
-        Loops trough the list of agents and starts them via RPC.
+        Starts all agents of the experiment in parallel via RPC.
+        If any agent fails to start, the agents that did start are stopped again.
+        Without a warmup, or if start_time already passed, the agents are released right away,
+        otherwise the go job releases them at start_time.
         
         Params:
             agents: List of agents to start
@@ -284,31 +949,83 @@ class Scheduler(Agent, MetadataMixin):
         Returns: 
             True on success, False otherwise
         """
-        start_successfull = True
-        for agent in agents:
-            result = False
-            try:
-                result = self._start_agent(agent)
-            except Exception as e:
-                _log.error(f"Error while trying to start agent {agent}: {e}")
-            
-            if result:
-                _log.debug(f"Started agent \"{agent}\" for experiment \"{experiment_id}\"")
+        fired = self._begin_timing(experiment_id, "start")
+        results = self._call_agents(self._start_agent, agents)
+        start_successfull = all(result["success"] for result in results.values())
+        self._record_timing(experiment_id, "start", completed_after=time.monotonic() - fired,
+                            agents={agent: {"success": result["success"], "returned_after": result["elapsed"]} for agent, result in results.items()})
+
+        for agent, result in results.items():
+            if result["success"]:
+                _log.debug(f"Started agent \"{agent}\" for experiment \"{experiment_id}\" after {result['elapsed']:.3f}s")
             else:
-                start_successfull = False
-                _log.debug(f"Failed to start agent \"{agent}\" for experiment \"{experiment_id}\", rc: {result}")
+                _log.debug(f"Failed to start agent \"{agent}\" for experiment \"{experiment_id}\": {result['error']}")
+        self.notify_agent_results(experiment_id, "start", results)
 
         if start_successfull:
-            self.notify_experiment_is_running(experiment_id)
-        # TODO: stop those agents that not failed from this list
+            self._mark_experiment_started(experiment_id)
+            experiment = self._scheduled_experiments.get(experiment_id)
+            if experiment is None or self._parse_time(experiment.start_time) <= datetime.now(TIMEZONE):
+                try:
+                    self._scheduler.remove_job('go_'+experiment_id)
+                except JobLookupError:
+                    pass
+                self._release_agents(agents, experiment_id)
+            else:
+                _log.info(f"Agents of experiment \"{experiment_id}\" are armed, go signal at {experiment.start_time}")
+                self.notify_experiment_timing(experiment_id)
         else:
+            started_agents = [agent for agent, result in results.items() if result["success"]]
+            if started_agents:
+                self._call_agents(self._stop_agent, started_agents)
+            # the agents are already stopped again, the go and stop jobs have nothing left to do
+            self._disarm_experiment(experiment_id)
+            experiment = self._forget_experiment(experiment_id)
             self.notify_experiment_is_failed(experiment_id)
+            self.notify_experiment_timing(experiment_id)
+            self._continue_series(experiment)
 
         return start_successfull
     
+    def _release_agents(self, agents: List[str], experiment_id: str) -> bool:
+        """
+        Publish the go signal for armed agents of the experiment and report the experiment as running.
+        Does nothing if the agents are not started yet or were already released.
+
+        Params:
+            agents: List of agents to release
+            experiment_id: Corresponding experiment ID
+        Returns:
+            True if the go signal was published, False otherwise
+        """
+        experiment = self._scheduled_experiments.get(experiment_id)
+        if experiment is not None and (not experiment.started or experiment.released):
+            _log.debug(f"Go signal for experiment \"{experiment_id}\" skipped (started: {experiment.started}, released: {experiment.released})")
+            return False
+
+        fired = self._begin_timing(experiment_id, "release")
+        message = {"experiment_id": experiment_id, "agents": agents}
+        if experiment is not None and experiment.parameters is not None:
+            message["parameters"] = experiment.parameters
+        headers = {"timestamp": datetime.now(TIMEZONE).isoformat()}
+        published = True
+        try:
+            self.vip.pubsub.publish(peer="pubsub", topic=self._go_signal_topic, headers=headers, message=message).get(timeout=2)
+            _log.info(f"Released agents of experiment \"{experiment_id}\"")
+        except Exception as e:
+            # agents that are not armed are already running, so the experiment is reported as running anyway
+            _log.error(f"Failed to publish go signal for experiment \"{experiment_id}\": {e}")
+            published = False
+
+        self._update_experiment(experiment_id, released=True)
+        acknowledged = self.notify_experiment_is_running(experiment_id)
+        self._record_timing(experiment_id, "release", acknowledged=bool(acknowledged), acknowledged_after=time.monotonic() - fired)
+        self.notify_experiment_timing(experiment_id)
+        return published
+
     def _stop_agents(self, agents: List[str], experiment_id: str) -> bool:
         """
-        Loops trough the list of agents and stops them via RPC
+        Stops all agents of the experiment in parallel via RPC
 
         Params:
             agents: List of agents to stop
@@ -316,43 +1033,123 @@ class Scheduler(Agent, MetadataMixin):
         Returns: 
             True on success, False otherwise
         """
-        stop_successfull = True
-        for agent in agents:
-            result = False
-            try:
-                result = self._stop_agent(agent)
-            except Exception as e:
-                _log.error(f"Error while trying to stop agent {agent}: {e}")
-            
-            if result:
-                _log.debug(f"Stoped agent \"{agent}\" for experiment \"{experiment_id}\"")
+        fired = self._begin_timing(experiment_id, "stop")
+        results = self._call_agents(self._stop_agent, agents)
+        stop_successfull = all(result["success"] for result in results.values())
+        self._record_timing(experiment_id, "stop", completed_after=time.monotonic() - fired,
+                            agents={agent: {"success": result["success"], "returned_after": result["elapsed"]} for agent, result in results.items()})
+
+        for agent, result in results.items():
+            if result["success"]:
+                _log.debug(f"Stoped agent \"{agent}\" for experiment \"{experiment_id}\" after {result['elapsed']:.3f}s")
             else:
-                _log.debug(f"Failed to stop agent \"{agent}\" for experiment \"{experiment_id}\"")
-                stop_successfull = False
+                _log.debug(f"Failed to stop agent \"{agent}\" for experiment \"{experiment_id}\": {result['error']}")
+        self.notify_agent_results(experiment_id, "stop", results)
 
+        experiment = self._forget_experiment(experiment_id)
         # TODO: notify user if stoping failed?
         if stop_successfull:
-            self.notify_experiment_is_finished(experiment_id)
+            acknowledged = self.notify_experiment_is_finished(experiment_id)
+            self._record_timing(experiment_id, "stop", acknowledged=bool(acknowledged), acknowledged_after=time.monotonic() - fired)
+        self.notify_experiment_timing(experiment_id)
+        self._continue_series(experiment)
 
         return stop_successfull
 
+    def _call_agents(self, call: Callable[[str], Any], agents: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run a start or stop call for every agent concurrently and join them with one common deadline,
+        so the agents of an experiment are switched within the same instant instead of one after another.
+
+        Params:
+            call: Function taking the agent identity, e.g. self._start_agent
+            agents: List of agent identities
+        Returns:
+            Dictionary keyed by agent with "success", "result", "error" and
+            "elapsed" (seconds from the common start until the call returned)
+        """
+        started = time.monotonic()
+        deadline = started + self._agent_join_timeout
+        greenlets = {agent: self.core.spawn(call, agent) for agent in dict.fromkeys(agents)}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for agent, greenlet in greenlets.items():
+            result, error = None, None
+            try:
+                result = greenlet.get(timeout=max(0, deadline - time.monotonic()))
+            except gevent.Timeout as to:
+                error = f"timed out: {to}"
+            except Exception as e:
+                error = str(e)
+            if error is None and not result:
+                error = f"rc: {result}"
+            results[agent] = {
+                "success": error is None,
+                "result": result if isinstance(result, (bool, int, float, str)) else str(result),
+                "error": error,
+                "elapsed": time.monotonic() - started
+            }
+        return results
+
 # -------- external calls --------
 
-    def _start_agent(self, agent: str):
+    def _start_agent(self, agent: str) -> bool:
+        """
+        Start an agent via the agent manager, runs inside its own greenlet from _call_agents
+
+        Returns:
+            True once the agent manager confirmed the start
+        Raises:
+            Exception if the agent could not be started or the RPC timed out
+        """
+        self.vip.rpc.call(self._agent_manager, "start_agent", agent).get(timeout=2)
+        return True
+
+    def _stop_agent(self, agent: str) -> bool:
+        """
+        Stop an agent via the agent manager, runs inside its own greenlet from _call_agents
+
+        Returns:
+            True once the agent manager confirmed the stop
+        Raises:
+            Exception if the agent could not be stopped or the RPC timed out
+        """
+        self.vip.rpc.call(self._agent_manager, "stop_agent", agent).get(timeout=2)
+        return True
+
+    def notify_agent_results(self, experiment_id: str, phase: str, results: Dict[str, Dict[str, Any]]) -> bool:
         """
+        Report the per agent results of starting or stopping an experiment to the experiment manager
+
+        Params:
+            experiment_id: Experiment ID string
+            phase: "start" or "stop"
+            results: Per agent results from _call_agents
+        Returns:
+            True on success, False on fail
         """
+
         try:
-            return self.core.spawn(self.vip.rpc.call, self._agent_manager, "start_agent", agent).get(timeout=2)
-        except:
-            raise
+            return self.vip.rpc.call(self._experiment_manager, "record_agent_results", experiment_id, phase, results).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
+            _log.warning(f"Failed to report agent results on {phase}, with error: {e}")
+            return False
 
-    def _stop_agent(self, agent: str):
+    def notify_experiment_timing(self, experiment_id: str) -> bool:
         """
+        Send the timing record of the experiment to the experiment manager, which persists it with the experiment
+
+        Params:
+            experiment_id: Experiment ID string
+        Returns:
+            True on success, False on fail
         """
+
         try:
-            return self.core.spawn(self.vip.rpc.call, self._agent_manager, "stop_agent", agent).get(timeout=2)
-        except:
-            raise
+            return self.vip.rpc.call(self._experiment_manager, "record_experiment_timing", experiment_id, self._experiment_timings.get(experiment_id, {})).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
+            _log.warning(f"Failed to report experiment timing, with error: {e}")
+            return False
 
     def notify_experiment_is_running(self, experiment_id: str) -> bool:
         """
@@ -365,8 +1162,8 @@ class Scheduler(Agent, MetadataMixin):
         """
         
         try:
-            return self.core.spawn(self.vip.rpc.call, self._experiment_manager, "experiment_is_running", experiment_id).get(timeout=2)
-        except Exception as e:
+            return self.vip.rpc.call(self._experiment_manager, "experiment_is_running", experiment_id).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
             _log.warning(f"Failed to notify on start, with error: {e}")
             return False
 
@@ -381,11 +1178,27 @@ class Scheduler(Agent, MetadataMixin):
         """
 
         try:
-            return self.core.spawn(self.vip.rpc.call, self._experiment_manager, "experiment_is_finished", experiment_id).get(timeout=2)
-        except Exception as e:
+            return self.vip.rpc.call(self._experiment_manager, "experiment_is_finished", experiment_id).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
             _log.warning(f"Failed to notify on finish, with error: {e}")
             return False
 
+    def notify_experiment_is_canceled(self, experiment_id: str) -> bool:
+        """
+        Notify the experiment manager that the experiment is canceled
+
+        Params:
+            experiment_id: Experiment ID string
+        Returns:
+            True on success, False on fail
+        """
+
+        try:
+            return self.vip.rpc.call(self._experiment_manager, "cancel_experiment", experiment_id).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
+            _log.warning(f"Failed to notify on cancel, with error: {e}")
+            return False
+
     def notify_experiment_is_failed(self, experiment_id: str) -> bool:
         """
         Notify the experiment manager that the experiment is failed
@@ -397,8 +1210,8 @@ class Scheduler(Agent, MetadataMixin):
         """
 
         try:
-            return self.core.spawn(self.vip.rpc.call, self._experiment_manager, "experiment_is_failed", experiment_id).get(timeout=2)
-        except Exception as e:
+            return self.vip.rpc.call(self._experiment_manager, "experiment_is_failed", experiment_id).get(timeout=2)
+        except (Exception, gevent.Timeout) as e:
             _log.warning(f"Failed to notify on fail, with error: {e}")
             return False
         
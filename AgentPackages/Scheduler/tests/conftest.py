@@ -31,8 +31,10 @@ def temp_experiments_file():
         f.write("[]")  # <-- ensures valid JSON structure from the start
 
     yield path
-    if os.path.exists(path):
-        os.remove(path)
+    series_path = os.path.splitext(path)[0] + "_series.json"
+    for file_path in [path, series_path]:
+        if os.path.exists(file_path):
+            os.remove(file_path)
 
 
 @pytest.fixture
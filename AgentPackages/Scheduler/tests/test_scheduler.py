@@ -1,9 +1,10 @@
 import pytest
+import gevent
 import json
 import os 
-from scheduler.agent import ScheduledExperiment, Scheduler
+from scheduler.agent import ScheduledExperiment, Scheduler, _crontab_day_of_week
 from pydantic import BaseModel, ValidationError
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import tests.conftest as con
 from apscheduler.schedulers.base import STATE_STOPPED
 from unittest.mock import patch, MagicMock
@@ -29,6 +30,255 @@ class TestSubmitSchedule:
         jobs = scheduler._scheduler.get_jobs()
         assert len(jobs) > 0
 
+#------------------- Submiting batches of Schedules --------------------
+def _batch(count: int, agents=("agent1",), gap_minutes: int = 10) -> list:
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    return [{
+        "experiment_id": f"batch_{i}",
+        "start_time": (start + timedelta(minutes=gap_minutes * i)).isoformat(),
+        "stop_time": (start + timedelta(minutes=gap_minutes * i + 5)).isoformat(),
+        "agents": list(agents)
+    } for i in range(count)]
+
+class TestSubmitSchedules:
+    def test_submit_batch_success(self, scheduler: Scheduler):
+        batch = _batch(50)
+        with patch.object(scheduler, "_save_scheduled_experiments", wraps=scheduler._save_scheduled_experiments) as mock_save:
+            assert scheduler.submit_experiment_schedules(batch)
+
+        assert len(scheduler._scheduler.get_jobs()) == 100
+        assert len(scheduler._scheduled_experiments) == 50
+        mock_save.assert_called_once()
+
+    def test_submit_batch_invalid_entry_schedules_nothing(self, scheduler: Scheduler):
+        batch = _batch(3)
+        batch[2]["stop_time"] = batch[2]["start_time"]
+        with pytest.raises(RuntimeError, match="#2"):
+            scheduler.submit_experiment_schedules(batch)
+        assert scheduler._scheduler.get_jobs() == []
+        assert scheduler._scheduled_experiments == {}
+
+    def test_submit_batch_conflicts(self, scheduler: Scheduler, experiment_data: dict):
+        # overlapping windows of the same agent
+        overlapping = _batch(3, gap_minutes=3)
+        with pytest.raises(RuntimeError, match="agent1"):
+            scheduler.submit_experiment_schedules(overlapping)
+
+        # the warmup counts into the window of an experiment
+        warmup = _batch(2, gap_minutes=6)
+        warmup[1]["warmup_lead_time"] = 120
+        with pytest.raises(RuntimeError, match="same time"):
+            scheduler.submit_experiment_schedules(warmup)
+
+        # different agents may overlap
+        assert scheduler.submit_experiment_schedules(_batch(1, agents=("agent1",)) + [{**_batch(1, agents=("agent2",))[0], "experiment_id": "other"}])
+
+        # duplicate IDs inside the batch and against existing schedules
+        with pytest.raises(RuntimeError, match="twice"):
+            scheduler.submit_experiment_schedules([experiment_data, experiment_data])
+        with pytest.raises(RuntimeError, match="already scheduled"):
+            scheduler.submit_experiment_schedules(_batch(1))
+
+        assert set(scheduler._scheduled_experiments) == {"batch_0", "other"}
+
+    def test_submit_batch_rolls_back_armed_jobs(self, scheduler: Scheduler):
+        batch = _batch(3)
+        original_add = scheduler._add_stop_job
+
+        def failing_add(experiment, run_date):
+            if experiment.experiment_id == "batch_2":
+                raise RuntimeError("job store failure")
+            original_add(experiment, run_date)
+
+        with patch.object(scheduler, "_add_stop_job", side_effect=failing_add):
+            with pytest.raises(RuntimeError, match="job store failure"):
+                scheduler.submit_experiment_schedules(batch)
+        assert scheduler._scheduler.get_jobs() == []
+        assert scheduler._scheduled_experiments == {}
+
+#------------------- Recurring and sweep Schedules --------------------
+def _series(**overrides) -> dict:
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=1)
+    return {
+        "series_id": "campaign",
+        "agents": ["agent1"],
+        "duration_seconds": 600,
+        "interval_seconds": 3600,
+        "start_time": start.isoformat(),
+        **overrides
+    }
+
+class TestSeries:
+    def test_series_schedules_only_next_run(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        assert scheduler.submit_experiment_series(_series(max_runs=1000))
+
+        assert set(scheduler._scheduled_experiments) == {"campaign_run0"}
+        assert {job.id for job in scheduler._scheduler.get_jobs()} == {"start_campaign_run0", "stop_campaign_run0"}
+        run = scheduler._scheduled_experiments["campaign_run0"]
+        assert run.series_id == "campaign"
+        assert datetime.fromisoformat(run.stop_time) - datetime.fromisoformat(run.start_time) == timedelta(seconds=600)
+
+        # finishing a run acknowledges it first, the next occurrence is searched by its own job
+        with patch.object(scheduler, "_stop_agent", return_value=True), \
+            patch.object(scheduler, "notify_agent_results"), \
+            patch.object(scheduler, "notify_experiment_is_finished") as mock_finished, \
+            patch.object(scheduler, "notify_experiment_timing"), \
+            patch.object(scheduler, "_schedule_next_series_run", wraps=scheduler._schedule_next_series_run) as mock_search:
+            scheduler._stop_agents(run.agents, "campaign_run0")
+            mock_finished.assert_called_once_with("campaign_run0")
+            mock_search.assert_not_called()
+
+        job = scheduler._scheduler.get_job("series_campaign")
+        job.func(*job.args)
+        assert set(scheduler._scheduled_experiments) == {"campaign_run1"}
+        next_run = scheduler._scheduled_experiments["campaign_run1"]
+        assert datetime.fromisoformat(next_run.start_time) - datetime.fromisoformat(run.start_time) == timedelta(hours=1)
+        assert scheduler.get_experiment_series("campaign")["next_run_index"] == 2
+
+    def test_sweep_parameters_and_completion(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        sweep = {"einschaltpunkt": [30, 40], "ausschaltpunkt": [60, 70, 80]}
+        scheduler.submit_experiment_series(_series(sweep=sweep))
+        series = scheduler._scheduled_series["campaign"]
+
+        assert series.total_runs() == 6
+        combinations = [series.run_parameters(i) for i in range(6)]
+        assert combinations[0] == {"einschaltpunkt": 30, "ausschaltpunkt": 60}
+        assert combinations[1] == {"einschaltpunkt": 30, "ausschaltpunkt": 70}
+        assert combinations[5] == {"einschaltpunkt": 40, "ausschaltpunkt": 80}
+        assert scheduler._scheduled_experiments["campaign_run0"].parameters == combinations[0]
+
+        # the parameters are sent with the go signal
+        scheduler._mark_experiment_started("campaign_run0")
+        with patch.object(scheduler, "notify_experiment_is_running"), patch.object(scheduler, "notify_experiment_timing"):
+            scheduler._release_agents(["agent1"], "campaign_run0")
+        assert scheduler.vip.pubsub.publish.call_args.kwargs["message"]["parameters"] == combinations[0]
+
+        # the series is removed after the last combination
+        for index in range(6):
+            scheduler._continue_series(scheduler._forget_experiment(f"campaign_run{index}"))
+            scheduler._search_next_series_run("campaign")
+        assert "campaign" not in scheduler._scheduled_series
+        assert scheduler._scheduled_experiments == {}
+
+    def test_series_skips_reserved_occurrences(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        definition = _series(plants=["bhkw"])
+        first = datetime.fromisoformat(definition["start_time"])
+        # the plants are reserved during the first two occurrences
+        free = {"start_time": (first + timedelta(hours=1, minutes=30)).isoformat(), "stop_time": ""}
+        scheduler.vip.rpc.call.return_value.get.side_effect = [free, {"start_time": (first + timedelta(hours=2)).isoformat(), "stop_time": ""}, True]
+
+        scheduler.submit_experiment_series(definition)
+
+        run = scheduler._scheduled_experiments["campaign_run0"]
+        assert datetime.fromisoformat(run.start_time) == first + timedelta(hours=2)
+        assert scheduler.get_experiment_series("campaign")["skipped_occurrences"] == 1
+        args = scheduler.vip.rpc.call.call_args_list[0].args
+        assert args[1:] == ("find_next_free_slot", ["bhkw"], 600.0, first.isoformat())
+
+    def test_series_runs_are_registered(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        definition = _series(plants=["bhkw"], description="Impulse campaign")
+        first = datetime.fromisoformat(definition["start_time"])
+        free = {"start_time": first.isoformat(), "stop_time": ""}
+        # the first occurrence is reserved between the slot search and the registration
+        scheduler.vip.rpc.call.return_value.get.side_effect = [free, False, {"start_time": (first + timedelta(hours=1)).isoformat(), "stop_time": ""}, True]
+
+        scheduler.submit_experiment_series(definition)
+
+        run = scheduler._scheduled_experiments["campaign_run0"]
+        assert datetime.fromisoformat(run.start_time) == first + timedelta(hours=1)
+        registrations = [call.args for call in scheduler.vip.rpc.call.call_args_list if call.args[1] == "register_series_run"]
+        assert len(registrations) == 2
+        assert registrations[1][2] == {
+            "experiment_id": "campaign_run0",
+            "experimenter": "scheduler",
+            "description": "Impulse campaign (Run 0 of series \"campaign\")",
+            "start_time": run.start_time,
+            "stop_time": run.stop_time,
+            "plants": ["bhkw"],
+            "agents": ["agent1"]
+        }
+
+        # a pending run releases its registration when the series is removed
+        scheduler.vip.rpc.call.return_value.get.side_effect = None
+        with patch.object(scheduler, "notify_experiment_is_canceled") as mock_cancel:
+            scheduler.remove_experiment_series("campaign")
+        mock_cancel.assert_called_once_with("campaign_run0")
+
+    @pytest.mark.parametrize("error", [RuntimeError("unreachable"), gevent.Timeout(2)])
+    def test_series_registration_failure_is_retried(self, scheduler: Scheduler, error):
+        scheduler._scheduler.pause()
+        scheduler.vip.rpc.call.return_value.get.side_effect = error
+        scheduler.submit_experiment_series(_series())
+
+        assert scheduler._scheduled_experiments == {}
+        assert scheduler._scheduler.get_job("series_campaign") is not None
+
+    def test_series_search_failure_is_retried(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        scheduler.submit_experiment_series(_series(max_runs=3))
+        experiment = scheduler._forget_experiment("campaign_run0")
+
+        with patch.object(scheduler, "_schedule_next_series_run", side_effect=RuntimeError("boom")):
+            scheduler._continue_series(experiment)
+            job = scheduler._scheduler.get_job("series_campaign")
+            job.func(*job.args)
+
+        retry = scheduler._scheduler.get_job("series_campaign")
+        assert retry.next_run_time > datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert scheduler._scheduled_experiments == {}
+
+    def test_series_validation_and_removal(self, scheduler: Scheduler):
+        with pytest.raises(RuntimeError):
+            scheduler.submit_experiment_series(_series(cron="0 8 * * *"))
+        with pytest.raises(RuntimeError):
+            scheduler.submit_experiment_series(_series(interval_seconds=None, cron="0 8 *"))
+
+        scheduler._scheduler.pause()
+        assert scheduler.submit_experiment_series(_series(interval_seconds=None, cron="0 8 * * mon-fri"))
+        run = scheduler._scheduled_experiments["campaign_run0"]
+        start = datetime.fromisoformat(run.start_time)
+        assert start.hour == 8 and start.weekday() < 5
+        with pytest.raises(RuntimeError, match="already scheduled"):
+            scheduler.submit_experiment_series(_series())
+
+        assert scheduler.remove_experiment_series("campaign")
+        assert scheduler._scheduled_experiments == {}
+        assert scheduler._scheduler.get_jobs() == []
+        with pytest.raises(ValueError):
+            scheduler.get_experiment_series("campaign")
+
+    def test_series_cron_day_of_week_follows_crontab(self, scheduler: Scheduler):
+        assert _crontab_day_of_week("0") == "sun"
+        assert _crontab_day_of_week("7") == "sun"
+        assert _crontab_day_of_week("0-2,5") == "sun,mon,tue,fri"
+        assert _crontab_day_of_week("*/2") == "sun,tue,thu,sat"
+        assert _crontab_day_of_week("mon-fri") == "mon-fri"
+        assert _crontab_day_of_week("*") == "*"
+        with pytest.raises(ValueError):
+            _crontab_day_of_week("8")
+
+        scheduler._scheduler.pause()
+        assert scheduler.submit_experiment_series(_series(interval_seconds=None, cron="0 8 * * 0"))
+        start = datetime.fromisoformat(scheduler._scheduled_experiments["campaign_run0"].start_time)
+        assert start.weekday() == 6
+
+    def test_series_persistence(self, scheduler: Scheduler):
+        scheduler._scheduler.pause()
+        scheduler.submit_experiment_series(_series(max_runs=3))
+
+        restarted = Scheduler({con.FILEPATHNAME: scheduler._scheduled_experiments_filepath})
+        restarted._start_scheduler()
+        restarted._load_scheduled_experiments()
+        restarted._load_scheduled_series()
+
+        assert set(restarted._scheduled_experiments) == {"campaign_run0"}
+        assert restarted.get_experiment_series("campaign")["active_run_id"] == "campaign_run0"
+        assert {job.id for job in restarted._scheduler.get_jobs()} == {"start_campaign_run0", "stop_campaign_run0"}
+
 #------------------- Removing Schedules --------------------
 class TestRemoveSchedule:
     def test_remove_experiment_schedule_success(self, scheduler: Scheduler, experiment_data: dict):
@@ -98,6 +348,187 @@ class TestStartAgents:
             mock_running.assert_not_called()
             mock_failed.assert_called_once_with(exp_id)
 
+    def test_start_agents_rolls_back_and_reports(self, scheduler: Scheduler):
+        agents = ["agent1", "agent2", "agent3"]
+        exp_id = "testexp"
+
+        def mock_start(agent):
+            if agent == "agent3":
+                raise Exception("not installed")
+            return True
+
+        with patch.object(scheduler, "_start_agent", side_effect=mock_start), \
+            patch.object(scheduler, "_stop_agent", return_value=True) as mock_stop, \
+            patch.object(scheduler, "notify_agent_results") as mock_results, \
+            patch.object(scheduler, "notify_experiment_is_running") as mock_running, \
+            patch.object(scheduler, "notify_experiment_is_failed") as mock_failed:
+
+            assert scheduler._start_agents(agents, exp_id) is False
+            # the started agents are stopped again
+            assert sorted(c.args[0] for c in mock_stop.call_args_list) == ["agent1", "agent2"]
+            mock_running.assert_not_called()
+            mock_failed.assert_called_once_with(exp_id)
+
+            reported_id, phase, results = mock_results.call_args.args
+            assert (reported_id, phase) == (exp_id, "start")
+            assert results["agent1"]["success"] and results["agent2"]["success"]
+            assert not results["agent3"]["success"]
+            assert results["agent3"]["error"] == "not installed"
+
+    def test_start_agents_in_parallel(self, scheduler: Scheduler, monkeypatch):
+        # use real greenlets instead of the synchronous spawn
+        import gevent, time
+        monkeypatch.setattr("volttron.platform.vip.agent.core.ZMQCore.spawn", lambda self, func, *args, **kwargs: gevent.spawn(func, *args, **kwargs))
+        scheduler._agent_join_timeout = 0.5
+
+        def slow_start(agent):
+            gevent.sleep(10 if agent == "stuck" else 0.2)
+            return True
+
+        with patch.object(scheduler, "_start_agent", side_effect=slow_start), \
+            patch.object(scheduler, "_stop_agent", return_value=True), \
+            patch.object(scheduler, "notify_agent_results") as mock_results, \
+            patch.object(scheduler, "notify_experiment_is_running") as mock_running, \
+            patch.object(scheduler, "notify_experiment_is_failed"):
+
+            started = time.monotonic()
+            assert scheduler._start_agents([f"agent{i}" for i in range(5)], "testexp") is True
+            # five agents take as long as one
+            assert time.monotonic() - started < 0.4
+            mock_running.assert_called_once_with("testexp")
+
+            # an agent that does not answer fails once the join deadline passed
+            started = time.monotonic()
+            assert scheduler._start_agents(["agent1", "stuck"], "testexp") is False
+            assert time.monotonic() - started < 1
+            results = mock_results.call_args.args[2]
+            assert results["agent1"]["success"]
+            assert "timed out" in results["stuck"]["error"]
+
+#------------------- Warmup and go signal --------------------
+class TestWarmup:
+    def test_submit_with_warmup_arms_go_job(self, scheduler: Scheduler, experiment_data: dict):
+        experiment_data["warmup_lead_time"] = 30
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        start_time = datetime.fromisoformat(experiment_data["start_time"])
+        assert scheduler._scheduler.get_job("start_testexp").next_run_time == start_time - timedelta(seconds=30)
+        assert scheduler._scheduler.get_job("go_testexp").next_run_time == start_time
+
+        scheduler.remove_experiment_schedule(experiment_data)
+        assert scheduler._scheduler.get_jobs() == []
+
+    def test_armed_agents_released_at_go(self, scheduler: Scheduler, experiment_data: dict):
+        experiment_data["warmup_lead_time"] = 30
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        with patch.object(scheduler, "_start_agent", return_value=True), \
+            patch.object(scheduler, "notify_agent_results"), \
+            patch.object(scheduler, "notify_experiment_is_running") as mock_running:
+            assert scheduler._start_agents(experiment_data["agents"], "testexp")
+
+            # started ahead of time, but not released yet
+            assert scheduler._scheduled_experiments["testexp"].started
+            assert not scheduler._scheduled_experiments["testexp"].released
+            scheduler.vip.pubsub.publish.assert_not_called()
+            mock_running.assert_not_called()
+
+            assert scheduler._release_agents(experiment_data["agents"], "testexp")
+            # a second go signal is ignored
+            assert not scheduler._release_agents(experiment_data["agents"], "testexp")
+
+        scheduler.vip.pubsub.publish.assert_called_once()
+        kwargs = scheduler.vip.pubsub.publish.call_args.kwargs
+        assert kwargs["topic"] == "experiments/go"
+        assert kwargs["message"] == {"experiment_id": "testexp", "agents": experiment_data["agents"]}
+        mock_running.assert_called_once_with("testexp")
+        assert scheduler._scheduled_experiments["testexp"].released
+
+    def test_go_before_start_is_ignored(self, scheduler: Scheduler, experiment_data: dict):
+        experiment_data["warmup_lead_time"] = 30
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        with patch.object(scheduler, "notify_experiment_is_running") as mock_running:
+            assert not scheduler._release_agents(experiment_data["agents"], "testexp")
+        mock_running.assert_not_called()
+
+#------------------- Experiment manager notifications --------------------
+class TestNotifications:
+    def test_agent_results_wait_for_the_reply(self, scheduler: Scheduler):
+        results = {"agent1": {"success": True}}
+        scheduler.vip.rpc.call.return_value.get.return_value = True
+        assert scheduler.notify_agent_results("testexp", "start", results) is True
+        scheduler.vip.rpc.call.assert_called_with(scheduler._experiment_manager, "record_agent_results", "testexp", "start", results)
+
+        # a refused record is reported instead of passing as an unresolved result
+        scheduler.vip.rpc.call.return_value.get.side_effect = ValueError("Experiment ID not found.")
+        assert scheduler.notify_agent_results("testexp", "start", results) is False
+
+#------------------- Timing records --------------------
+class TestTiming:
+    def test_timing_recorded_for_all_phases(self, scheduler: Scheduler, experiment_data: dict):
+        now = datetime.now(timezone.utc)
+        experiment_data["start_time"] = (now - timedelta(seconds=1)).isoformat()
+        experiment_data["stop_time"] = (now + timedelta(hours=1)).isoformat()
+        scheduler._scheduler.pause()
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        with patch.object(scheduler, "_start_agent", return_value=True), \
+            patch.object(scheduler, "_stop_agent", return_value=True), \
+            patch.object(scheduler, "notify_agent_results"), \
+            patch.object(scheduler, "notify_experiment_is_running", return_value=True), \
+            patch.object(scheduler, "notify_experiment_is_finished", return_value=False), \
+            patch.object(scheduler, "notify_experiment_timing") as mock_timing:
+            scheduler._start_agents(experiment_data["agents"], "testexp")
+            scheduler._stop_agents(experiment_data["agents"], "testexp")
+
+        timing = scheduler.get_experiment_timing("testexp")
+        assert set(timing) == {"start", "release", "stop"}
+        assert timing["start"]["planned"] == datetime.fromisoformat(experiment_data["start_time"]).isoformat()
+        assert timing["start"]["fire_delay"] >= 1
+        assert set(timing["start"]["agents"]) == {"agent1", "agent2"}
+        assert all(agent["success"] for agent in timing["start"]["agents"].values())
+        assert timing["start"]["completed_after"] >= max(a["returned_after"] for a in timing["start"]["agents"].values()) >= 0
+        assert timing["release"]["acknowledged"] is True
+        assert timing["release"]["acknowledged_after"] >= 0
+        # a manual stop an hour early shows up as negative delay, the finish was not acknowledged
+        assert timing["stop"]["fire_delay"] < 0
+        assert timing["stop"]["acknowledged"] is False
+        mock_timing.assert_called_with("testexp")
+
+        with pytest.raises(ValueError):
+            scheduler.get_experiment_timing("unknown")
+
+    def test_timing_records_failed_acknowledgement(self, scheduler: Scheduler, experiment_data: dict):
+        now = datetime.now(timezone.utc)
+        experiment_data["start_time"] = (now - timedelta(seconds=1)).isoformat()
+        experiment_data["stop_time"] = (now + timedelta(hours=1)).isoformat()
+        scheduler._scheduler.pause()
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        def call(peer, method, *args):
+            result = MagicMock()
+            if method == "experiment_is_running":
+                result.get.side_effect = gevent.Timeout(2)
+            elif method == "experiment_is_finished":
+                result.get.side_effect = RuntimeError("Can't trigger event finish from state canceled!")
+            else:
+                result.get.return_value = True
+            return result
+        scheduler.vip.rpc.call.side_effect = call
+
+        with patch.object(scheduler, "_start_agent", return_value=True), \
+            patch.object(scheduler, "_stop_agent", return_value=True):
+            scheduler._start_agents(experiment_data["agents"], "testexp")
+            scheduler._stop_agents(experiment_data["agents"], "testexp")
+
+        timing = scheduler.get_experiment_timing("testexp")
+        assert timing["release"]["acknowledged"] is False
+        assert timing["stop"]["acknowledged"] is False
+        # the timing record itself is sent to the experiment manager and waited for
+        timing_calls = [c.args for c in scheduler.vip.rpc.call.call_args_list if c.args[1] == "record_experiment_timing"]
+        assert timing_calls and timing_calls[-1][2] == "testexp"
+
 #------------------- Stopping Agents --------------------
 class TestStopAgents:
     def test_stop_agents_success(self, scheduler: Scheduler):
@@ -151,23 +582,75 @@ class TestStopAgents:
 # TODO: export and import of scheduled jobs
 class TestPersisting:
 
-    def test_persistence_roundtrip(self, scheduler: Scheduler):
-        
-        tmp_filepath: str = scheduler._scheduled_experiments_filepath
+    def test_persistence_roundtrip(self, scheduler: Scheduler, experiment_data: dict):
 
-        # Add a dummy job
-        scheduler._scheduler.add_job(lambda: None, 'interval', seconds=60, id="job1")
-
-        # Save jobs
-        scheduler._save_scheduled_experiments()
-        assert os.path.exists(tmp_filepath)
-
-        # Clear jobs and reload
-        scheduler._scheduler.remove_all_jobs()
-        scheduler._load_scheduled_experiments()
-
-        jobs = scheduler._scheduler.get_jobs()
-        assert any(job.id == "job1" for job in jobs)
+        tmp_filepath: str = scheduler._scheduled_experiments_filepath
+        scheduler.submit_experiment_schedule(experiment_data)
+        with open(tmp_filepath, "r") as f:
+            content = json.load(f)
+        assert [item["experiment_id"] for item in content] == [experiment_data["experiment_id"]]
+
+        # A fresh agent re-arms both jobs from the file
+        restarted = Scheduler({con.FILEPATHNAME: tmp_filepath})
+        restarted._start_scheduler()
+        restarted._load_scheduled_experiments()
+
+        job_ids = {job.id for job in restarted._scheduler.get_jobs()}
+        assert job_ids == {"start_testexp", "stop_testexp"}
+        assert restarted._scheduler.get_job("start_testexp").args == (experiment_data["agents"], "testexp")
+
+        # Removing the schedule also removes it from the file
+        restarted.remove_experiment_schedule(experiment_data)
+        with open(tmp_filepath, "r") as f:
+            assert json.load(f) == []
+
+    def test_reload_started_experiment_only_arms_stop(self, scheduler: Scheduler, experiment_data: dict):
+        scheduler.submit_experiment_schedule(experiment_data)
+        scheduler._mark_experiment_started("testexp")
+
+        restarted = Scheduler({con.FILEPATHNAME: scheduler._scheduled_experiments_filepath})
+        restarted._start_scheduler()
+        restarted._load_scheduled_experiments()
+
+        assert {job.id for job in restarted._scheduler.get_jobs()} == {"stop_testexp"}
+        assert restarted._scheduled_experiments["testexp"].started
+
+    def test_reload_handles_misfires(self, scheduler: Scheduler, temp_experiments_file):
+        now = datetime.now(timezone.utc)
+        schedules = [
+            # start missed within the grace window, started right away
+            {"experiment_id": "late", "start_time": (now - timedelta(seconds=20)).isoformat(),
+             "stop_time": (now + timedelta(hours=1)).isoformat(), "agents": ["agent1"]},
+            # start missed by more than the grace window, reported as failed
+            {"experiment_id": "missed", "start_time": (now - timedelta(minutes=10)).isoformat(),
+             "stop_time": (now + timedelta(hours=1)).isoformat(), "agents": ["agent2"]},
+            # running experiment whose stop passed while the agent was down, stopped right away
+            {"experiment_id": "overdue", "start_time": (now - timedelta(hours=2)).isoformat(),
+             "stop_time": (now - timedelta(hours=1)).isoformat(), "agents": ["agent3"], "started": True},
+        ]
+        with open(temp_experiments_file, "w") as f:
+            json.dump(schedules, f)
+
+        scheduler._scheduler.pause()
+        with patch.object(scheduler, "notify_experiment_is_failed") as mock_failed:
+            scheduler._load_scheduled_experiments()
+
+        mock_failed.assert_called_once_with("missed")
+        assert set(scheduler._scheduled_experiments) == {"late", "overdue"}
+        assert {job.id for job in scheduler._scheduler.get_jobs()} == {"start_late", "stop_late", "stop_overdue"}
+        assert scheduler._scheduler.get_job("start_late").next_run_time >= now
+        assert scheduler._scheduler.get_job("stop_overdue").next_run_time <= datetime.now(timezone.utc)
+
+    def test_failed_start_drops_schedule(self, scheduler: Scheduler, experiment_data: dict):
+        scheduler.submit_experiment_schedule(experiment_data)
+
+        with patch.object(scheduler, "_start_agent", side_effect=RuntimeError("boom")), \
+            patch.object(scheduler, "notify_agent_results"), \
+            patch.object(scheduler, "notify_experiment_is_failed"):
+            assert not scheduler._start_agents(experiment_data["agents"], "testexp")
+
+        assert scheduler._scheduled_experiments == {}
+        assert scheduler._scheduler.get_job("stop_testexp") is None
 
 def _save_experiments_to_file(temp_experiments_file, experiment_data: dict):
     """
@@ -67,6 +67,8 @@ def topic_registry(sample_registry):
     # to avoid hardcoding this step you could mock the Agent via volttron testing    
     agent._load_plants_topics_data()
     agent._flatten_dict()
+    agent._build_snapshots()
+    agent._build_text_index()
     
     yield agent
     # Cleanup afterwards if needed
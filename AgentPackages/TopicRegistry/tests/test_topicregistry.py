@@ -1,5 +1,7 @@
+import json
 import pytest
-from topicregistry.agent import TopicRegistry, TopicDefinition
+from unittest.mock import patch
+from topicregistry.agent import TopicRegistry, TopicDefinition, TopicPattern
 
 # ---------------- Config load ----------------
 class TestPersistenceAndConfig:
@@ -211,6 +213,27 @@ class TestSearchTopics:
                 or "sensor" in str(value.get("meta"))
     
 
+    def test_str_match_prefix_and_case(self, topic_registry):
+
+        # prefix of a metadata word, case insensitive
+        result = topic_registry.search_topics(text_info_match="PUM")
+        assert set(result.keys()) == {"internal/command/one"}
+
+        # all words have to match
+        result = topic_registry.search_topics(text_info_match="pump three")
+        assert set(result.keys()) == set()
+
+    def test_str_match_ranking(self, topic_registry):
+
+        # matches in the internal topic name rank before matches in the external topic name
+        topic_registry._text_index.build({
+            "internal/a": {"internal": ["internal/a"], "external": ["ext/a"], "meta": ["valve"]},
+            "internal/valve": {"internal": ["internal/valve"], "external": ["ext/b"], "meta": []},
+            "internal/c": {"internal": ["internal/c"], "external": ["ext/valve"], "meta": []},
+        })
+        scores = topic_registry._text_index.search("valve")
+        assert list(scores.keys()) == ["internal/valve", "internal/c", "internal/a"]
+
     def test_multiple_match_cases(self, topic_registry):
 
         # little more interesting
@@ -291,6 +314,42 @@ class TestMappings:
         result = topic_registry.get_unvalidated_to_validated_commands_map(plant_name_list_match=["PlantB"])
         assert result == correct_int_to_ext_mapping
 
+        result = topic_registry.get_unvalidated_to_validated_commands_map(plant_name_list_match=["PlantA", "PlantB", "PlantX"])
+        assert result == {
+            "internal/command/one": "internal/command/true1",
+            "internal/command/three": "internal/command/false1"
+        }
+
+
+    def test_get_unvalidated_to_rate_limit_map(self, sample_registry):
+        sample_registry["Plants topics data"]["PlantA"]["internal/command/one"]["rate_limit"] = {"interval": 2}
+        agent = TopicRegistry(sample_registry)
+        agent._load_plants_topics_data()
+        agent._flatten_dict()
+        agent._build_snapshots()
+
+        result = agent.get_unvalidated_to_rate_limit_map()
+        assert result == {"internal/command/one": {"interval": 2.0, "burst": 1, "coalesce": True}}
+        assert agent.get_unvalidated_to_rate_limit_map(plant_name_list_match=["PlantB"]) == {}
+
+
+    def test_get_unvalidated_to_validation_rule_map_is_json_ready(self, sample_registry):
+        sample_registry["Plants topics data"]["PlantA"]["internal/command/one"]["validation"] = [
+            {"validation_type": "range", "min_value": 0, "max_value": 100}
+        ]
+        agent = TopicRegistry(sample_registry)
+        agent._load_plants_topics_data()
+        agent._flatten_dict()
+        agent._build_snapshots()
+
+        result = agent.get_unvalidated_to_validation_rule_map()
+        assert set(result.keys()) == {"internal/command/one"}
+        assert result["internal/command/one"][0]["validation_type"] == "range"
+        json.dumps(result)
+
+        result = agent.search_topics(internal_topics_list_match=["internal/command/one"])
+        json.dumps(result)
+
 
 
 
@@ -330,4 +389,129 @@ class TestTopicInfo:
         """
         result = topic_registry.search_topics(external_topics_list_match=["external/command/x"])
         for key, value in result.items():
-            assert value.get("meta") == None
\ No newline at end of file
+            assert value.get("meta") == None
+
+# ---------------- Topic patterns ----------------
+@pytest.fixture
+def pattern_registry(sample_registry):
+    sample_registry["Plants topics data"]["Speicher"] = {
+        "speicher/{n}/temperatur/{layer}": {
+            "type": "sensor",
+            "topics": {
+                "external": "raw/speicher/{n}/temperatur/{layer}"
+            },
+            "meta": {"unit": "Grad Celsius"},
+            "parameters": {
+                "n": {"min": 1, "max": 4},
+                "layer": ["oben", "mitte", "unten"]
+            }
+        },
+        "command/speicher/{n}/ventil": {
+            "type": "command",
+            "topics": {
+                "external": "raw/speicher/{n}/ventil/set",
+                "validated": "validated/speicher/{n}/ventil",
+                "feedback": "feedback/speicher/{n}/ventil"
+            },
+            "validation": [{"validation_type": "enum", "allowed_values": ["auf", "zu"]}],
+            "parameters": {
+                "n": [1, 2]
+            }
+        }
+    }
+    agent = TopicRegistry(sample_registry)
+    agent._load_plants_topics_data()
+    agent._flatten_dict()
+    agent._build_snapshots()
+    agent._build_text_index()
+    return agent
+
+class TestTopicPatterns:
+    def test_patterns_are_not_materialized(self, pattern_registry):
+        assert len(pattern_registry._topic_patterns) == 2
+        assert "Speicher" not in {entry.get("plant_name") for entry in pattern_registry._flattened_topics_data}
+        assert pattern_registry._topic_patterns[0].size() == 12
+
+    def test_resolve_internal_and_external_topic(self, pattern_registry):
+        result = pattern_registry.search_topics(internal_topics_list_match=["speicher/3/temperatur/mitte"])
+        assert result == {
+            "speicher/3/temperatur/mitte": {
+                "plant_name": "Speicher",
+                "type": "sensor",
+                "external_topic": "raw/speicher/3/temperatur/mitte",
+                "meta": {"unit": "Grad Celsius"},
+                "pattern": "speicher/{n}/temperatur/{layer}"
+            }
+        }
+
+        result = pattern_registry.search_topics(external_topics_list_match=["raw/speicher/2/ventil/set"])
+        assert set(result.keys()) == {"command/speicher/2/ventil"}
+        assert result["command/speicher/2/ventil"]["validated_topic"] == "validated/speicher/2/ventil"
+        assert result["command/speicher/2/ventil"]["validation"][0]["allowed_values"] == ["auf", "zu"]
+
+    def test_resolve_out_of_range(self, pattern_registry):
+        assert pattern_registry.search_topics(internal_topics_list_match=["speicher/5/temperatur/mitte"]) == {}
+        assert pattern_registry.search_topics(internal_topics_list_match=["speicher/1/temperatur/boden"]) == {}
+        assert pattern_registry.search_topics(external_topics_list_match=["raw/speicher/3/ventil/set"]) == {}
+
+    def test_expand_on_listing(self, pattern_registry):
+        result = pattern_registry.get_list_of_internal_topics(plant_name_list_match=["Speicher"], topic_type_list_match=["sensor"])
+        assert len(result) == 12
+        assert "speicher/4/temperatur/unten" in result
+
+        mapping = pattern_registry.get_unvalidated_to_feedback_map(plant_name_list_match=["Speicher"])
+        assert mapping == {
+            "command/speicher/1/ventil": "feedback/speicher/1/ventil",
+            "command/speicher/2/ventil": "feedback/speicher/2/ventil"
+        }
+
+        mapping = pattern_registry.get_external_to_internal_noncommand_map()
+        assert mapping["external/topic/two"] == "internal/status/two"
+        assert mapping["raw/speicher/1/temperatur/oben"] == "speicher/1/temperatur/oben"
+
+    def test_resolve_rejects_non_canonical_numbers(self, pattern_registry):
+        assert pattern_registry.search_topics(internal_topics_list_match=["speicher/03/temperatur/mitte"]) == {}
+        assert pattern_registry.search_topics(internal_topics_list_match=["speicher/+3/temperatur/mitte"]) == {}
+
+    def test_mappings_do_not_expand_patterns_per_request(self, pattern_registry):
+        with patch.object(pattern_registry, "_search_patterns") as search_patterns:
+            mapping = pattern_registry.get_unvalidated_to_feedback_map(plant_name_list_match=["Speicher"])
+            assert mapping["command/speicher/2/ventil"] == "feedback/speicher/2/ventil"
+            search_patterns.assert_not_called()
+
+    def test_mapping_patterns_are_expanded_once_on_demand(self, sample_registry, pattern_registry):
+        with patch.object(TopicPattern, "expand", autospec=True, side_effect=TopicPattern.expand) as expand:
+            pattern_registry._build_snapshots()
+            # loading the config and requesting other plants does not expand the families
+            pattern_registry.get_unvalidated_to_feedback_map(plant_name_list_match=[next(iter(sample_registry["Plants topics data"]))])
+            expand.assert_not_called()
+
+            mapping = pattern_registry.get_external_to_internal_noncommand_map(plant_name_list_match=["Speicher"])
+            assert mapping["raw/speicher/4/temperatur/unten"] == "speicher/4/temperatur/unten"
+            assert expand.call_count == 2
+            pattern_registry.get_unvalidated_to_feedback_map(plant_name_list_match=["Speicher"])
+            mapping = pattern_registry.get_external_to_validated_commands_map()
+            assert mapping["raw/speicher/1/ventil/set"] == "validated/speicher/1/ventil"
+            assert expand.call_count == 2
+
+            # a reconfiguration drops the expanded families
+            pattern_registry._build_snapshots()
+            assert "raw/speicher/1/ventil/set" not in pattern_registry._all_plants_mappings["external_to_validated_commands"]
+            mapping = pattern_registry.get_external_to_validated_commands_map()
+            assert mapping["raw/speicher/1/ventil/set"] == "validated/speicher/1/ventil"
+            assert expand.call_count == 4
+
+    def test_text_match_on_pattern(self, pattern_registry):
+        result = pattern_registry.search_topics(text_info_match="temperatur")
+        assert len(result) == 12
+
+    def test_pattern_missing_parameters(self, sample_registry):
+        sample_registry["Plants topics data"]["Speicher"] = {
+            "speicher/{n}/temperatur": {
+                "type": "sensor",
+                "topics": {"external": "raw/speicher/{n}/temperatur"}
+            }
+        }
+        agent = TopicRegistry(sample_registry)
+        agent._load_plants_topics_data()
+        assert agent._topic_patterns == []
@@ -10,10 +10,14 @@ in a config file and exposed via RPC.
 __docformat__ = "reStructuredText"
 
 import logging
+import re
 import sys
+from copy import deepcopy
+from bisect import bisect_left
+from itertools import product
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Union, Iterator
 from pydantic import BaseModel, model_validator
 from validators.validators import ValidationRule, ValidationType
 import jmespath
@@ -25,11 +29,43 @@ _log = logging.getLogger(__name__)
 utils.setup_logging()
 __version__ = "0.1"
 
+class ParameterRange(BaseModel):
+    min: int
+    max: int
+    step: int = 1
+
+    @model_validator(mode="after")
+    def check_range(self) -> "ParameterRange":
+        if self.min > self.max:
+            raise ValueError("Parameter range requires 'min' <= 'max'.")
+        if self.step < 1:
+            raise ValueError("Parameter range requires 'step' >= 1.")
+        return self
+
+class RateLimit(BaseModel):
+    # token bucket: one token is refilled every interval seconds, up to burst tokens
+    interval: float
+    burst: int = 1
+    # coalesce commands exceeding the limit into the latest one instead of dropping them
+    coalesce: bool = True
+
+    @model_validator(mode="after")
+    def check_limit(self) -> "RateLimit":
+        if self.interval <= 0:
+            raise ValueError("Rate limit requires 'interval' > 0.")
+        if self.burst < 1:
+            raise ValueError("Rate limit requires 'burst' >= 1.")
+        return self
+
 class TopicDefinition(BaseModel):
     type: str
     topics: Dict[str, str]
     meta: Optional[Dict[str, Any]] = None
     validation: Optional[List[ValidationRule]] = None
+    # optional rate limit for command topics, enforced by the plant control agents
+    rate_limit: Optional[RateLimit] = None
+    # values for the placeholders of pattern topic definitions, either a list of values or a range
+    parameters: Optional[Dict[str, Union[ParameterRange, List[Union[int, str]]]]] = None
 
     @model_validator(mode="before")
     def validate_topic_dict(cls, values):
@@ -49,6 +85,299 @@ class TopicDefinition(BaseModel):
         
         return values
 
+_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+class TopicPattern:
+    """
+    A family of topics defined by one templated topic definition, like "speicher/{n}/temperatur/{layer}".
+    The concrete topics are never materialized up front, they are resolved by matching a topic against the templates
+    or expanded lazily when a full listing is requested.
+    """
+
+    def __init__(self, plant_name: str, internal_template: str, definition: TopicDefinition):
+        self.plant_name = plant_name
+        self.internal_template = internal_template
+        self.definition = definition
+        self.parameters = definition.parameters or {}
+
+        placeholders = set(_PLACEHOLDER_PATTERN.findall(internal_template))
+        missing = placeholders - set(self.parameters)
+        if missing:
+            raise ValueError(f"Pattern {internal_template} has no parameters defined for {sorted(missing)}")
+        unused = set(self.parameters) - placeholders
+        if unused:
+            raise ValueError(f"Parameters {sorted(unused)} are not used in pattern {internal_template}")
+        for field, template in definition.topics.items():
+            unknown = set(_PLACEHOLDER_PATTERN.findall(template)) - placeholders
+            if unknown:
+                raise ValueError(f"Placeholders {sorted(unknown)} of the {field} topic {template} are not used in pattern {internal_template}")
+
+        self.templates: Dict[str, str] = {"internal": internal_template, **definition.topics}
+        self._regexes = {field: self._compile(template) for field, template in self.templates.items()}
+        # validation rules and meta are shared by all topics of the family
+        self._validation = [rule.model_dump(mode="json") for rule in definition.validation] if definition.validation else None
+        self._rate_limit = definition.rate_limit.model_dump(mode="json") if definition.rate_limit else None
+
+    @staticmethod
+    def _compile(template: str) -> "re.Pattern":
+        regex = ""
+        position = 0
+        seen = set()
+        for match in _PLACEHOLDER_PATTERN.finditer(template):
+            regex += re.escape(template[position:match.start()])
+            name = match.group(1)
+            # a placeholder used twice has to match the same value
+            regex += f"(?P={name})" if name in seen else f"(?P<{name}>[^/]+)"
+            seen.add(name)
+            position = match.end()
+        regex += re.escape(template[position:])
+        return re.compile(regex + r"\Z")
+
+    def _allows(self, name: str, value: str) -> bool:
+        parameter = self.parameters[name]
+        if isinstance(parameter, ParameterRange):
+            try:
+                number = int(value)
+            except ValueError:
+                return False
+            # only the canonical form expand() produces, "03" or "+3" are not part of the family
+            if str(number) != value:
+                return False
+            return parameter.min <= number <= parameter.max and (number - parameter.min) % parameter.step == 0
+        return value in {str(allowed) for allowed in parameter}
+
+    def match(self, field: str, topic: str) -> Optional[Dict[str, str]]:
+        """
+        Match a concrete topic against the template of the field.
+
+        Params:
+            field: one of "internal", "external", "validated", "feedback"
+            topic: concrete topic
+        Returns:
+            Dict of placeholder values if the topic belongs to the family, None otherwise
+        """
+        regex = self._regexes.get(field)
+        if regex is None:
+            return None
+        match = regex.match(topic)
+        if match is None:
+            return None
+        values = match.groupdict()
+        if not all(self._allows(name, value) for name, value in values.items()):
+            return None
+        return values
+
+    def size(self) -> int:
+        """
+        Returns the number of topics in the family without expanding it.
+        """
+        size = 1
+        for parameter in self.parameters.values():
+            if isinstance(parameter, ParameterRange):
+                size *= (parameter.max - parameter.min) // parameter.step + 1
+            else:
+                size *= len(parameter)
+        return size
+
+    def expand(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generate the flattened entries of all topics of the family.
+        """
+        names = list(self.parameters)
+        value_lists = []
+        for name in names:
+            parameter = self.parameters[name]
+            if isinstance(parameter, ParameterRange):
+                value_lists.append(range(parameter.min, parameter.max + 1, parameter.step))
+            else:
+                value_lists.append(parameter)
+        for values in product(*value_lists):
+            yield self.render({name: str(value) for name, value in zip(names, values)})
+
+    def render(self, values: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Build the flattened entry of one topic of the family, same shape as entries of explicitly defined topics.
+
+        Params:
+            values: Dict of placeholder values
+        Returns:
+            Flattened entry of the topic
+        """
+        topics = {field: template.format(**values) for field, template in self.templates.items()}
+        entry = {
+            "plant_name": self.plant_name,
+            "type": self.definition.type,
+            "external": topics.get("external"),
+            "internal": topics.get("internal"),
+            "meta": self.definition.meta,
+            "pattern": self.internal_template,
+        }
+        if self.definition.type == "command":
+            entry["validated"] = topics.get("validated")
+            entry["feedback"] = topics.get("feedback")
+            entry["echo"] = topics.get("echo")
+            entry["validation"] = self._validation
+            entry["rate_limit"] = self._rate_limit
+        return entry
+
+# weights for the fields in the free-text index, topic names weigh more than metadata
+TEXT_INDEX_FIELD_WEIGHTS = {
+    "internal": 3,
+    "external": 2,
+    "meta": 1,
+}
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def _tokenize(text: Any) -> List[str]:
+    """
+    Split text into lowercase word tokens. Topic separators like "/" and "_" split tokens aswell.
+    """
+    return _TOKEN_PATTERN.findall(str(text).lower().replace("_", " "))
+
+def _collect_meta_text(meta: Any) -> List[str]:
+    """
+    Recursively collect keys and values of the topic metadata as strings.
+    """
+    if isinstance(meta, dict):
+        texts = []
+        for key, value in meta.items():
+            texts.append(str(key))
+            texts.extend(_collect_meta_text(value))
+        return texts
+    if isinstance(meta, (list, tuple)):
+        texts = []
+        for value in meta:
+            texts.extend(_collect_meta_text(value))
+        return texts
+    if meta is None:
+        return []
+    return [str(meta)]
+
+class TopicTextIndex:
+    """
+    Tokenized inverted index over topic names and metadata for free-text topic search.
+    Query tokens are matched by prefix against the indexed tokens, a topic matches if every query token matches.
+    Matches are ranked by field weight, exact token hits score double of prefix hits.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}   # token -> {document key: field weight}
+        self._sorted_tokens: List[str] = []
+
+    def build(self, documents: Dict[str, Dict[str, List[str]]]) -> None:
+        """
+        Rebuild the index.
+
+        Params:
+            documents: Dict mapping. Input format:
+                {
+                    document key: {field name: list of texts, ...},
+                    ...
+                }
+        """
+        postings: Dict[str, Dict[str, int]] = {}
+        for key, fields in documents.items():
+            for field, texts in fields.items():
+                weight = TEXT_INDEX_FIELD_WEIGHTS.get(field, 1)
+                for text in texts:
+                    for token in _tokenize(text):
+                        token_postings = postings.setdefault(token, {})
+                        # keep the strongest field a token was found in
+                        if token_postings.get(key, 0) < weight:
+                            token_postings[key] = weight
+
+        self._postings = postings
+        self._sorted_tokens = sorted(postings)
+
+    def search(self, text: str) -> Dict[str, int]:
+        """
+        Find documents matching all tokens of the text.
+
+        Params:
+            text: Free text query
+        Returns:
+            Dict of document key to score, ordered by descending score
+        """
+        query_tokens = _tokenize(text)
+        if not query_tokens:
+            return {}
+
+        scores: Optional[Dict[str, int]] = None
+        for query_token in set(query_tokens):
+            token_scores: Dict[str, int] = {}
+            # prefix range in the sorted token list
+            position = bisect_left(self._sorted_tokens, query_token)
+            while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(query_token):
+                token = self._sorted_tokens[position]
+                multiplier = 2 if token == query_token else 1
+                for key, weight in self._postings[token].items():
+                    score = weight * multiplier
+                    if token_scores.get(key, 0) < score:
+                        token_scores[key] = score
+                position += 1
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {key: score + token_scores[key] for key, score in scores.items() if key in token_scores}
+            if not scores:
+                return {}
+
+        return dict(sorted(scores.items(), key=lambda item: (-item[1], item[0])))
+
+# topic types forwarded from the plants to the platform
+NONCOMMAND_TOPIC_TYPES = ("sensor", "status", "error", "warning")
+# names of the precomputed topic mappings
+MAPPING_NAMES = (
+    "external_to_internal_noncommand",
+    "external_to_validated_commands",
+    "unvalidated_to_validated_commands",
+    "unvalidated_to_validation_rule",
+    "unvalidated_to_feedback",
+    "unvalidated_to_rate_limit",
+)
+
+def _make_snapshot(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the JSON ready search result of a flattened topic entry.
+    """
+    snapshot = {
+        "plant_name": entry.get("plant_name"),
+        "type": entry.get("type"),
+        "external_topic": entry.get("external"),
+        "meta": deepcopy(entry.get("meta"))
+    }
+    if entry.get("type") == "command":
+        snapshot["validated_topic"] = entry.get("validated")
+        snapshot["feedback_topic"] = entry.get("feedback")
+        snapshot["echo_topic"] = entry.get("echo")
+        snapshot["validation"] = deepcopy(entry.get("validation"))
+        snapshot["rate_limit"] = deepcopy(entry.get("rate_limit"))
+    if "pattern" in entry:
+        snapshot["pattern"] = entry.get("pattern")
+    return snapshot
+
+def _mapping_pairs(entry: Dict[str, Any], snapshot: Dict[str, Any]) -> List[tuple]:
+    """
+    Collect the (mapping name, key, value) pairs a topic contributes to the topic mappings.
+    """
+    internal = entry.get("internal")
+    pairs = []
+    if entry.get("type") in NONCOMMAND_TOPIC_TYPES and internal:
+        pairs.append(("external_to_internal_noncommand", snapshot["external_topic"], internal))
+    if entry.get("type") == "command":
+        if snapshot["validated_topic"]:
+            pairs.append(("external_to_validated_commands", snapshot["external_topic"], snapshot["validated_topic"]))
+            if internal:
+                pairs.append(("unvalidated_to_validated_commands", internal, snapshot["validated_topic"]))
+        if snapshot["validation"] and internal:
+            pairs.append(("unvalidated_to_validation_rule", internal, snapshot["validation"]))
+        if snapshot["feedback_topic"] and internal:
+            pairs.append(("unvalidated_to_feedback", internal, snapshot["feedback_topic"]))
+        if snapshot["rate_limit"] and internal:
+            pairs.append(("unvalidated_to_rate_limit", internal, snapshot["rate_limit"]))
+    return pairs
+
 def topicregistry(config_path, **kwargs):
     try:
         config = utils.load_config(config_path)
@@ -67,6 +396,19 @@ class TopicRegistry(Agent, MetadataMixin):
         self._plants_topics_data: Dict[str, Dict[str, TopicDefinition]] = {}
         # flattened dict for easier search with jmespath
         self._flattened_topics_data: List[Dict[str, Any]] = []
+        # inverted index for the free text search over topic names and metadata
+        self._text_index = TopicTextIndex()
+        # templated topic families, resolved by pattern matching instead of being materialized
+        self._topic_patterns: List[TopicPattern] = []
+        # JSON ready search results per internal topic and topic mappings per plant, built once per config load.
+        # Handed out as they are, so they must be treated as read only
+        self._topic_snapshots: Dict[str, Dict[str, Any]] = {}
+        self._plant_mappings: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._all_plants_mappings: Dict[str, Dict[str, Any]] = {}
+        # plants whose topic families are not yet expanded into their mappings or into the mappings of all plants,
+        # the families are only expanded on the first mapping request for the plant
+        self._unexpanded_pattern_plants: Set[str] = set()
+        self._unmerged_pattern_plants: Set[str] = set()
 
         self._agent_manager = config.get("agent_manager_identity", "agentmanageragent-0.1_1")
 
@@ -80,6 +422,8 @@ class TopicRegistry(Agent, MetadataMixin):
         self._config = contents
         self._load_plants_topics_data()
         self._flatten_dict()
+        self._build_snapshots()
+        self._build_text_index()
 
 
 # ------------------ RPC exposed functions ------------------
@@ -95,6 +439,7 @@ class TopicRegistry(Agent, MetadataMixin):
             topic_type_list_match: List of topic types to match.
             feedback_topics_list_match: List of feedback topics to match.
             text_info_match: Free-text filter across external topic, internal topic, and metadata.
+                Words are matched case-insensitive by prefix, the results are ordered by relevance.
 
         Returns:
             Dict mapping. Output format:
@@ -108,7 +453,12 @@ class TopicRegistry(Agent, MetadataMixin):
                             if the topic is a command topic the return includes these fields aswell:
                         "validated_topic": topic for validated commands 
                         "feedback_topic": topic for feedback on commands
+                        "echo_topic": optional internal status or sensor topic on which the plant reports the applied command
                         "validation": lsit of valdiation rules
+                        "rate_limit": rate limit for the command topic or None
+
+                            if the topic belongs to a pattern definition:
+                        "pattern": internal topic template of the pattern
                     },
                     ...
                 }
@@ -161,42 +511,35 @@ class TopicRegistry(Agent, MetadataMixin):
                 "(" + " || ".join([f"feedback=='{f}'" for f in feedback_topics_list_match]) + ")"
             )
 
-        # Text matching in meta and topic names
-        if text_info_match:
-            # simplistic: search external, internal, and meta values
-            query_parts.append("("
-                f"contains(external, '{text_info_match}') || "
-                f"contains(internal, '{text_info_match}') || "
-                f"contains(to_string(meta), '{text_info_match}')"
-            ")")
-
         query = "[?" + " && ".join(query_parts) + "]" if query_parts else "[]"
 
         # run the query
+        results = []
         try:
             results = jmespath.search(query, self._flattened_topics_data)
         except Exception as e:
             _log.error(f"An error occured while searching topics in the JSON file: {e}")
 
+        # Text matching in meta and topic names via the inverted index, ranked by relevance
+        if text_info_match:
+            scores = self._text_index.search(text_info_match)
+            pattern_results = self._search_patterns(plant_name_list_match, topic_type_list_match, external_topics_list_match, internal_topics_list_match, feedback_topics_list_match, templates=set(scores))
+            # pattern topics are indexed by their template
+            document_key = lambda entry: entry.get("pattern", entry.get("internal"))
+            results = sorted(
+                [entry for entry in results if entry.get("internal") in scores] + list(pattern_results),
+                key=lambda entry: (-scores[document_key(entry)], entry.get("internal"))
+            )
+        else:
+            results = results + list(self._search_patterns(plant_name_list_match, topic_type_list_match, external_topics_list_match, internal_topics_list_match, feedback_topics_list_match))
+
         dict_results = {}
         for entry in results:
-            if (entry.get("type") == "command"):
-                dict_results[entry.get("internal")] = {
-                    "plant_name": entry.get("plant_name"),
-                    "type": entry.get("type"),
-                    "external_topic": entry.get("external"),
-                    "meta": entry.get("meta"),
-                    "validated_topic": entry.get("validated"),
-                    "feedback_topic": entry.get("feedback"),
-                    "validation": [rule.model_dump() for rule in entry.get("validation")] if entry.get("validation") else None # TODO: make it serialisable: the validation rule type is not json serialisable on its own, this can cause problem if rpc called directly. 
-                }
+            internal = entry.get("internal")
+            if "pattern" in entry:
+                dict_results[internal] = _make_snapshot(entry)
             else:
-                dict_results[entry.get("internal")] = {
-                    "plant_name": entry.get("plant_name"),
-                    "type": entry.get("type"),
-                    "external_topic": entry.get("external"),
-                    "meta": entry.get("meta")
-                }
+                dict_results[internal] = self._topic_snapshots[internal]
         return dict_results
 
 # ------------------ Topic mappings and lists needed for infrastructure ------------------
@@ -237,13 +580,7 @@ class TopicRegistry(Agent, MetadataMixin):
             }
         """
 
-        mapping: Dict[str, str] = {}
-        topics = self.search_topics(topic_type_list_match=["sensor", "status", "error", "warning"], plant_name_list_match=plant_name_list_match)
-        for internal, details in topics.items():
-            external = details.get("external_topic")
-            if internal:
-                mapping[external] = internal
-        return mapping
+        return self._get_mapping("external_to_internal_noncommand", plant_name_list_match)
 
 
     @RPC.export
@@ -262,14 +599,7 @@ class TopicRegistry(Agent, MetadataMixin):
             }
         """
 
-        mapping: Dict[str, str] = {}
-        topics = self.search_topics(topic_type_list_match=["command"], plant_name_list_match=plant_name_list_match)
-        for internal, details in topics.items():
-            validated = details.get("validated_topic")
-            external = details.get("external_topic")
-            if validated:
-                mapping[external] = validated
-        return mapping
+        return self._get_mapping("external_to_validated_commands", plant_name_list_match)
 
     @RPC.export
     def get_unvalidated_to_validated_commands_map(self, plant_name_list_match: Optional[List[str]] = None) -> Dict[str, str]:
@@ -287,13 +617,7 @@ class TopicRegistry(Agent, MetadataMixin):
             }
         """
 
-        mapping: Dict[str, str] = {}
-        topics = self.search_topics(topic_type_list_match=["command"], plant_name_list_match=plant_name_list_match)
-        for unvalidated, details in topics.items():
-            validated = details.get("validated_topic")
-            if validated and unvalidated:
-                mapping[unvalidated] = validated
-        return mapping
+        return self._get_mapping("unvalidated_to_validated_commands", plant_name_list_match)
     
 
     @RPC.export
@@ -312,13 +636,7 @@ class TopicRegistry(Agent, MetadataMixin):
             }
         """
 
-        mapping: Dict[str, str] = {}
-        topics = self.search_topics(topic_type_list_match=["command"], plant_name_list_match=plant_name_list_match)
-        for unvalidated, details in topics.items():
-            validation = details.get("validation")
-            if validation and unvalidated:
-                mapping[unvalidated] = validation
-        return mapping
+        return self._get_mapping("unvalidated_to_validation_rule", plant_name_list_match)
     
 
     @RPC.export
@@ -337,13 +655,26 @@ class TopicRegistry(Agent, MetadataMixin):
             }
         """
 
-        mapping: Dict[str, str] = {}
-        topics = self.search_topics(topic_type_list_match=["command"], plant_name_list_match=plant_name_list_match)
-        for unvalidated, details in topics.items():
-            feedback = details.get("feedback_topic")
-            if feedback and unvalidated:
-                mapping[unvalidated] = feedback
-        return mapping
+        return self._get_mapping("unvalidated_to_feedback", plant_name_list_match)
+
+
+    @RPC.export
+    def get_unvalidated_to_rate_limit_map(self, plant_name_list_match: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Returns mapping: internal unvalidated command topic -> rate limit of the topic.
+        Command topics without rate limit are not included.
+        For plant control agents.
+        
+        Params:
+            plant_name_list_match: list of plants to filter for
+        Returns:
+            Dict with topic mappings. Output format:
+            {
+                internal unvalidated command topic: {"interval": seconds, "burst": tokens, "coalesce": bool},
+                ...
+            }
+        """
+        return self._get_mapping("unvalidated_to_rate_limit", plant_name_list_match)
 
 # ------------------ Helper functions ------------------
 
@@ -353,13 +684,19 @@ class TopicRegistry(Agent, MetadataMixin):
         On fail or validation errors logs the error and loads empty values
         """
         self._plants_topics_data: Dict[str, Dict[str, TopicDefinition]] = {}
+        self._topic_patterns = []
         raw_data = self._config.get("Plants topics data", {})
 
         for plant_name, external_topics_dict in raw_data.items():
             self._plants_topics_data[plant_name] = {}
             for external_topic, topic_data_dict in external_topics_dict.items():
                 try:
-                    self._plants_topics_data[plant_name][external_topic] = TopicDefinition(**topic_data_dict)
+                    topic_def = TopicDefinition(**topic_data_dict)
+                    # topics with placeholders define a topic family
+                    if _PLACEHOLDER_PATTERN.search(external_topic):
+                        self._topic_patterns.append(TopicPattern(plant_name, external_topic, topic_def))
+                    else:
+                        self._plants_topics_data[plant_name][external_topic] = topic_def
                 except Exception as e:
                     _log.error(f"Invalid topic definition {external_topic} for plant {plant_name}: {e}")
 
@@ -379,8 +716,10 @@ class TopicRegistry(Agent, MetadataMixin):
                         "internal": internal,
                         "validated": topic_def.topics.get("validated"),
                         "feedback":topic_def.topics.get("feedback"),
+                        "echo": topic_def.topics.get("echo"),
                         "meta": topic_def.meta,
-                        "validation": topic_def.validation
+                        "validation": [rule.model_dump(mode="json") for rule in topic_def.validation] if topic_def.validation else None,
+                        "rate_limit": topic_def.rate_limit.model_dump(mode="json") if topic_def.rate_limit else None
                     }
                 else:
                     data_dict={
@@ -392,6 +731,144 @@ class TopicRegistry(Agent, MetadataMixin):
                     }
                 self._flattened_topics_data.append(data_dict)
 
+    def _build_snapshots(self):
+        """
+        Precompute the JSON ready search results for every topic and the topic mappings for every plant from the flattened topics data.
+        RPC responses are served from these without any per request conversion.
+        Topic families are expanded into the mappings of their plant on its first mapping request, not on every config load.
+        """
+        topic_snapshots: Dict[str, Dict[str, Any]] = {}
+        plant_mappings: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        all_plants_mappings: Dict[str, Dict[str, Any]] = {name: {} for name in MAPPING_NAMES}
+
+        for entry in self._flattened_topics_data:
+            snapshot = _make_snapshot(entry)
+            topic_snapshots[entry.get("internal")] = snapshot
+
+            mappings = plant_mappings.setdefault(entry.get("plant_name"), {name: {} for name in MAPPING_NAMES})
+            for name, key, value in _mapping_pairs(entry, snapshot):
+                mappings[name][key] = value
+                all_plants_mappings[name][key] = value
+
+        self._topic_snapshots = topic_snapshots
+        self._plant_mappings = plant_mappings
+        self._all_plants_mappings = all_plants_mappings
+        self._unexpanded_pattern_plants = {pattern.plant_name for pattern in self._topic_patterns}
+        self._unmerged_pattern_plants = set(self._unexpanded_pattern_plants)
+
+    def _get_plant_mappings(self, plant_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the topic mappings of a plant, expanding its topic families into them on the first request after a config load.
+
+        Params:
+            plant_name: name of the plant
+        Returns:
+            Dict with the topic mappings keyed by mapping name, empty for unknown plants
+        """
+        if plant_name in self._unexpanded_pattern_plants:
+            mappings = self._plant_mappings.setdefault(plant_name, {name: {} for name in MAPPING_NAMES})
+            for pattern in self._topic_patterns:
+                if pattern.plant_name != plant_name:
+                    continue
+                for entry in pattern.expand():
+                    for name, key, value in _mapping_pairs(entry, _make_snapshot(entry)):
+                        mappings[name][key] = value
+            self._unexpanded_pattern_plants.discard(plant_name)
+        return self._plant_mappings.get(plant_name, {})
+
+    def _get_all_plants_mappings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the topic mappings merged over all plants, expanding the remaining topic families into them on the first request after a config load.
+        """
+        for plant_name in sorted(self._unmerged_pattern_plants):
+            for name, mapping in self._get_plant_mappings(plant_name).items():
+                self._all_plants_mappings[name].update(mapping)
+        self._unmerged_pattern_plants = set()
+        return self._all_plants_mappings
+
+    def _get_mapping(self, mapping_name: str, plant_name_list_match: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns a precomputed topic mapping, merged over the requested plants.
+
+        Params:
+            mapping_name: one of MAPPING_NAMES
+            plant_name_list_match: list of plant names to filter for, all plants if not provided
+        Returns:
+            Dict with topic mappings
+        """
+        if not plant_name_list_match:
+            mapping = self._get_all_plants_mappings().get(mapping_name, {})
+        elif len(plant_name_list_match) == 1:
+            mapping = self._get_plant_mappings(plant_name_list_match[0]).get(mapping_name, {})
+        else:
+            mapping = {}
+            for plant_name in plant_name_list_match:
+                mapping.update(self._get_plant_mappings(plant_name).get(mapping_name, {}))
+        return mapping
+
+    def _search_patterns(self, plant_name_list_match: Optional[List[str]] = None, topic_type_list_match: Optional[List[str]] = None, external_topics_list_match: Optional[List[str]] = None, internal_topics_list_match: Optional[List[str]] = None, feedback_topics_list_match: Optional[List[str]] = None, templates: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generate the flattened entries of pattern topics matching the filters.
+        Explicit topics are resolved by matching them against the templates, the families are only expanded without explicit topics.
+
+        Params:
+            same as search_topics
+            templates: set of internal topic templates to restrict the search to
+        Returns:
+            Iterator over flattened entries
+        """
+        for pattern in self._topic_patterns:
+            if plant_name_list_match and pattern.plant_name not in plant_name_list_match:
+                continue
+            if topic_type_list_match and pattern.definition.type not in topic_type_list_match:
+                continue
+            if templates is not None and pattern.internal_template not in templates:
+                continue
+
+            explicit_filters = [(field, topics) for field, topics in (
+                ("internal", internal_topics_list_match),
+                ("external", external_topics_list_match),
+                ("feedback", feedback_topics_list_match)
+            ) if topics]
+            if not explicit_filters:
+                yield from pattern.expand()
+                continue
+
+            # resolve candidates from the first filter, check the remaining filters on the resolved topic
+            field, topics = explicit_filters[0]
+            resolved = set()
+            for topic in topics:
+                values = pattern.match(field, topic)
+                if values is None:
+                    continue
+                entry = pattern.render(values)
+                if entry.get("internal") in resolved:
+                    continue
+                if all(entry.get(other_field) in other_topics for other_field, other_topics in explicit_filters[1:]):
+                    resolved.add(entry.get("internal"))
+                    yield entry
+
+    def _build_text_index(self):
+        """
+        Build the inverted index for free text search from the flattened topics data
+        """
+        documents: Dict[str, Dict[str, List[str]]] = {}
+        for entry in self._flattened_topics_data:
+            fields = documents.setdefault(entry.get("internal"), {"internal": [], "external": [], "meta": []})
+            fields["internal"].append(entry.get("internal"))
+            fields["external"].append(entry.get("external"))
+            fields["meta"].extend(_collect_meta_text(entry.get("meta")))
+        # topic families are indexed once by their templates
+        for pattern in self._topic_patterns:
+            documents[pattern.internal_template] = {
+                "internal": [pattern.internal_template],
+                "external": [pattern.templates.get("external")],
+                "meta": _collect_meta_text(pattern.definition.meta)
+            }
+
+        self._text_index.build(documents)
+        _log.debug(f"Built text index for {len(documents)} topics")
+
     @Core.receiver("onstart")
     def onstart(self, sender, **kwargs):
         try:
@@ -21,8 +21,8 @@ AGENTS = {
     "logger": (AGENT_PACKAGES / "Logger", AGENT_PACKAGES / "Logger" / "config"),
     "backend_server": (AGENT_PACKAGES / "BackendAgent", AGENT_PACKAGES / "BackendAgent" / "config"),
     
+    # one control agent hosts all plants listed in its config
     "bhkw": (AGENT_PACKAGES / "ControlBHKW", AGENT_PACKAGES / "ControlBHKW" / "config"),
-    "speicher": (AGENT_PACKAGES / "ControlSpeicher", AGENT_PACKAGES / "ControlSpeicher" / "config"),
     
     "tester": (AGENT_PACKAGES / "testingAgents" / "TestAgent", AGENT_PACKAGES / "testingAgents" / "TestAgent" / "config"),
     "impulsetest": (AGENT_PACKAGES / "testingAgents" / "ImpulseTest", AGENT_PACKAGES / "testingAgents" / "ImpulseTest" / "config"),
@@ -0,0 +1,119 @@
+import json
+import os
+from pathlib import Path
+from typing import Type, Dict
+from pydantic import BaseModel
+from .json_io import save_json, load_json
+
+#-------------- Journaled dict of Pydantic models --------------
+
+JOURNAL_SUFFIX = ".journal"
+OP_PUT = "put"
+OP_DELETE = "delete"
+
+
+class ModelJournal:
+    """
+    Persist a dict of Pydantic models keyed by one of their fields as a JSON snapshot
+    plus an append-only journal of changes.
+
+    The snapshot keeps the format of pydantic_io.save_model_list (a JSON list of models),
+    so existing files stay readable. Every change is appended as a single JSON line
+    to "<path>.journal" instead of rewriting the whole snapshot. Loading replays the
+    journal on top of the snapshot, compacting folds the journal back into the snapshot.
+    """
+
+    def __init__(self, path: Path, model_class: Type[BaseModel], key_field: str, compact_threshold: int = 200, fsync: bool = True):
+        self.path = str(path)
+        self.journal_path = self.path + JOURNAL_SUFFIX
+        self.model_class = model_class
+        self.key_field = key_field
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.journal_entries = 0
+
+    def load(self) -> Dict[str, BaseModel]:
+        """
+        Load the snapshot and replay the journal on top of it.
+
+        Returns:
+            Dict of models keyed by the key field, in insertion order
+        Raises:
+            FileNotFoundError: If neither the snapshot nor the journal exist
+            ValueError: If the snapshot or the journal contain invalid data
+        """
+        models: Dict[str, BaseModel] = {}
+        journal_exists = os.path.exists(self.journal_path)
+
+        if os.path.exists(self.path) or not journal_exists:
+            data = load_json(self.path)
+            if not isinstance(data, list):
+                raise ValueError(f"Snapshot {self.path} must contain a list of models.")
+            for item in data:
+                model = self.model_class.model_validate(item)
+                models[getattr(model, self.key_field)] = model
+
+        self.journal_entries = 0
+        if journal_exists:
+            for record in self._read_journal():
+                key = record.get("key")
+                if record.get("op") == OP_PUT:
+                    models[key] = self.model_class.model_validate(record.get("value"))
+                elif record.get("op") == OP_DELETE:
+                    models.pop(key, None)
+                else:
+                    raise ValueError(f"Unknown journal operation: {record.get('op')}")
+                self.journal_entries += 1
+
+        return models
+
+    def put(self, model: BaseModel) -> None:
+        """Append an insert or update of a model to the journal."""
+        self._append({"op": OP_PUT, "key": getattr(model, self.key_field), "value": model.model_dump()})
+
+    def delete(self, key: str) -> None:
+        """Append a removal of the model with the given key to the journal."""
+        self._append({"op": OP_DELETE, "key": key})
+
+    def needs_compaction(self) -> bool:
+        """True if the journal grew past the compaction threshold."""
+        return self.journal_entries >= self.compact_threshold
+
+    def compact(self, models: Dict[str, BaseModel]) -> None:
+        """
+        Write all models as a new snapshot and discard the journal.
+        The snapshot is replaced atomically, so a crash leaves either the old or the new one.
+        """
+        tmp_path = self.path + ".tmp"
+        save_json(tmp_path, [m.model_dump() for m in models.values()])
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_entries = 0
+
+    def _append(self, record: Dict) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        self.journal_entries += 1
+
+    def _read_journal(self):
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a torn last line is left by a crash during an append,
+                # cut it off so that the next append starts on a clean line
+                if index == len(lines) - 1:
+                    with open(self.journal_path, "r+", encoding="utf-8") as file:
+                        file.truncate(len("".join(lines[:index]).encode("utf-8")))
+                    return
+                raise ValueError(f"Corrupted journal {self.journal_path} at line {index + 1}.")
+            yield record
@@ -41,4 +41,16 @@ def temp_json_file_path():
 
     yield path
     if os.path.exists(path):
-        os.remove(path)
\ No newline at end of file
+        os.remove(path)
+
+@pytest.fixture
+def model_journal(temp_json_file_path):
+    """
+    Journal for ModelTest models keyed by name, backed by the temporary file.
+    """
+    from persistence.journal_io import ModelJournal
+
+    journal = ModelJournal(temp_json_file_path, ModelTest, "name", compact_threshold=3, fsync=False)
+    yield journal
+    if os.path.exists(journal.journal_path):
+        os.remove(journal.journal_path)
@@ -2,6 +2,7 @@ import pytest
 import json
 import os 
 from persistence import json_io, pydantic_io
+from persistence.journal_io import ModelJournal
 from pydantic import BaseModel, ValidationError
 from tests.conftest import ModelTest
 
@@ -87,4 +88,65 @@ def test_load_model_dict_with_invalid_data(temp_json_file_path):
         json.dump(invalid_data, file)
 
     with pytest.raises(Exception):
-        pydantic_io.load_model_dict(temp_json_file_path, ModelTest)
\ No newline at end of file
+        pydantic_io.load_model_dict(temp_json_file_path, ModelTest)
+
+# ------------------- Journaled Pydantic Dicts ------------------- #
+
+def test_journal_replays_changes_over_snapshot(model_journal: ModelJournal, model_list):
+
+    pydantic_io.save_model_list(model_journal.path, model_list)
+    model_journal.put(ModelTest(id=3, name="Carol"))
+    model_journal.put(ModelTest(id=20, name="Bob"))
+    model_journal.delete("Alice")
+
+    # the snapshot itself is untouched by the appends
+    assert len(json_io.load_json(model_journal.path)) == 2
+
+    loaded_models = model_journal.load()
+    assert list(loaded_models.keys()) == ["Bob", "Carol"]
+    assert loaded_models["Bob"].id == 20
+    assert model_journal.journal_entries == 3
+    assert model_journal.needs_compaction()
+
+def test_journal_compact(model_journal: ModelJournal, model_dict):
+
+    model_journal.put(ModelTest(id=3, name="Carol"))
+    model_dict["Carol"] = ModelTest(id=3, name="Carol")
+    model_journal.compact(model_dict)
+
+    assert not os.path.exists(model_journal.journal_path)
+    assert model_journal.journal_entries == 0
+    assert pydantic_io.load_model_list(model_journal.path, ModelTest) == list(model_dict.values())
+    assert model_journal.load() == model_dict
+
+def test_journal_without_snapshot(model_journal: ModelJournal):
+
+    os.remove(model_journal.path)
+    with pytest.raises(FileNotFoundError):
+        model_journal.load()
+
+    model_journal.put(ModelTest(id=1, name="Alice"))
+    assert model_journal.load() == {"Alice": ModelTest(id=1, name="Alice")}
+
+def test_journal_torn_last_line(model_journal: ModelJournal):
+
+    pydantic_io.save_model_list(model_journal.path, [])
+    model_journal.put(ModelTest(id=1, name="Alice"))
+    with open(model_journal.journal_path, "a") as file:
+        file.write('{"op": "put", "key": "Bo')
+
+    assert list(model_journal.load().keys()) == ["Alice"]
+
+    # the torn line was cut off, later appends are readable again
+    model_journal.put(ModelTest(id=2, name="Bob"))
+    assert list(model_journal.load().keys()) == ["Alice", "Bob"]
+
+def test_journal_corrupted_line(model_journal: ModelJournal):
+
+    pydantic_io.save_model_list(model_journal.path, [])
+    with open(model_journal.journal_path, "w") as file:
+        file.write('{ invalid json ]\n')
+    model_journal.put(ModelTest(id=1, name="Alice"))
+
+    with pytest.raises(ValueError):
+        model_journal.load()
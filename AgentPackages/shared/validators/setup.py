@@ -7,4 +7,7 @@ setup(
     description='Shared lib to validate control commands for plants',
     author='Dany',
     install_requires=[],
+    extras_require={
+        'batch': ['numpy'],
+    },
 )
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from validators.validators import _validate_range, _validate_type, _validate_enum, validate_command, ValidationRule, ValidationType
+from validators.validators import _validate_range, _validate_type, _validate_enum, validate_command, compile_rules, validate_batch, ValidationRule, ValidationType
 
 # ------------ Validation Rule Class Success cases ------------
 class TestClassSuccess:
@@ -173,4 +173,114 @@ class TestGeneric:
         with pytest.raises(ValueError):
             validate_command(123, [{"validation_type": "unknown"}])
 
-    # TODO: test multiple rules validation at the same time
\ No newline at end of file
+    # TODO: test multiple rules validation at the same time
+
+
+# ------------ Compiled Validators ------------
+class TestCompiled:
+    def test_compile_rules_multiple_rules(self):
+        validator = compile_rules([
+            {"validation_type": "type", "expected_type": "int"},
+            {"validation_type": "range", "min_value": 0, "max_value": 10}
+        ])
+        assert validator(5) == 5
+        with pytest.raises(ValueError):
+            validator(11)
+        with pytest.raises(ValueError):
+            validator(5.0)
+
+    def test_compile_rules_accepts_rule_objects(self):
+        validator = compile_rules([ValidationRule(**{"validation_type": "enum", "allowed_values": ["ON", "OFF"]})])
+        assert validator("ON") == "ON"
+        with pytest.raises(ValueError):
+            validator("PAUSE")
+        with pytest.raises(ValueError):
+            validator(["ON"])
+
+    def test_compile_rules_invalid_rules(self):
+        with pytest.raises(ValueError):
+            compile_rules([])
+        with pytest.raises(ValueError):
+            compile_rules([{"validation_type": "unknown"}])
+        with pytest.raises(ValueError):
+            compile_rules([{"validation_type": "type", "expected_type": "complex"}])
+
+
+# ------------ Batch Validation ------------
+class TestBatch:
+    def test_validate_batch_range_sequence(self):
+        np = pytest.importorskip("numpy")
+        rule = {"validation_type": "range", "min_value": 30, "max_value": 80}
+        mask, reasons = validate_batch([30, 55.5, 81, "50", True], [rule])
+        assert mask.tolist() == [True, True, False, False, False]
+        assert reasons[0] is None
+        assert "above maximum" in reasons[2]
+        assert "Received type: str" in reasons[3]
+        assert "below minimum" in reasons[4]
+
+    def test_validate_batch_numpy_array(self):
+        np = pytest.importorskip("numpy")
+        rules = [
+            {"validation_type": "type", "expected_type": "int"},
+            {"validation_type": "range", "min_value": 0, "max_value": 10}
+        ]
+        mask, reasons = validate_batch(np.array([0, 5, 11]), rules)
+        assert mask.tolist() == [True, True, False]
+
+        mask, reasons = validate_batch(np.array([0.0, 5.0]), rules)
+        assert mask.tolist() == [False, False]
+        assert "Expected int" in reasons[0]
+
+    def test_validate_batch_enum(self):
+        np = pytest.importorskip("numpy")
+        rule = {"validation_type": "enum", "allowed_values": ["ON", "OFF"]}
+        mask, reasons = validate_batch(np.array(["ON", "PAUSE"]), [rule])
+        assert mask.tolist() == [True, False]
+        mask, reasons = validate_batch(["OFF", ["ON"], None], [rule])
+        assert mask.tolist() == [True, False, False]
+
+    def test_validate_batch_matches_single_validation(self):
+        np = pytest.importorskip("numpy")
+        rules = [{"validation_type": "range", "min_value": -1.5, "max_value": 1.5}]
+        values = [-2, -1.5, 0, 1, 1.5, 1.6, "a", None, False]
+        validator = compile_rules(rules)
+        expected = []
+        for value in values:
+            try:
+                validator(value)
+                expected.append(True)
+            except ValueError:
+                expected.append(False)
+        mask, reasons = validate_batch(values, rules)
+        assert mask.tolist() == expected
+
+    @pytest.mark.parametrize("rule", [
+        {"validation_type": "type", "expected_type": "int"},
+        {"validation_type": "type", "expected_type": "float"},
+        {"validation_type": "type", "expected_type": "bool"},
+        {"validation_type": "type", "expected_type": "str"},
+        {"validation_type": "range", "min_value": 0, "max_value": 1.5},
+    ])
+    def test_validate_batch_matches_single_validation_of_numpy_values(self, rule):
+        np = pytest.importorskip("numpy")
+        arrays = [
+            np.array([1, 2], dtype=np.int64), np.array([0, 7], dtype=np.uint8),
+            np.array([0.5, 2.0]), np.array([True, False]), np.array(["a", "b"]),
+            _object_array([np.int64(1), np.float32(0.5), np.bool_(True), np.str_("a"), 1, 1.0, True, "a", 1j, np.complex128(1)]),
+        ]
+        for array in arrays:
+            expected = []
+            for value in array:
+                try:
+                    validate_command(value, [rule])
+                    expected.append(True)
+                except ValueError:
+                    expected.append(False)
+            mask, reasons = validate_batch(array, [rule])
+            assert mask.tolist() == expected, array
+
+def _object_array(values: list):
+    import numpy as np
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
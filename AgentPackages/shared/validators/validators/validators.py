@@ -1,6 +1,12 @@
 from pydantic import BaseModel, Field, model_validator
 from enum import Enum
-from typing import Optional, Any, Dict, List, Union, Callable
+from typing import Optional, Any, Dict, List, Union, Callable, Sequence, Tuple
+
+# numpy is only needed for batch validation
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class ValidationType(str, Enum):
     type = "type"
@@ -30,7 +36,8 @@ class ValidationRule(BaseModel):
 
 def validate_command(value: Any, rules_list: List[Dict]) -> Any:
     """
-    Generic and only validation entry point.
+    Generic validation entry point. Compiles the rules on every call,
+    for repeated validation against the same rules use compile_rules once and reuse the returned validator.
     
     Params:
         value: The command value to validate.
@@ -42,28 +49,47 @@ def validate_command(value: Any, rules_list: List[Dict]) -> Any:
     Raises:
         ValueError if validation fails.
     """
+    return compile_rules(rules_list)(value)
+
+def compile_rules(rules_list: List[Union[Dict, "ValidationRule"]]) -> Callable[[Any], Any]:
+    """
+    Compile a list of validation rules into a single validator callable.
+    The rules are parsed and checked once, the returned callable only runs plain comparisons.
+
+    Params:
+        rules_list: a List of Dict with keys:
+            - 'validation_type': one of validation types
+            - type-specific params.
+            or a List of ValidationRule objects
+    Returns:
+        Callable that takes the value to validate and returns the validated value.
+        The callable raises ValueError if validation fails.
+    Raises:
+        ValueError if the rules are missing or invalid.
+    """
     if not rules_list:
         raise ValueError(f"No rules to validate command with.")
 
+    checks = []
     for rule in rules_list:
-        # validate rule with pydantic
-        validated_rule = ValidationRule(**rule)
+        # validate rule with pydantic, only once at compile time
+        validated_rule = rule if isinstance(rule, ValidationRule) else ValidationRule(**rule)
 
-        # make sure the validor exists fot the specified validation type
-        if validated_rule.validation_type not in VALIDATORS:
+        # make sure the compiler exists fot the specified validation type
+        if validated_rule.validation_type not in COMPILERS:
             raise ValueError(f"Unknown validation type '{validated_rule.validation_type}'")
-        
-        # validate the value with according validator
+        checks.append(COMPILERS[validated_rule.validation_type](validated_rule))
+    checks = tuple(checks)
+
+    def validate(value: Any) -> Any:
         try:
-            validated_value = VALIDATORS[validated_rule.validation_type](value, validated_rule)
-        except Exception as e:
+            for check in checks:
+                check(value)
+        except ValueError as e:
             raise ValueError(f"Validation failed: {e}")
-        
-        # varify that the validated value is same. Not actually needed.
-        if not validated_value == value:
-            raise ValueError(f"You should not see this error. validated value is not same as value to validate.")
-        
-    return value
+        return value
+
+    return validate
         
 
 # A mapping from string names to actual Python types
@@ -75,31 +101,101 @@ TYPE_MAP = {
     "list": list,
     "dict": dict,
 }
+# numpy scalars, e.g. the items of a numpy array, pass the checks of their python counterparts like in batch validation
+_NUMPY_SCALAR_TYPES = {"int": (np.integer, np.bool_), "float": (np.floating,), "bool": (np.bool_,)} if np is not None else {}
+_ACCEPTED_TYPES = {name: (python_type,) + _NUMPY_SCALAR_TYPES.get(name, ()) for name, python_type in TYPE_MAP.items()}
+# types the range validator accepts as numbers
+_NUMBER_TYPES = _ACCEPTED_TYPES["int"] + _ACCEPTED_TYPES["float"]
 
-def _validate_type(value: Any, rule: ValidationRule) -> Any:
+def _compile_type(rule: ValidationRule) -> Callable[[Any], Any]:
     """
-    Validate that a value matches the expected type.
+    Compile a check that a value matches the expected type.
 
     Params:
-        value: Any value to validate.
         rule: ValidationRule Object with the requiered params like expected_type
     Returns:
-        The validated value if type matches.
+        Callable returning the value if type matches, raises ValueError otherwise.
     Raises:
-        ValueError if validation fails or unknown type is requested.
+        ValueError if unknown type is requested.
     """
 
     # TODO: multiple types in a list
     expected_type_str = rule.expected_type
-    expected_type = TYPE_MAP.get(expected_type_str)
+    expected_type = _ACCEPTED_TYPES.get(expected_type_str)
     if expected_type is None:
         raise ValueError(f"Unsupported type: {expected_type_str}")
 
-    if not isinstance(value, expected_type):
-        raise ValueError(
-            f"Expected {expected_type_str}, got {type(value).__name__}"
-        )
-    return value
+    def check_type(value: Any) -> Any:
+        if not isinstance(value, expected_type):
+            raise ValueError(
+                f"Expected {expected_type_str}, got {type(value).__name__}"
+            )
+        return value
+
+    return check_type
+
+def _compile_range(rule: ValidationRule) -> Callable[[Union[int, float]], Union[int, float]]:
+    """
+    Compile a check that the value lies within the allowed numeric range.
+
+    Params:
+        rule: ValidationRule Object with the requiered params like min_value and max_value
+    Returns:
+        Callable returning the numeric value if in range, raises ValueError otherwise.
+    """
+
+    min_val = rule.min_value
+    max_val = rule.max_value
+
+    def check_range(value: Union[int, float]) -> Union[int, float]:
+        if not isinstance(value, _NUMBER_TYPES):
+            raise ValueError(f"Cannot validate reange that is not of type int or float. Received type: {type(value).__name__}")
+        if min_val is not None and value < min_val:
+            raise ValueError(f"Value {value} is below minimum {min_val}")
+        if max_val is not None and value > max_val:
+            raise ValueError(f"Value {value} is above maximum {max_val}")
+        return value
+
+    return check_range
+
+def _compile_enum(rule: ValidationRule) -> Callable[[Any], Any]:
+    """
+    Compile a check that the value is among allowed values.
+
+    Params:
+        rule: ValidationRule Object with the requiered params like allowed_values 
+    Returns:
+        Callable returning the value if allowed, raises ValueError otherwise.
+    """
+
+    allowed = rule.allowed_values
+    allowed_set = frozenset(allowed)
+
+    def check_enum(value: Any) -> Any:
+        try:
+            is_allowed = value in allowed_set
+        except TypeError:
+            # unhashable values can not be one of the allowed strings
+            is_allowed = False
+        if not is_allowed:
+            raise ValueError(f"Value {value} not in allowed set {allowed}")
+        return value
+
+    return check_enum
+
+def _validate_type(value: Any, rule: ValidationRule) -> Any:
+    """
+    Validate that a value matches the expected type.
+
+    Params:
+        value: Any value to validate.
+        rule: ValidationRule Object with the requiered params like expected_type
+    Returns:
+        The validated value if type matches.
+    Raises:
+        ValueError if validation fails or unknown type is requested.
+    """
+    return _compile_type(rule)(value)
 
 def _validate_range(value: Union[int, float], rule: ValidationRule) -> Union[int, float]:
     """
@@ -113,17 +209,7 @@ def _validate_range(value: Union[int, float], rule: ValidationRule) -> Union[int
     Raises:
         ValueError if validation fails.
     """
-
-    if not isinstance(value, (int, float)):
-        raise ValueError(f"Cannot validate reange that is not of type int or float. Received type: {type(value).__name__}")
-    
-    min_val = rule.min_value
-    max_val = rule.max_value
-    if min_val is not None and value < min_val:
-        raise ValueError(f"Value {value} is below minimum {min_val}")
-    if max_val is not None and value > max_val:
-        raise ValueError(f"Value {value} is above maximum {max_val}")
-    return value
+    return _compile_range(rule)(value)
 
 def _validate_enum(value: Any, rule: ValidationRule) -> Any:
     """
@@ -136,14 +222,7 @@ def _validate_enum(value: Any, rule: ValidationRule) -> Any:
     Raises:
         ValueError if validation fails.
     """
-
-    allowed = rule.allowed_values
-    #if not isinstance(allowed, list):
-    #    raise ValueError("Validation rule missing 'allowed' list")
-
-    if value not in allowed:
-        raise ValueError(f"Value {value} not in allowed set {allowed}")
-    return value
+    return _compile_enum(rule)(value)
 
 # TODO: Validate string optionaly with regex?
 
@@ -152,3 +231,140 @@ VALIDATORS: Dict[ValidationType, Callable[[Any, ValidationRule], Any]] = {
     ValidationType.range: _validate_range,
     ValidationType.enum: _validate_enum,
 }
+
+COMPILERS: Dict[ValidationType, Callable[[ValidationRule], Callable[[Any], Any]]] = {
+    ValidationType.type: _compile_type,
+    ValidationType.range: _compile_range,
+    ValidationType.enum: _compile_enum,
+}
+
+
+# ------------ Batch validation ------------
+
+# numpy dtype kinds accepted by the type validator, mirrors isinstance checks of single values (bool is an int)
+_TYPE_DTYPE_KINDS = {
+    "int": "biu",
+    "float": "f",
+    "str": "U",
+    "bool": "b",
+}
+_NUMERIC_DTYPE_KINDS = "biuf"
+
+def validate_batch(values: Union[Sequence[Any], "np.ndarray"], rules_list: List[Union[Dict, ValidationRule]]) -> Tuple["np.ndarray", List[Optional[str]]]:
+    """
+    Validate many values against the same rules at once with array operations.
+    Intended for replaying recorded command streams and bulk checking setpoint schedules.
+
+    Params:
+        values: Sequence or 1-d numpy array of values to validate.
+        rules_list: a List of Dict with keys:
+            - 'validation_type': one of validation types
+            - type-specific params.
+            or a List of ValidationRule objects
+    Returns:
+        Tuple of:
+            - boolean numpy array, True where the value passed all rules
+            - list with the reason of the first failed rule per value, None for valid values
+    Raises:
+        ImportError if numpy is not installed.
+        ValueError if the rules are missing or invalid.
+    """
+    if np is None:
+        raise ImportError("Batch validation requires numpy.")
+    if not rules_list:
+        raise ValueError(f"No rules to validate command with.")
+
+    rules = [rule if isinstance(rule, ValidationRule) else ValidationRule(**rule) for rule in rules_list]
+    array = _as_batch_array(values)
+
+    mask = np.ones(len(array), dtype=bool)
+    reasons: List[Optional[str]] = [None] * len(array)
+    for rule in rules:
+        if rule.validation_type not in BATCH_VALIDATORS:
+            raise ValueError(f"Unknown validation type '{rule.validation_type}'")
+        rule_mask = BATCH_VALIDATORS[rule.validation_type](array, rule)
+
+        # reasons are only formatted for the values failing for the first time
+        for index in np.flatnonzero(mask & ~rule_mask):
+            reasons[index] = f"Validation failed: {_batch_reason(array[index], rule)}"
+        mask &= rule_mask
+
+    return mask, reasons
+
+def _as_batch_array(values: Union[Sequence[Any], "np.ndarray"]) -> "np.ndarray":
+    """
+    Convert the values to a 1-d array. Sequences become object arrays to keep the python types of the values.
+    """
+    if isinstance(values, np.ndarray):
+        if values.ndim != 1:
+            raise ValueError(f"Batch validation requires a 1-d array, got {values.ndim} dimensions")
+        return values
+
+    values = list(values)
+    array = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
+
+def _batch_type(array: "np.ndarray", rule: ValidationRule) -> "np.ndarray":
+    expected_type = _ACCEPTED_TYPES.get(rule.expected_type)
+    if expected_type is None:
+        raise ValueError(f"Unsupported type: {rule.expected_type}")
+
+    if array.dtype != object:
+        kinds = _TYPE_DTYPE_KINDS.get(rule.expected_type, "")
+        return np.full(len(array), array.dtype.kind in kinds, dtype=bool)
+    return np.fromiter((isinstance(value, expected_type) for value in array), dtype=bool, count=len(array))
+
+def _batch_numeric(array: "np.ndarray") -> "np.ndarray":
+    """
+    Mask of the values the range validator accepts as numbers.
+    """
+    if array.dtype != object:
+        return np.full(len(array), array.dtype.kind in _NUMERIC_DTYPE_KINDS, dtype=bool)
+    return np.fromiter((isinstance(value, _NUMBER_TYPES) for value in array), dtype=bool, count=len(array))
+
+def _batch_range(array: "np.ndarray", rule: ValidationRule) -> "np.ndarray":
+    numeric = _batch_numeric(array)
+    numbers = np.zeros(len(array), dtype=float)
+    numbers[numeric] = array[numeric].astype(float)
+
+    # negated comparisons, same outcome as the single value validator for every input
+    mask = numeric.copy()
+    if rule.min_value is not None:
+        mask &= ~(numbers < rule.min_value)
+    if rule.max_value is not None:
+        mask &= ~(numbers > rule.max_value)
+    return mask
+
+def _batch_enum(array: "np.ndarray", rule: ValidationRule) -> "np.ndarray":
+    if array.dtype.kind == "U":
+        return np.isin(array, rule.allowed_values)
+
+    allowed = frozenset(rule.allowed_values)
+    def is_allowed(value: Any) -> bool:
+        try:
+            return value in allowed
+        except TypeError:
+            return False
+    return np.fromiter((is_allowed(value) for value in array), dtype=bool, count=len(array))
+
+def _batch_reason(value: Any, rule: ValidationRule) -> str:
+    """
+    Format the reason a single value failed a rule, same wording as the single value validators.
+    """
+    if rule.validation_type == ValidationType.type:
+        return f"Expected {rule.expected_type}, got {type(value).__name__}"
+    if rule.validation_type == ValidationType.range:
+        if not isinstance(value, _NUMBER_TYPES):
+            return f"Cannot validate reange that is not of type int or float. Received type: {type(value).__name__}"
+        if rule.min_value is not None and value < rule.min_value:
+            return f"Value {value} is below minimum {rule.min_value}"
+        return f"Value {value} is above maximum {rule.max_value}"
+    return f"Value {value} not in allowed set {rule.allowed_values}"
+
+BATCH_VALIDATORS: Dict[ValidationType, Callable[["np.ndarray", ValidationRule], "np.ndarray"]] = {
+    ValidationType.type: _batch_type,
+    ValidationType.range: _batch_range,
+    ValidationType.enum: _batch_enum,
+}
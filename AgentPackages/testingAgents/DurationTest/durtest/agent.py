@@ -7,6 +7,7 @@ __docformat__ = 'reStructuredText'
 import logging
 import sys
 import gevent
+from uuid import uuid4
 from datetime import datetime, timezone
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
@@ -40,6 +41,8 @@ class Durtest(Agent):
     def __init__(self, **kwargs):
         super(Durtest, self).__init__(**kwargs)
         _log.info("Duration experiment agent startet with identity: " + self.core.identity)
+        # sent commands awaiting feedback, {correlation id: (topic, payload, sent timestamp)}
+        self._sent_commands = {}
         
         self.vip.config.subscribe(self._configure, actions=["NEW", "UPDATE"], pattern="config")
  
@@ -84,16 +87,26 @@ class Durtest(Agent):
                 ein = 80
                 aus = 40
                 
-            header = {"source":"test", "target":"mqtt", "timestamp": datetime.now(timezone.utc).isoformat()}
-            self.vip.pubsub.publish("pubsub", command_topic1, header, ein)
-            _log.debug(f"Sending message, topic: {command_topic1}, header:{header}, payload: {ein}")
-            self.vip.pubsub.publish("pubsub", command_topic2, header, aus)
-            _log.debug(f"Sending message, topic: {command_topic2}, header:{header}, payload: {aus}")
+            self._send_command(command_topic1, ein)
+            self._send_command(command_topic2, aus)
             count += 1
             gevent.sleep(60)
 
+    def _send_command(self, topic, payload):
+        now = datetime.now(timezone.utc)
+        header = {"source":"test", "target":"mqtt", "timestamp": now.isoformat(), "correlation_id": uuid4().hex}
+        self._sent_commands[header["correlation_id"]] = (topic, payload, now)
+        self.vip.pubsub.publish("pubsub", topic, header, payload)
+        _log.debug(f"Sending message, topic: {topic}, header:{header}, payload: {payload}")
+
     def _on_feedback(self, peer, sender, bus, topic, headers, message):
-        _log.debug(f"Feedback to the message: \"{message}\"")
+        sent = self._sent_commands.pop((headers or {}).get("correlation_id"), None)
+        if sent is None:
+            _log.debug(f"Feedback to unknown message: \"{message}\"")
+            return
+        command_topic, payload, sent_time = sent
+        round_trip = (datetime.now(timezone.utc) - sent_time).total_seconds()
+        _log.debug(f"Feedback to the message {command_topic}: {payload} after {round_trip:.3f}s: \"{message}\"")
 
     def _log(self, peer, sender, bus, topic, headers, message):
         _log.debug(f"Message logged. \"{topic}\": \"{message}\"")
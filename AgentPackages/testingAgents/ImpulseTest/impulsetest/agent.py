@@ -7,6 +7,7 @@ __docformat__ = 'reStructuredText'
 import logging
 import sys
 import gevent
+from gevent.event import Event
 from volttron.platform.agent import utils
 from volttron.platform.vip.agent import Agent, Core, RPC
 from datetime import datetime, timezone
@@ -15,6 +16,9 @@ _log = logging.getLogger(__name__)
 utils.setup_logging()
 __version__ = "0.1"
 
+# seconds an armed agent waits for the go signal before it runs the test anyway
+DEFAULT_GO_TIMEOUT = 600
+
 
 def impulsetest(config_path, **kwargs):
     """
@@ -56,10 +60,25 @@ class Impulsetest(Agent):
 
 
         self._config = config
+        # armed agents are started ahead of the experiment and wait for the go signal of the scheduler
+        self.armed = self._config.get("armed", False)
+        self.go_signal_topic = self._config.get("go_signal_topic", "experiments/go")
+        self.go_timeout = self._config.get("go_timeout", DEFAULT_GO_TIMEOUT)
+        self._go = Event()
         self.vip.config.set_default("config", self._config)
 
     @Core.receiver("onstart")
     def onstart(self, sender, **kwargs):
+        if self.armed:
+            try:
+                self.vip.pubsub.subscribe(peer="pubsub", prefix=self.go_signal_topic, callback=self._on_go_signal).get(timeout=5)
+                _log.info(f"Impulse Test is armed, waiting for go signal")
+                if not self._go.wait(timeout=self.go_timeout):
+                    _log.warning(f"No go signal within {self.go_timeout}s, running the test anyway")
+            except Exception as e:
+                # without the subscription the go signal can never arrive
+                _log.warning(f"Could not subscribe to the go signal, running the test right away: {e}")
+
         _log.info(f"Impulse Test is running")
         
         self.run_test()
@@ -70,6 +89,14 @@ class Impulsetest(Agent):
         _log.info(f"Impulse Test is finished")
 
 
+    def _on_go_signal(self, peer, sender, bus, topic, headers, message):
+        if self.core.identity in (message or {}).get("agents", []):
+            _log.debug(f"Go signal for experiment \"{message.get('experiment_id')}\" sent at {(headers or {}).get('timestamp')}")
+            # runs of a sweep series carry their setpoints
+            parameters = message.get("parameters") or {}
+            self.time_intervall = parameters.get("time_intervall", self.time_intervall)
+            self._go.set()
+
     def run_test(self):
         self.bhkw_runs = True
         while True: